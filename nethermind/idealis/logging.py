@@ -1,9 +1,11 @@
-import atexit
+import gzip
+import json
 import queue
+import sys
 import threading
-import time
 from dataclasses import dataclass
-from logging import Handler, LogRecord
+from logging import WARNING, Handler, LogRecord
+from typing import Literal
 
 import requests
 
@@ -62,64 +64,208 @@ class LokiLogStream:
         return {"streams": [stream.json_dict() for stream in self.streams.values()]}
 
 
-# TODO:  Clean up this clusterfuck...
 class LokiLoggerHandler(Handler):
+    """
+    Logging handler that ships logs to the Loki push API from a background thread.
+
+    Records are buffered in a bounded queue, and posted in gzip compressed batches once batch_size records are
+    queued, or every write_delay seconds.  Failed pushes from the shipper thread are retried with exponential
+    backoff, and remaining logs are flushed when the handler is closed (logging.shutdown() closes all handlers at
+    interpreter exit).
+
+    flush() does not retry.  Each batch is sent once, and if a push fails, the remaining queued records are dropped,
+    so flushing at interpreter exit blocks for at most request_timeout when Loki is unavailable.
+
+    When the queue is full, records are dropped according to the drop_policy:
+
+    - ``"newest"``: Drop the incoming record
+    - ``"oldest"``: Evict the oldest queued record to make room for the incoming record
+    - ``"sample"``: Once the queue is half full, only keep 1 in sample_every records below WARNING.  Records are
+      dropped once the queue is full
+
+    :param loki_url: Loki push URL, ie http://loki:3100/loki/api/v1/push
+    :param write_delay: Max seconds between pushes
+    :param logger_labels: Labels added to the log stream
+    :param max_queue_size: Max number of records buffered in memory
+    :param batch_size: Max number of records sent in a single push
+    :param drop_policy: Policy for dropping records when the queue is full
+    :param sample_every: Sampling interval for low severity records when using the "sample" drop policy
+    :param max_retries: Number of retries for failed pushes before the batch is dropped
+    :param retry_backoff: Seconds to wait before the first retry.  Doubles after each failed attempt
+    :param request_timeout: Timeout in seconds for each push request
+    """
+
     loki_url: str
-    post_headers = {"Content-type": "application/json"}
+    post_headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
 
     logger_labels: dict[str, str]
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-positional-arguments,too-many-arguments
         self,
         loki_url,
-        write_delay: int = 10,
+        write_delay: float = 10,
         logger_labels: dict[str, str] | None = None,
+        max_queue_size: int = 10_000,
+        batch_size: int = 1_000,
+        drop_policy: Literal["newest", "oldest", "sample"] = "newest",
+        sample_every: int = 10,
+        max_retries: int = 5,
+        retry_backoff: float = 1.0,
+        request_timeout: float = 10,
     ):
         super().__init__()
 
+        if drop_policy not in ("newest", "oldest", "sample"):
+            raise ValueError(f"Invalid drop_policy {drop_policy}.  Expected one of 'newest', 'oldest', 'sample'")
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be non-negative, got {max_retries}")
+
         self.loki_url = loki_url
         self.logger_labels = logger_labels or {}
         self.write_delay = write_delay
+        self.batch_size = batch_size
+        self.drop_policy = drop_policy
+        self.sample_every = sample_every
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.request_timeout = request_timeout
+
+        self.dropped_records = 0
+        self.failed_batches = 0
+
+        self._buffer: queue.Queue[LokiLogLine] = queue.Queue(maxsize=max_queue_size)
+        self._sample_counter = 0
+        self._send_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._stop_retries = threading.Event()
 
-        self._buffer: queue.Queue[LokiLogLine] = queue.Queue()
         self._request_session = requests.session()
-        self._flush_thread = threading.Thread(target=self._flush, daemon=True)
-
+        self._flush_thread = threading.Thread(target=self._flush_loop, name="loki-log-shipper", daemon=True)
         self._flush_thread.start()
 
     def emit(self, record: LogRecord):
-        self._buffer.put(
-            LokiLogLine(labels=self.logger_labels, timestamp_ns=int(record.created * 1e9), message=self.format(record))
-        )
-
-    def _flush(self):
-        atexit.register(self._send)
-
-        flushing = False
-        while True:
-            if not flushing and not self._buffer.empty():
-                flushing = True
-                self._send()
-                flushing = False
-            else:
-                time.sleep(self.write_delay)
-
-    def _send(self):
-        loki_stream = LokiLogStream()
+        try:
+            if not self._should_queue(record):
+                self.dropped_records += 1
+                return
 
-        while not self._buffer.empty():
-            loki_log_line: LokiLogLine = self._buffer.get()
-            loki_stream.add_loki_log(loki_log_line)
+            log_line = LokiLogLine(
+                labels=self.logger_labels, timestamp_ns=int(record.created * 1e9), message=self.format(record)
+            )
+            self._enqueue(log_line)
+
+            if self._buffer.qsize() >= self.batch_size:
+                self._wake.set()
 
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.handleError(record)
+
+    def _should_queue(self, record: LogRecord) -> bool:
+        if self.drop_policy != "sample" or record.levelno >= WARNING:
+            return True
+
+        if self._buffer.qsize() < self._buffer.maxsize // 2:
+            return True
+
+        self._sample_counter += 1
+        return self._sample_counter % self.sample_every == 0
+
+    def _enqueue(self, log_line: LokiLogLine):
         try:
-            response = self._request_session.post(
-                self.loki_url, json=loki_stream.json_dict(), headers=self.post_headers
-            )
-            response.raise_for_status()
-            response.close()
+            self._buffer.put_nowait(log_line)
+            return
+        except queue.Full:
+            if self.drop_policy != "oldest":
+                self.dropped_records += 1
+                return
+
+        try:
+            self._buffer.get_nowait()
+            self.dropped_records += 1
+            self._buffer.put_nowait(log_line)
+        except (queue.Empty, queue.Full):  # Queue changed between calls, drop the incoming record
+            self.dropped_records += 1
+
+    def _flush_loop(self):
+        while not self._closing.is_set():
+            self._wake.wait(self.write_delay)
+            self._wake.clear()
+            with self._send_lock:
+                # Yield to flush() & close(), which take over the queue without retrying
+                while not self._stop_retries.is_set() and (batch := self._next_batch()):
+                    self._send(batch, self.max_retries)
+
+    def _next_batch(self) -> list[LokiLogLine]:
+        batch: list[LokiLogLine] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._buffer.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """
+        Send all queued records to Loki with a single attempt for each batch.  Retries in progress on the shipper
+        thread are cut short, and if a push fails, the remaining queued records are dropped
+        """
+        self._stop_retries.set()
+        try:
+            with self._send_lock:
+                while batch := self._next_batch():
+                    if not self._send(batch, max_retries=0):
+                        while remaining := self._next_batch():
+                            self.dropped_records += len(remaining)
+                        break
+        finally:
+            if not self._closing.is_set():
+                self._stop_retries.clear()
+
+    def _send(self, batch: list[LokiLogLine], max_retries: int) -> bool:
+        """Push a batch to Loki, retrying failed pushes up to max_retries times.  Returns False if dropped"""
+        loki_stream = LokiLogStream()
+        for loki_log_line in batch:
+            loki_stream.add_loki_log(loki_log_line)
 
-        except requests.RequestException as e:
-            raise RuntimeError(f"Error Writing Logs to Loki:  {e}")
+        payload = gzip.compress(json.dumps(loki_stream.json_dict()).encode())
+
+        error = ""
+        for attempt in range(max_retries + 1):
+            try:
+                response = self._request_session.post(
+                    self.loki_url, data=payload, headers=self.post_headers, timeout=self.request_timeout
+                )
+                status_code = response.status_code
+                response.close()
+
+                if status_code < 400:
+                    return True
+
+                error = f"HTTP {status_code}"
+                if status_code != 429 and status_code < 500:  # Malformed push, retrying will not help
+                    break
+
+            except requests.RequestException as e:
+                error = str(e)
+
+            if attempt == max_retries or self._stop_retries.wait(self.retry_backoff * 2**attempt):
+                break
+
+        self.failed_batches += 1
+        self.dropped_records += len(batch)
+        sys.stderr.write(f"Dropped {len(batch)} logs after failing to push to Loki at {self.loki_url}: {error}\n")
+        return False
+
+    def close(self):
+        """Stop the shipper thread, and flush the remaining queued records"""
+        self._closing.set()
+        self._stop_retries.set()
+        self._wake.set()
+        self._flush_thread.join(timeout=self.request_timeout)
+        self.flush()
+        self._request_session.close()
+        super().close()
 
     def write(self, message):
         self.emit(message.record)
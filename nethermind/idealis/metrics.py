@@ -0,0 +1,292 @@
+import functools
+import re
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable, Protocol, TypeVar
+
+import aiohttp
+
+# Metric Names -----------------------------------------------
+
+RPC_REQUESTS = "idealis_rpc_requests_total"
+RPC_REQUEST_SECONDS = "idealis_rpc_request_seconds"
+RPC_RESPONSE_BYTES = "idealis_rpc_response_bytes_total"
+RPC_ERRORS = "idealis_rpc_errors_total"
+RPC_RETRIES = "idealis_rpc_retries_total"
+RPC_RATE_LIMITS = "idealis_rpc_rate_limits_total"
+
+PARSE_SECONDS = "idealis_parse_seconds"
+PARSE_OBJECTS = "idealis_parse_objects_total"
+
+DEFAULT_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_RPC_METHOD_PATTERN = re.compile(rb'"method":\s*"([^"]+)"')
+
+ParseFunc = TypeVar("ParseFunc", bound=Callable[..., Any])
+
+
+class MetricsSink(Protocol):
+    """
+    Destination for idealis metrics.  Counters are reported through increment(), and timing samples for
+    histograms through observe().  Labels are small dicts like {"method": "starknet_call"}
+    """
+
+    def increment(self, name: str, value: float, labels: dict[str, str]) -> None:
+        ...
+
+    def observe(self, name: str, value: float, labels: dict[str, str]) -> None:
+        ...
+
+
+_metrics_sink: MetricsSink | None = None
+
+
+def set_metrics_sink(sink: MetricsSink | None):
+    """
+    Enable metrics collection by setting a sink, or disable it by passing None.  Metrics are disabled by default,
+    and every recording hook returns immediately while no sink is set.
+
+    RPC request latency is collected with an aiohttp TraceConfig.  Sessions created with create_aiohttp_session()
+    after the sink is set install it automatically.  For other sessions, pass rpc_metrics_trace_config() to the
+    trace_configs of the ClientSession.
+    """
+    global _metrics_sink  # pylint: disable=global-statement
+    _metrics_sink = sink
+
+
+def get_metrics_sink() -> MetricsSink | None:
+    return _metrics_sink
+
+
+def metrics_enabled() -> bool:
+    return _metrics_sink is not None
+
+
+def record_rpc_response(method: str, byte_count: int):
+    """Record a successfully parsed JSON RPC response & the bytes received"""
+    if _metrics_sink is None:
+        return
+
+    labels = {"method": method}
+    _metrics_sink.increment(RPC_RESPONSE_BYTES, byte_count, labels)
+
+
+def record_rpc_error(method: str, error_kind: str):
+    """Record a failed JSON RPC request.  error_kind is the name of the raised exception"""
+    if _metrics_sink is None:
+        return
+
+    _metrics_sink.increment(RPC_ERRORS, 1, {"method": method, "kind": error_kind})
+
+
+def record_rpc_rate_limit(method: str):
+    if _metrics_sink is None:
+        return
+
+    _metrics_sink.increment(RPC_RATE_LIMITS, 1, {"method": method})
+
+
+def record_rpc_retry(method: str):
+    """Retries happen in caller code, so callers retrying failed requests should report them here"""
+    if _metrics_sink is None:
+        return
+
+    _metrics_sink.increment(RPC_RETRIES, 1, {"method": method})
+
+
+def count_parsed_objects(parsed: Any) -> int:
+    """
+    Default object counter for instrument_parser.  Tuples of parsed results are counted by summing the length of
+    each list, and counting any other non-null member as a single object.
+
+    >>> count_parsed_objects(("block", ["tx_1", "tx_2"], []))
+    3
+    """
+    if isinstance(parsed, tuple):
+        return sum(len(item) if isinstance(item, list) else int(item is not None) for item in parsed)
+    if isinstance(parsed, list):
+        return len(parsed)
+    return int(parsed is not None)
+
+
+def instrument_parser(
+    parser_name: str,
+    count_objects: Callable[[Any], int] | None = None,
+) -> Callable[[ParseFunc], ParseFunc]:
+    """
+    Decorator timing a parser, and counting the objects it returns.  When metrics are disabled, the wrapped
+    parser is called directly without reading the clock.
+
+    :param parser_name: Name of the parser, used as the 'parser' label
+    :param count_objects:
+        Returns the number of objects produced from the parser output.  Defaults to count_parsed_objects()
+    """
+
+    def _decorator(parse_func: ParseFunc) -> ParseFunc:
+        @functools.wraps(parse_func)
+        def _instrumented(*args, **kwargs):
+            if _metrics_sink is None:
+                return parse_func(*args, **kwargs)
+
+            start = time.perf_counter()
+            parsed = parse_func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+
+            labels = {"parser": parser_name}
+            _metrics_sink.observe(PARSE_SECONDS, elapsed, labels)
+            _metrics_sink.increment(PARSE_OBJECTS, (count_objects or count_parsed_objects)(parsed), labels)
+
+            return parsed
+
+        return _instrumented  # type: ignore
+
+    return _decorator
+
+
+def _request_method(chunk: bytes) -> str:
+    if chunk.lstrip().startswith(b"["):
+        return "batch"
+
+    match = _RPC_METHOD_PATTERN.search(chunk)
+    return match.group(1).decode() if match else "unknown"
+
+
+def rpc_metrics_trace_config() -> aiohttp.TraceConfig:
+    """
+    Create an aiohttp TraceConfig that records request counts and latency histograms for each JSON RPC method.
+    Latency is measured from the start of the request until the response headers are received.  For GET requests,
+    like the beacon API, the URL path is used as the method label.
+    """
+
+    async def _on_request_start(_session, trace_ctx: SimpleNamespace, params: aiohttp.TraceRequestStartParams):
+        trace_ctx.start = time.perf_counter()
+        trace_ctx.method = params.url.path if params.method == "GET" else "unknown"
+
+    async def _on_chunk_sent(_session, trace_ctx: SimpleNamespace, params: aiohttp.TraceRequestChunkSentParams):
+        if trace_ctx.method == "unknown" and params.chunk:
+            trace_ctx.method = _request_method(params.chunk)
+
+    async def _on_request_end(_session, trace_ctx: SimpleNamespace, params: aiohttp.TraceRequestEndParams):
+        if _metrics_sink is None:
+            return
+
+        labels = {"method": trace_ctx.method}
+        _metrics_sink.observe(RPC_REQUEST_SECONDS, time.perf_counter() - trace_ctx.start, labels)
+        _metrics_sink.increment(RPC_REQUESTS, 1, {**labels, "status": str(params.response.status)})
+
+    async def _on_request_exception(
+        _session, trace_ctx: SimpleNamespace, params: aiohttp.TraceRequestExceptionParams
+    ):
+        if _metrics_sink is None:
+            return
+
+        _metrics_sink.increment(
+            RPC_ERRORS, 1, {"method": trace_ctx.method, "kind": type(params.exception).__name__}
+        )
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_chunk_sent.append(_on_chunk_sent)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_exception)
+
+    return trace_config
+
+
+# Sinks -------------------------------------------------------
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+@dataclass(slots=True)
+class Histogram:
+    buckets: tuple[float, ...]
+    bucket_counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float):
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@dataclass
+class InMemoryMetricsSink:
+    """
+    Stores counters & histograms in memory.  Metrics can be read directly, or rendered in the Prometheus text
+    exposition format with prometheus_text() to serve from a /metrics endpoint.
+    """
+
+    buckets: tuple[float, ...] = DEFAULT_SECONDS_BUCKETS
+
+    counters: dict[str, dict[LabelKey, float]] = field(default_factory=dict)
+    histograms: dict[str, dict[LabelKey, Histogram]] = field(default_factory=dict)
+
+    def increment(self, name: str, value: float, labels: dict[str, str]):
+        label_key = tuple(sorted(labels.items()))
+        metric = self.counters.setdefault(name, {})
+        metric[label_key] = metric.get(label_key, 0) + value
+
+    def observe(self, name: str, value: float, labels: dict[str, str]):
+        label_key = tuple(sorted(labels.items()))
+        metric = self.histograms.setdefault(name, {})
+        if label_key not in metric:
+            metric[label_key] = Histogram(buckets=self.buckets, bucket_counts=[0] * (len(self.buckets) + 1))
+        metric[label_key].observe(value)
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        return self.counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        return self.histograms.get(name, {}).get(tuple(sorted(labels.items())))
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+
+        def _labels(label_key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+            pairs = label_key + extra
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            for label_key, value in series.items():
+                lines.append(f"{name}{_labels(label_key)} {value:g}")
+
+        for name, series in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for label_key, hist in series.items():
+                cumulative = 0
+                for upper_bound, bucket_count in zip(hist.buckets + (float("inf"),), hist.bucket_counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if upper_bound == float("inf") else f"{upper_bound:g}"
+                    lines.append(f"{name}_bucket{_labels(label_key, (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(label_key)} {hist.sum:g}")
+                lines.append(f"{name}_count{_labels(label_key)} {hist.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+class CallbackMetricsSink:
+    """
+    Forwards every metric to a callback with the signature callback(kind, name, value, labels), where kind is
+    'counter' or 'histogram'.  Useful for bridging to statsd, OpenTelemetry, or an existing metrics client.
+    """
+
+    def __init__(self, callback: Callable[[str, str, float, dict[str, str]], None]):
+        self.callback = callback
+
+    def increment(self, name: str, value: float, labels: dict[str, str]):
+        self.callback("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, labels: dict[str, str]):
+        self.callback("histogram", name, value, labels)
@@ -1,8 +1,19 @@
+import struct
 from typing import Any
 
+from nethermind.idealis.metrics import instrument_parser
 from nethermind.idealis.types.ethereum.consensus import BeaconBlock, BlobSidecar
 from nethermind.idealis.utils import to_bytes
 
+BLOB_SIZE = 131_072
+KZG_COMMITMENT_INCLUSION_PROOF_DEPTH = 17
+
+# SSZ BlobSidecar: index, blob, kzg_commitment, kzg_proof, signed_block_header, kzg_commitment_inclusion_proof.
+# Every field is fixed size, so a list of sidecars is encoded as the concatenation of the sidecars
+_SIDECAR_INDEX = struct.Struct("<Q")
+_SIDECAR_FIELDS = struct.Struct(f"<48s48sQQ32s32s32s96s{32 * KZG_COMMITMENT_INCLUSION_PROOF_DEPTH}s")
+BLOB_SIDECAR_SSZ_SIZE = _SIDECAR_INDEX.size + BLOB_SIZE + _SIDECAR_FIELDS.size
+
 
 def parse_signed_beacon_block(signed_block_header: dict[str, Any]) -> BeaconBlock:
     return BeaconBlock(
@@ -15,6 +26,7 @@ def parse_signed_beacon_block(signed_block_header: dict[str, Any]) -> BeaconBloc
     )
 
 
+@instrument_parser("beacon_blob_sidecars")
 def parse_blob_sidecar_response(response_data: list[dict[str, Any]]) -> tuple[BeaconBlock | None, list[BlobSidecar]]:
     blob_sidecars = []
     beacon_block = None
@@ -35,3 +47,62 @@ def parse_blob_sidecar_response(response_data: list[dict[str, Any]]) -> tuple[Be
         )
 
     return beacon_block, blob_sidecars
+
+
+@instrument_parser("beacon_blob_sidecars_ssz")
+def parse_blob_sidecar_ssz(payload: bytes | memoryview) -> tuple[BeaconBlock | None, list[BlobSidecar]]:
+    """
+    Parse an SSZ encoded blob sidecar response, returned by the beacon API when requesting
+    ``Accept: application/octet-stream``.  Skips the hex & JSON decoding of JSON responses.
+
+    Blobs are not copied.  blob_data is a memoryview into the payload, and can be written directly to a BlobStore,
+    or copied with bytes(blob_data)
+
+    :param payload: SSZ encoded List[BlobSidecar]
+    """
+    payload = memoryview(payload)
+    if len(payload) % BLOB_SIDECAR_SSZ_SIZE:
+        raise ValueError(f"Invalid SSZ blob sidecar payload length {len(payload)}")
+
+    blob_sidecars = []
+    beacon_block = None
+
+    for offset in range(0, len(payload), BLOB_SIDECAR_SSZ_SIZE):
+        (blob_index,) = _SIDECAR_INDEX.unpack_from(payload, offset)
+        blob_offset = offset + _SIDECAR_INDEX.size
+        (
+            kzg_commitment,
+            kzg_proof,
+            slot,
+            proposer_index,
+            parent_root,
+            state_root,
+            body_root,
+            signature,
+            inclusion_proof,
+        ) = _SIDECAR_FIELDS.unpack_from(payload, blob_offset + BLOB_SIZE)
+
+        if not beacon_block:
+            beacon_block = BeaconBlock(
+                slot=slot,
+                proposer_index=proposer_index,
+                parent_root=parent_root,
+                state_root=state_root,
+                body_root=body_root,
+                signature=signature,
+            )
+
+        blob_sidecars.append(
+            BlobSidecar(
+                slot=slot,
+                blob_index=blob_index,
+                blob_data=payload[blob_offset : blob_offset + BLOB_SIZE],
+                kzg_commitment=kzg_commitment,
+                kzg_proof=kzg_proof,
+                kzg_commitment_inclusion_proof=[
+                    inclusion_proof[i : i + 32] for i in range(0, len(inclusion_proof), 32)
+                ],
+            )
+        )
+
+    return beacon_block, blob_sidecars
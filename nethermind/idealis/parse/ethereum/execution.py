@@ -1,9 +1,11 @@
 from typing import Any
 
+from nethermind.idealis.metrics import instrument_parser
 from nethermind.idealis.types.ethereum import Block, Event, Transaction
 from nethermind.idealis.utils import hex_to_int, to_bytes
 
 
+@instrument_parser("ethereum_block")
 def parse_get_block_response(response_json: dict[str, Any]) -> tuple[Block, list[Transaction]]:
     output_transactions = []
 
@@ -56,18 +58,44 @@ def parse_get_block_response(response_json: dict[str, Any]) -> tuple[Block, list
     return parsed_block, output_transactions
 
 
+def _parse_log(log: dict[str, Any]) -> Event:
+    return Event(
+        block_number=hex_to_int(log["blockNumber"]),
+        transaction_index=hex_to_int(log["transactionIndex"]),
+        event_index=hex_to_int(log["logIndex"]),
+        contract_address=to_bytes(log["address"], pad=20),
+        data=to_bytes(log["data"]),
+        topics=[to_bytes(topic, pad=32) for topic in log["topics"]],
+        event_name=None,
+        decoded_params=None,
+    )
+
+
+@instrument_parser("ethereum_logs")
 def parse_get_logs_response(response_json: list[dict[str, Any]]) -> list[Event]:
-    return [
-        Event(
-            block_number=hex_to_int(log["blockNumber"]),
-            transaction_index=hex_to_int(log["transactionIndex"]),
-            event_index=hex_to_int(log["logIndex"]),
-            contract_address=to_bytes(log["address"], pad=20),
-            data=to_bytes(log["data"]),
-            topics=[to_bytes(topic) for topic in log["topics"]],
-            event_name=None,
-            decoded_params=None,
-        )
-        for log in response_json
-        if not log["removed"]
-    ]
+    return [_parse_log(log) for log in response_json if not log.get("removed")]
+
+
+@instrument_parser("ethereum_receipts")
+def apply_block_receipts(transactions: list[Transaction], receipts_json: list[dict[str, Any]]) -> list[Event]:
+    """
+    Join eth_getBlockReceipts receipts to the transactions of a block by transaction index.  Fills gas_used &
+    gas_price of the transactions in place, and returns the receipt logs as events.
+
+    :param transactions: Transactions parsed from the block
+    :param receipts_json: JSON decoded eth_getBlockReceipts result
+    """
+    transactions_by_index = {transaction.transaction_index: transaction for transaction in transactions}
+
+    for receipt in receipts_json:
+        transaction = transactions_by_index.get(hex_to_int(receipt["transactionIndex"]))
+        if transaction:
+            transaction.gas_used = hex_to_int(receipt["gasUsed"])
+            transaction.gas_price = hex_to_int(receipt["effectiveGasPrice"]) if "effectiveGasPrice" in receipt else None
+
+    return parse_receipt_logs(receipts_json)
+
+
+def parse_receipt_logs(receipts_json: list[dict[str, Any]]) -> list[Event]:
+    """Parse the logs of a list of transaction receipts into events"""
+    return [_parse_log(log) for receipt in receipts_json for log in receipt["logs"] if not log.get("removed")]
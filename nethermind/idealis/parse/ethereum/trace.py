@@ -1,5 +1,6 @@
 from typing import Any
 
+from nethermind.idealis.metrics import instrument_parser
 from nethermind.idealis.types.ethereum.core import (
     CallTraceResponse,
     CreateTraceResponse,
@@ -11,6 +12,7 @@ from nethermind.idealis.types.ethereum.enums import TraceCallType, TraceError
 from nethermind.idealis.utils import hex_to_int, to_bytes
 
 
+@instrument_parser("ethereum_debug_trace_block")
 def unpack_debug_trace_block_response(
     block_traces: list[dict[str, Any]], block_number: int
 ) -> tuple[list[CallTraceResponse], list[CreateTraceResponse], list[Event],]:
@@ -62,9 +64,9 @@ def parse_trace_call(
     return_create_traces = []
     return_events = []
 
-    for subcall_index, trace_call in enumerate(trace_call.get("calls", [])):
+    for subcall_index, subcall in enumerate(trace_call.get("calls", [])):
         call_traces, create_traces, events = parse_trace_call(
-            trace_call=trace_call,
+            trace_call=subcall,
             block_number=block_number,
             transaction_index=transaction_index,
             trace_address=trace_address + [subcall_index],
@@ -96,7 +98,7 @@ def parse_trace_call(
         error_text = trace_call.get("error")
         error = TraceError.reverted if error_text and error_text.startswith("Reverted") else None
 
-    if trace_call["type"] in ["CREATE", "CREATE2"]:
+    if trace_call["type"].upper() in ["CREATE", "CREATE2"]:  # zkSync Era returns "Create"
         return_create_traces.append(
             CreateTraceResponse(
                 block_number=block_number,
@@ -133,6 +135,7 @@ def parse_trace_call(
     return return_call_traces, return_create_traces, return_events
 
 
+@instrument_parser("ethereum_trace_block")
 def unpack_trace_block_response(
     trace_response: list[dict[str, Any]],
 ) -> tuple[list[CallTraceResponse], list[CreateTraceResponse], list[RewardTraceResponse], list[SuicideTraceResponse]]:
@@ -200,7 +203,7 @@ def parse_create_trace(trace_dict: dict[str, Any]) -> CreateTraceResponse:
 def parse_reward_trace(trace_dict: dict[str, Any]) -> RewardTraceResponse:
     return RewardTraceResponse(
         block_number=trace_dict["blockNumber"],
-        author=to_bytes(trace_dict["action"]["author"]),
+        author=to_bytes(trace_dict["action"]["author"], pad=20),
         reward_type=trace_dict["action"]["rewardType"],
         value=hex_to_int(trace_dict["action"]["value"]),
     )
@@ -211,8 +214,8 @@ def parse_suicide_trace(trace_dict: dict[str, Any]) -> SuicideTraceResponse:
         block_number=trace_dict["blockNumber"],
         transaction_index=trace_dict["transactionPosition"],
         trace_address=trace_dict["traceAddress"],
-        destroy_address=to_bytes(trace_dict["action"]["address"]),
-        refund_address=to_bytes(trace_dict["action"]["refundAddress"]),
+        destroy_address=to_bytes(trace_dict["action"]["address"], pad=20),
+        refund_address=to_bytes(trace_dict["action"]["refundAddress"], pad=20),
         balance=hex_to_int(trace_dict["action"]["balance"]),
         error=TraceError.from_json(trace_dict.get("error")),
     )
@@ -1,7 +1,16 @@
 import warnings
-
-from nethermind.idealis.types.base.tokens import ERC20BalanceDiff, ERC20Transfer
+from array import array
+
+from nethermind.idealis.types.base.tokens import (
+    EncodedERC20BalanceDiffs,
+    EncodedERC20Transfers,
+    EncodedERC721Transfers,
+    ERC20BalanceDiff,
+    ERC20Transfer,
+    ERC721Transfer,
+)
 from nethermind.idealis.utils import to_bytes
+from nethermind.idealis.utils.address_encoder import AddressEncoder
 
 NULL_ADDRESS = {
     to_bytes("0x00", pad=32),
@@ -207,3 +216,126 @@ def generate_balance_diffs(
         balance_diffs.extend(list(token_balances.values()))
 
     return balance_diffs
+
+
+def encode_erc20_transfers(transfers: list[ERC20Transfer], address_encoder: AddressEncoder) -> EncodedERC20Transfers:
+    """
+    Encode ERC20 transfers into columnar arrays, replacing token & holder addresses with AddressEncoder ids.
+    Encoded transfers use a fraction of the memory of ERC20Transfer dataclasses, and can be aggregated with
+    generate_encoded_balance_diffs without hashing addresses.
+
+    :param transfers: List of ERC20 Transfer events
+    :param address_encoder: Encoder used to assign address ids.  New addresses are added to the encoder
+    """
+    encode = address_encoder.encode
+
+    return EncodedERC20Transfers(
+        block_numbers=array("Q", [transfer.block_number for transfer in transfers]),
+        token_ids=array("I", [encode(transfer.token_address) for transfer in transfers]),
+        from_ids=array("I", [encode(transfer.from_address) for transfer in transfers]),
+        to_ids=array("I", [encode(transfer.to_address) for transfer in transfers]),
+        values=[transfer.value for transfer in transfers],
+    )
+
+
+def encode_erc721_transfers(
+    transfers: list[ERC721Transfer], address_encoder: AddressEncoder
+) -> EncodedERC721Transfers:
+    """ERC721 version of encode_erc20_transfers.  NFT token ids are kept as bytes"""
+    encode = address_encoder.encode
+
+    return EncodedERC721Transfers(
+        block_numbers=array("Q", [transfer.block_number for transfer in transfers]),
+        token_ids=array("I", [encode(transfer.token_address) for transfer in transfers]),
+        from_ids=array("I", [encode(transfer.from_address) for transfer in transfers]),
+        to_ids=array("I", [encode(transfer.to_address) for transfer in transfers]),
+        nft_ids=[transfer.token_id for transfer in transfers],
+    )
+
+
+def generate_encoded_balance_diffs(
+    transfers: EncodedERC20Transfers,
+    address_encoder: AddressEncoder,
+    reference_block: int,
+    zero_address: bytes = to_bytes("0x00", 20),
+) -> EncodedERC20BalanceDiffs:
+    """
+    Id based version of generate_balance_diffs.  Aggregates encoded transfers into a debit and credit account for
+    each (token, holder), and returns the balance diffs as columnar arrays of address ids.
+
+    :param transfers: Transfers encoded with encode_erc20_transfers
+    :param address_encoder: Encoder the transfers were encoded with
+    :param reference_block: What block to populate as the block_number for the balance diffs
+    :param zero_address:  What address to use as default Null address.  All detected ERC20 mint & burn events will
+        be registered under this address as the holder
+    """
+    null_ids = {address_encoder.lookup(address) for address in NULL_ADDRESS} - {None}
+    zero_id = address_encoder.lookup(zero_address)
+
+    balance_diffs = EncodedERC20BalanceDiffs(
+        block_number=reference_block,
+        token_ids=array("I"),
+        holder_ids=array("I"),
+        balance_diffs=[],
+        transfers_received=array("I"),
+        transfers_sent=array("I"),
+    )
+    account_indexes: dict[int, int] = {}  # (token_id << 32 | holder_id) -> column index
+
+    def _account_index(token_id: int, holder_id: int) -> int:
+        account_key = (token_id << 32) | holder_id
+        account_index = account_indexes.get(account_key)
+        if account_index is None:
+            account_index = account_indexes[account_key] = len(balance_diffs)
+            balance_diffs.token_ids.append(token_id)
+            balance_diffs.holder_ids.append(holder_id)
+            balance_diffs.balance_diffs.append(0)
+            balance_diffs.transfers_received.append(0)
+            balance_diffs.transfers_sent.append(0)
+        return account_index
+
+    def _holder_id(address_id: int) -> int:
+        nonlocal zero_id
+        if address_id not in null_ids:
+            return address_id
+        if zero_id is None:  # Only add the zero address to the encoder once a mint or burn is found
+            zero_id = address_encoder.encode(zero_address)
+        return zero_id
+
+    for token_id, from_id, to_id, value in zip(
+        transfers.token_ids, transfers.from_ids, transfers.to_ids, transfers.values
+    ):
+        debit_index = _account_index(token_id, _holder_id(from_id))
+        balance_diffs.balance_diffs[debit_index] -= value
+        balance_diffs.transfers_sent[debit_index] += 1
+
+        credit_index = _account_index(token_id, _holder_id(to_id))
+        balance_diffs.balance_diffs[credit_index] += value
+        balance_diffs.transfers_received[credit_index] += 1
+
+    return balance_diffs
+
+
+def decode_balance_diffs(
+    balance_diffs: EncodedERC20BalanceDiffs, address_encoder: AddressEncoder
+) -> list[ERC20BalanceDiff]:
+    """Decode columnar balance diffs back into ERC20BalanceDiff dataclasses"""
+    decode = address_encoder.decode
+
+    return [
+        ERC20BalanceDiff(
+            token_address=decode(token_id),
+            holder_address=decode(holder_id),
+            block_number=balance_diffs.block_number,
+            balance_diff=balance_diff,
+            transfers_received=received,
+            transfers_sent=sent,
+        )
+        for token_id, holder_id, balance_diff, received, sent in zip(
+            balance_diffs.token_ids,
+            balance_diffs.holder_ids,
+            balance_diffs.balance_diffs,
+            balance_diffs.transfers_received,
+            balance_diffs.transfers_sent,
+        )
+    ]
@@ -1,31 +1,131 @@
-from typing import Any, Protocol
+from typing import Any, Generic, Iterator, Protocol, Sequence, TypeVar
 
 
 class TraceProtocol(Protocol):
     trace_address: list[int]
 
 
-def get_root_trace(traces: list[TraceProtocol]):
+TraceType = TypeVar("TraceType", bound=TraceProtocol)
+
+
+class TraceTree(Generic[TraceType]):
+    """
+    Index over the traces of a single transaction, keyed by trace address.  Built once in O(n), after which root
+    lookups, child lookups & address lookups are O(1), and subtrees are iterated without rescanning the traces.
+
+    Each trace is assigned a node id (its index in the input list).  Children are stored by their parent trace
+    address, so child queries work even if the parent trace is missing from the list.  Children are returned in
+    input order.
+
+    .. code-block:: python
+
+        tree = TraceTree(tx_traces)
+        root = tree.root()
+        for child in tree.children(root.trace_address):
+            subtree = list(tree.iter_subtree(child.trace_address))
+
+    :param traces: Traces from a single transaction with a trace_address member
+    """
+
+    def __init__(self, traces: Sequence[TraceType]):
+        self.traces = list(traces)
+
+        self._node_ids: dict[tuple[int, ...], int] = {}
+        self._duplicate_addresses: set[tuple[int, ...]] = set()
+        self._child_ids: dict[tuple[int, ...], list[int]] = {}
+
+        for node_id, trace in enumerate(self.traces):
+            trace_address = tuple(trace.trace_address)
+            if trace_address in self._node_ids:
+                self._duplicate_addresses.add(trace_address)
+            else:
+                self._node_ids[trace_address] = node_id
+
+            if trace_address:
+                self._child_ids.setdefault(trace_address[:-1], []).append(node_id)
+
+    def __len__(self) -> int:
+        return len(self.traces)
+
+    def node_id(self, trace_address: Sequence[int]) -> int | None:
+        """Return the node id of the first trace with the trace address, or None if not present"""
+        return self._node_ids.get(tuple(trace_address))
+
+    def get(self, trace_address: Sequence[int]) -> TraceType | None:
+        node_id = self._node_ids.get(tuple(trace_address))
+        return None if node_id is None else self.traces[node_id]
+
+    def root(self) -> TraceType:
+        """
+        Returns the trace with a trace address of [0]
+
+        :raises ValueError: If there is not exactly one trace with a trace address of [0]
+        """
+        root_id = self._node_ids.get((0,))
+        if root_id is None or (0,) in self._duplicate_addresses:
+            raise ValueError(
+                f"Array of Traces has more than once trace with address of [0]: "
+                f"{[t for t in self.traces if t.trace_address == [0]]}"
+            )
+        return self.traces[root_id]
+
+    def children(self, parent_trace_address: Sequence[int]) -> list[TraceType]:
+        """Returns the traces that are direct children of the parent_trace_address"""
+        return [self.traces[child_id] for child_id in self._child_ids.get(tuple(parent_trace_address), [])]
+
+    def iter_subtree(self, trace_address: Sequence[int]) -> Iterator[TraceType]:
+        """
+        Iterate over a trace & all of its descendants in depth first order.  If the trace at trace_address is not
+        present, only the descendants are returned
+        """
+        trace_address = tuple(trace_address)
+        if (node_id := self._node_ids.get(trace_address)) is not None:
+            yield self.traces[node_id]
+
+        stack = list(reversed(self._child_ids.get(trace_address, [])))
+        while stack:
+            node_id = stack.pop()
+            yield self.traces[node_id]
+            stack.extend(reversed(self._child_ids.get(tuple(self.traces[node_id].trace_address), [])))
+
+    def group(self, parent_trace_address: Sequence[int]) -> Any:
+        """Returns the nested (trace, children) structure below the parent_trace_address.  See group_traces()"""
+        child_ids = self._child_ids.get(tuple(parent_trace_address))
+        if not child_ids:
+            return None
+
+        return [
+            (self.traces[child_id], self.group(self.traces[child_id].trace_address)) for child_id in child_ids
+        ]
+
+
+def get_root_trace(traces: Sequence[TraceProtocol] | TraceTree):
     """
     Returns the trace with a trace address of [0]
 
-    :param traces: List of Trace dataclasses posessing a trace_address member
+    :param traces: List of Trace dataclasses posessing a trace_address member, or a TraceTree
     :return: Trace dataclass where trace_address == [0]
     """
+    if isinstance(traces, TraceTree):
+        return traces.root()
+
     root_trace = [t for t in traces if t.trace_address == [0]]
     if len(root_trace) != 1:
         raise ValueError(f"Array of Traces has more than once trace with address of [0]: {root_trace}")
     return root_trace[0]
 
 
-def get_toplevel_child_traces(traces: list[TraceProtocol], parent_trace_address: list[int]) -> list:
+def get_toplevel_child_traces(traces: Sequence[TraceProtocol] | TraceTree, parent_trace_address: list[int]) -> list:
     """
-    Returns list of traces that are children of the parent_trace_address.
+    Returns list of traces that are children of the parent_trace_address.  When querying the children of
+    multiple traces, build a TraceTree once and pass it instead of the trace list.
 
-    :param traces: List of Trace dataclasses with a trace_address member
+    :param traces: List of Trace dataclasses with a trace_address member, or a TraceTree
     :param parent_trace_address:
     :return:
     """
+    if isinstance(traces, TraceTree):
+        return traces.children(parent_trace_address)
 
     return [
         trace
@@ -35,7 +135,7 @@ def get_toplevel_child_traces(traces: list[TraceProtocol], parent_trace_address:
     ]
 
 
-def group_traces(traces: list[TraceProtocol]) -> Any:  # TODO: type this with a protocol
+def group_traces(traces: Sequence[TraceProtocol] | TraceTree) -> Any:  # TODO: type this with a protocol
     """
     Groups traces into a nested list structure.
 
@@ -48,12 +148,6 @@ def group_traces(traces: list[TraceProtocol]) -> Any:  # TODO: type this with a
     Grouped:
     (Trace A, [(Trace B, None), (Trace C, [(Trace D, None)]), (Trace E, None)])
     """
+    tree = traces if isinstance(traces, TraceTree) else TraceTree(traces)
 
-    def group_traces_recursive(parent_trace_address: list[int]) -> Any:
-        children = get_toplevel_child_traces(traces, parent_trace_address)
-        if not children:
-            return None
-
-        return [(child, group_traces_recursive(child.trace_address)) for child in children]
-
-    return traces[0], group_traces_recursive(traces[0].trace_address)
+    return tree.traces[0], tree.group(tree.traces[0].trace_address)
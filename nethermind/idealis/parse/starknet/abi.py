@@ -1,10 +1,18 @@
+import json
 import logging
+import os
 from typing import Sequence
 
+from nethermind.idealis.types.starknet.contracts import ClassFeatures
 from nethermind.idealis.types.starknet.enums import ProxyKind
 from nethermind.starknet_abi.abi_types import StarknetCoreType, StarknetType
 from nethermind.starknet_abi.decoding_types import AbiEvent, AbiParameter
-from nethermind.starknet_abi.dispatch import DecodingDispatcher, StarknetAbi, _id_hash
+from nethermind.starknet_abi.dispatch import (
+    ClassDispatcher,
+    DecodingDispatcher,
+    StarknetAbi,
+    _id_hash,
+)
 from nethermind.starknet_abi.utils import starknet_keccak
 
 # ERC20 & ERC721 Functions -----------------------------------
@@ -23,6 +31,29 @@ ERC_SET_APPROVAL_FOR_ALL = ["setApprovalForAll", "set_approval_for_all"]
 ERC_GET_APPROVED = ["getApproved", "get_approved"]
 ERC_IS_APPROVED_FOR_ALL = ["isApprovedForAll", "is_approved_for_all"]
 
+ERC20_FUNCTIONS = (
+    ERC_NAME,
+    ERC_SYMBOL,
+    ERC_DECIMALS,
+    ERC_BALANCE_OF,
+    ERC_ALLOWANCE,
+    ERC_TRANSFER,
+    ERC_TRANSFER_FROM,
+    ERC_APPROVE,
+)
+ERC721_FUNCTIONS = (
+    ERC_BALANCE_OF,
+    ERC_OWNER_OF,
+    ERC_SAFE_TRANSFER_FROM,
+    ERC_TRANSFER_FROM,
+    ERC_APPROVE,
+    ERC_SET_APPROVAL_FOR_ALL,
+    ERC_GET_APPROVED,
+    ERC_IS_APPROVED_FOR_ALL,
+)
+ACCOUNT_FUNCTIONS = ["__validate__", "__execute__", "__validate_declare__", "__validate_deploy__"]
+UPGRADE_FUNCTIONS = ["upgrade", "replace_to"]  # OpenZeppelin Upgradeable & StarkGate Replaceable
+
 # ERC20 & ERC721 Events ---------------------------------------
 
 ERC_TRANSFER_EVENT = "Transfer"
@@ -55,10 +86,7 @@ logger = root_logger.getChild("parse").getChild("starknet").getChild("abi")
 
 
 def is_class_account(class_abi: StarknetAbi) -> bool:
-    return all(
-        func in class_abi.functions
-        for func in ["__validate__", "__execute__", "__validate_declare__", "__validate_deploy__"]
-    )
+    return all(func in class_abi.functions for func in ACCOUNT_FUNCTIONS)
 
 
 def _check_proxy_function(function_name: str, output_types: Sequence[StarknetType], class_hash: bytes | None = None):
@@ -109,14 +137,26 @@ def is_class_proxy(class_abi: StarknetAbi) -> ProxyKind | None:
 
 def is_dispatcher_class_proxy(decoder: DecodingDispatcher, class_hash: bytes) -> ProxyKind | None:
     """
-    Checks a DecodingDispatcher if a class is a proxy and returns it as ProxyKind.
+    Checks a DecodingDispatcher if a class is a proxy and returns it as ProxyKind.  If the decoder is an
+    IndexedDecodingDispatcher, the precomputed proxy kind is returned.
     # TODO: Refactor & Comment this evil shit
     """
+    if isinstance(decoder, IndexedDecodingDispatcher):
+        class_features = decoder.get_class_features(class_hash)
+        return class_features.proxy_kind if class_features else None
 
     class_abi_data = decoder.get_class(class_hash)
     if class_abi_data is None:
         return None  # Class hash not loaded, or if pessimism enabled... invalid class
 
+    return _dispatcher_class_proxy_kind(decoder, class_abi_data, class_hash)
+
+
+def _dispatcher_class_proxy_kind(
+    decoder: DecodingDispatcher,
+    class_abi_data: ClassDispatcher,
+    class_hash: bytes,
+) -> ProxyKind | None:
     for proxy_func in ProxyKind.supported_functions():
         if proxy_func.function_selector()[-8:] in class_abi_data.function_ids:
             abi_function_info = class_abi_data.function_ids[proxy_func.function_selector()[-8:]]
@@ -149,17 +189,7 @@ def is_dispatcher_class_proxy(decoder: DecodingDispatcher, class_hash: bytes) ->
 
 def is_class_erc20_token(class_abi: StarknetAbi) -> bool:
     has_erc20_functions = all(
-        any(param in class_abi.functions for param in supported_params)
-        for supported_params in (
-            ERC_NAME,
-            ERC_SYMBOL,
-            ERC_DECIMALS,
-            ERC_BALANCE_OF,
-            ERC_ALLOWANCE,
-            ERC_TRANSFER,
-            ERC_TRANSFER_FROM,
-            ERC_APPROVE,
-        )
+        any(param in class_abi.functions for param in supported_params) for supported_params in ERC20_FUNCTIONS
     )
 
     has_erc20_events = all(event in class_abi.events for event in (ERC_TRANSFER_EVENT, ERC_APPROVAL_EVENT))
@@ -169,17 +199,7 @@ def is_class_erc20_token(class_abi: StarknetAbi) -> bool:
 
 def is_class_erc721_token(class_abi: StarknetAbi) -> bool:
     has_erc721_functions = all(
-        any(param in class_abi.functions for param in supported_params)
-        for supported_params in (
-            ERC_BALANCE_OF,
-            ERC_OWNER_OF,
-            ERC_SAFE_TRANSFER_FROM,
-            ERC_TRANSFER_FROM,
-            ERC_APPROVE,
-            ERC_SET_APPROVAL_FOR_ALL,
-            ERC_GET_APPROVED,
-            ERC_IS_APPROVED_FOR_ALL,
-        )
+        any(param in class_abi.functions for param in supported_params) for supported_params in ERC721_FUNCTIONS
     )
 
     has_erc721_events = all(
@@ -187,3 +207,131 @@ def is_class_erc721_token(class_abi: StarknetAbi) -> bool:
     )
 
     return has_erc721_functions and has_erc721_events
+
+
+def _selector_id(name: str) -> bytes:
+    return starknet_keccak(name.encode())[-8:]
+
+
+def _has_functions(class_abi_data: ClassDispatcher, function_names: Sequence[str]) -> bool:
+    return all(_selector_id(name) in class_abi_data.function_ids for name in function_names)
+
+
+def _has_any_function(class_abi_data: ClassDispatcher, function_names: Sequence[str]) -> bool:
+    return any(_selector_id(name) in class_abi_data.function_ids for name in function_names)
+
+
+def _has_events(class_abi_data: ClassDispatcher, event_names: Sequence[str]) -> bool:
+    return all(_selector_id(name) in class_abi_data.event_ids for name in event_names)
+
+
+def get_dispatcher_class_features(decoder: DecodingDispatcher, class_hash: bytes) -> ClassFeatures | None:
+    """
+    Compute the ClassFeatures of a class loaded into a DecodingDispatcher.  Returns None if the class is not loaded
+    """
+    class_abi_data = decoder.get_class(class_hash)
+    if class_abi_data is None:
+        return None
+
+    return ClassFeatures(
+        proxy_kind=_dispatcher_class_proxy_kind(decoder, class_abi_data, class_hash),
+        is_account=_has_functions(class_abi_data, ACCOUNT_FUNCTIONS),
+        is_erc20=all(_has_any_function(class_abi_data, names) for names in ERC20_FUNCTIONS)
+        and _has_events(class_abi_data, [ERC_TRANSFER_EVENT, ERC_APPROVAL_EVENT]),
+        is_erc721=all(_has_any_function(class_abi_data, names) for names in ERC721_FUNCTIONS)
+        and _has_events(class_abi_data, [ERC_TRANSFER_EVENT, ERC_APPROVAL_EVENT, ERC_APPROVAL_FOR_ALL_EVENT]),
+        is_upgradeable=_has_any_function(class_abi_data, UPGRADE_FUNCTIONS)
+        or UPGRADED_EVENT_SELECTOR[-8:] in class_abi_data.event_ids,
+    )
+
+
+class ClassFeatureIndex:
+    """
+    Index of ClassFeatures keyed by class id (the last 8 bytes of the class hash, matching DecodingDispatcher), so
+    proxy kinds & token flags are computed once per class instead of on every lookup.  The index can be saved to
+    and loaded from a JSON file, so ABI introspection is not repeated across jobs.
+    """
+
+    def __init__(self, features: dict[bytes, ClassFeatures] | None = None):
+        self.features: dict[bytes, ClassFeatures] = features or {}
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def __contains__(self, class_hash: bytes) -> bool:
+        return class_hash[-8:] in self.features
+
+    def get(self, class_hash: bytes) -> ClassFeatures | None:
+        return self.features.get(class_hash[-8:])
+
+    def add(self, class_hash: bytes, class_features: ClassFeatures):
+        self.features[class_hash[-8:]] = class_features
+
+    def index_class(self, decoder: DecodingDispatcher, class_hash: bytes) -> ClassFeatures | None:
+        """Compute & store the features of a class loaded into the decoder"""
+        class_features = get_dispatcher_class_features(decoder, class_hash)
+        if class_features is not None:
+            self.add(class_hash, class_features)
+        return class_features
+
+    def save(self, path: str):
+        """Atomically write the index to a JSON file"""
+        index_json = {
+            class_id.hex(): {
+                "proxy_kind": features.proxy_kind.value if features.proxy_kind else None,
+                "is_account": features.is_account,
+                "is_erc20": features.is_erc20,
+                "is_erc721": features.is_erc721,
+                "is_upgradeable": features.is_upgradeable,
+            }
+            for class_id, features in self.features.items()
+        }
+        with open(path + ".tmp", "w") as index_file:
+            json.dump(index_json, index_file)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "ClassFeatureIndex":
+        with open(path, "r") as index_file:
+            index_json = json.load(index_file)
+
+        return cls(
+            {
+                bytes.fromhex(class_id): ClassFeatures(
+                    proxy_kind=ProxyKind(features["proxy_kind"]) if features["proxy_kind"] else None,
+                    is_account=features["is_account"],
+                    is_erc20=features["is_erc20"],
+                    is_erc721=features["is_erc721"],
+                    is_upgradeable=features["is_upgradeable"],
+                )
+                for class_id, features in index_json.items()
+            }
+        )
+
+
+class IndexedDecodingDispatcher(DecodingDispatcher):
+    """
+    DecodingDispatcher that computes the ClassFeatures of each class as it is added, and stores them in
+    class_features.  is_dispatcher_class_proxy returns the indexed proxy kind for these dispatchers.
+    """
+
+    class_features: ClassFeatureIndex
+    """ Features of every class added to the dispatcher """
+
+    def __init__(self, class_features: ClassFeatureIndex | None = None):
+        super().__init__()
+        self.class_features = class_features or ClassFeatureIndex()
+
+    def add_abi(self, abi: StarknetAbi):
+        super().add_abi(abi)
+        if abi.class_hash and abi.class_hash not in self.class_features:
+            self.class_features.index_class(self, abi.class_hash)
+
+    def get_class_features(self, class_hash: bytes) -> ClassFeatures | None:
+        """
+        Return the features of a class.  Classes that were loaded without add_abi are indexed on first lookup
+        """
+        class_features = self.class_features.get(class_hash)
+        if class_features is None:
+            class_features = self.class_features.index_class(self, class_hash)
+        return class_features
@@ -1,5 +1,6 @@
 from typing import Any
 
+from nethermind.idealis.metrics import instrument_parser
 from nethermind.idealis.parse.starknet.transaction import parse_transaction_with_receipt
 from nethermind.idealis.types.starknet.core import Block, Event, Transaction
 from nethermind.idealis.types.starknet.enums import BlockDataAvailabilityMode
@@ -26,6 +27,7 @@ def parse_block(response_json: dict[str, Any]) -> Block:
     )
 
 
+@instrument_parser("starknet_block_with_receipts")
 def parse_block_with_tx_receipts(
     response_json: dict[str, Any]
 ) -> tuple[Block, list[Transaction], list[Event], list[OutgoingMessage]]:
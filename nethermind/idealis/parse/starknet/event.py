@@ -1,9 +1,20 @@
 import logging
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, overload
 
+from nethermind.idealis.metrics import instrument_parser
+from nethermind.idealis.parse.shared.erc_20_tokens import (
+    encode_erc20_transfers,
+    encode_erc721_transfers,
+)
 from nethermind.idealis.types.base import ERC20Transfer, ERC721Transfer
+from nethermind.idealis.types.base.tokens import (
+    EncodedERC20Transfers,
+    EncodedERC721Transfers,
+)
 from nethermind.idealis.types.starknet.core import Event
 from nethermind.idealis.utils import hex_to_int, to_bytes
+from nethermind.idealis.utils.address_encoder import AddressEncoder
 from nethermind.starknet_abi.utils import starknet_keccak
 
 TRANSFER_SIGNATURE = starknet_keccak(b"Transfer")
@@ -13,6 +24,7 @@ root_logger = logging.getLogger("nethermind")
 logger = root_logger.getChild("parse").getChild("starknet").getChild("events")
 
 
+@instrument_parser("starknet_events")
 def parse_event_response(rpc_response: dict[str, Any]) -> list[Event]:
     events = rpc_response["events"]
 
@@ -41,9 +53,163 @@ def parse_event_response(rpc_response: dict[str, Any]) -> list[Event]:
 # {to,from,tick,value}  -- Not handled.  WTF?
 
 
-def filter_transfers(events: list[Event]) -> tuple[list[ERC20Transfer], list[ERC721Transfer]]:
+@dataclass(frozen=True, slots=True)
+class TransferExtractor:
+    """Decoded parameter names holding the sender, receiver & value of a transfer event"""
+
+    standard: Literal["erc20", "erc721"]
+    from_key: str
+    to_key: str
+    value_key: str
+
+
+def _build_extractor(
+    standard: Literal["erc20", "erc721"],
+    sorted_params: tuple[str, ...],
+    from_keys: list[str],
+    to_keys: list[str],
+    value_keys: list[str],
+) -> TransferExtractor:
+    return TransferExtractor(
+        standard=standard,
+        from_key=next(key for key in from_keys if key in sorted_params),
+        to_key=next(key for key in to_keys if key in sorted_params),
+        value_key=next(key for key in value_keys if key in sorted_params),
+    )
+
+
+# Sorted Parameter Names -> Extractor.  Key lookup order matches the priority of candidate parameter names
+TRANSFER_DISPATCH: dict[tuple[str, ...], TransferExtractor] = {
+    **{
+        sorted_params: _build_extractor(
+            "erc20",
+            sorted_params,
+            from_keys=["from", "from_", "from_address", "sender"],
+            to_keys=["to", "to_address", "recipient"],
+            value_keys=["value", "amount"],
+        )
+        for sorted_params in [
+            ("from", "to", "value"),
+            ("from_", "to", "value"),
+            ("amount", "from", "to"),
+            ("from", "tick", "to", "value"),
+            ("amount", "asset", "from", "to"),
+            ("counter", "from", "to", "value"),
+            ("amount", "from_address", "to_address"),
+            ("recipient", "sender", "value"),
+        ]
+    },
+    **{
+        sorted_params: _build_extractor(
+            "erc721",
+            sorted_params,
+            from_keys=["_from", "from", "from_"],
+            to_keys=["_to", "to"],
+            value_keys=["token_id", "_tokenId", "tokenId"],
+        )
+        for sorted_params in [
+            ("_from", "_to", "_tokenId"),
+            ("_from", "to", "tokenId"),
+            ("from_", "to", "tokenId"),
+            ("from", "to", "token_id"),
+        ]
+    },
+}
+
+# Decoded parameter names are ordered by the event ABI, so each ABI event is only sorted & looked up once
+_extractor_cache: dict[tuple[str, ...], TransferExtractor | None] = {}
+
+
+def get_transfer_extractor(param_names: tuple[str, ...]) -> TransferExtractor | None:
     """
-    Filter out ERC20 Transfer events from a list of Starknet Events
+    Return the extractor for a transfer event with the given decoded parameter names, or None if the event
+    is not a supported ERC20 or ERC721 transfer.  Results are cached by the unsorted parameter names.
+    """
+    try:
+        return _extractor_cache[param_names]
+    except KeyError:
+        extractor = TRANSFER_DISPATCH.get(tuple(sorted(param_names)))
+        _extractor_cache[param_names] = extractor
+        return extractor
+
+
+def _extract_erc20_transfer(event: Event, extractor: TransferExtractor) -> ERC20Transfer | None:
+    params = event.decoded_params
+    from_addr, to_addr, val = params[extractor.from_key], params[extractor.to_key], params[extractor.value_key]
+
+    if isinstance(val, (int, float)):
+        transfer_value = int(val)
+    elif isinstance(val, str):
+        transfer_value = hex_to_int(val)
+    else:
+        transfer_value = None
+
+    if not isinstance(from_addr, str) or not isinstance(to_addr, str) or transfer_value is None:
+        logger.warning(f"Could not parse starknet event into ERC20 Transfer event:  {event}")
+        return None
+
+    return ERC20Transfer(
+        block_number=event.block_number,
+        transaction_index=event.transaction_index,
+        event_index=event.event_index,
+        token_address=event.contract_address,
+        from_address=to_bytes(from_addr, pad=32),
+        to_address=to_bytes(to_addr, pad=32),
+        value=transfer_value,
+    )
+
+
+def _extract_erc721_transfer(event: Event, extractor: TransferExtractor) -> ERC721Transfer | None:
+    params = event.decoded_params
+    from_addr, to_addr, token_id = params[extractor.from_key], params[extractor.to_key], params[extractor.value_key]
+
+    token_id_int = hex_to_int(token_id) if isinstance(token_id, str) else token_id
+
+    if not isinstance(from_addr, str) or not isinstance(to_addr, str) or not isinstance(token_id_int, int):
+        logger.warning(f"Could not parse Starknet Event into ERC721 Transfer: {event}")
+        return None
+
+    token_id_byte_len = max((token_id_int.bit_length() + 7) // 8, 1)  # 8 bits per byte
+    token_id_bytes = token_id_int.to_bytes(token_id_byte_len, byteorder="big")
+
+    return ERC721Transfer(
+        block_number=event.block_number,
+        transaction_index=event.transaction_index,
+        event_index=event.event_index,
+        token_address=event.contract_address,
+        from_address=to_bytes(from_addr, pad=32),
+        to_address=to_bytes(to_addr, pad=32),
+        token_id=token_id_bytes,
+    )
+
+
+@overload
+def filter_transfers(
+    events: list[Event], address_encoder: None = None
+) -> tuple[list[ERC20Transfer], list[ERC721Transfer]]: ...
+
+
+@overload
+def filter_transfers(
+    events: list[Event], address_encoder: AddressEncoder
+) -> tuple[EncodedERC20Transfers, EncodedERC721Transfers]: ...
+
+
+def filter_transfers(
+    events: list[Event],
+    address_encoder: AddressEncoder | None = None,
+) -> (
+    tuple[list[ERC20Transfer], list[ERC721Transfer]]
+    | tuple[EncodedERC20Transfers, EncodedERC721Transfers]
+):
+    """
+    Filter out ERC20 & ERC721 Transfer events from a list of decoded Starknet Events.  Transfer events are matched
+    to an extractor by their decoded parameter names using the TRANSFER_DISPATCH table.
+
+    :param events: Decoded events
+    :param address_encoder:
+        If provided, transfers are returned as EncodedERC20Transfers & EncodedERC721Transfers, with token & holder
+        addresses encoded as AddressEncoder ids
     """
     erc20_transfers, erc721_transfers = [], []
 
@@ -51,125 +217,82 @@ def filter_transfers(events: list[Event]) -> tuple[list[ERC20Transfer], list[ERC
         if not event.keys or not event.decoded_params or event.keys[0] != TRANSFER_SIGNATURE:
             continue
 
-        shared_params = {
-            "block_number": event.block_number,
-            "transaction_index": event.transaction_index,
-            "event_index": event.event_index,
-            "token_address": event.contract_address,
-        }
-        sorted_keys = tuple(sorted(event.decoded_params.keys()))
-
-        match sorted_keys:
-            # -----------------------------------------
-            # ERC20 Transfer Cases
-            # -----------------------------------------
-
-            case (
-                ["from", "to", "value"]
-                | ["from_", "to", "value"]
-                | ["amount", "from", "to"]
-                | ["from", "tick", "to", "value"]
-                | ["amount", "asset", "from", "to"]
-                | ["counter", "from", "to", "value"]
-                | ["amount", "from_address", "to_address"]
-                | ["recipient", "sender", "value"]
-            ):
-                from_addr = next(
-                    (
-                        event.decoded_params[key]
-                        for key in ["from", "from_", "from_address", "sender"]
-                        if key in event.decoded_params
-                    ),
-                    None,
-                )
-
-                to_addr = next(
-                    (
-                        event.decoded_params[key]
-                        for key in ["to", "to_address", "recipient"]
-                        if key in event.decoded_params
-                    ),
-                    None,
-                )
-                val = next(
-                    (event.decoded_params[key] for key in ["value", "amount"] if key in event.decoded_params), None
-                )
-
-                if isinstance(val, (int, float)):
-                    transfer_value = int(val)
-                elif isinstance(val, str):
-                    transfer_value = hex_to_int(val)
-                else:
-                    transfer_value = None
-
-                if (
-                    (from_addr is None or not isinstance(from_addr, str))
-                    or (to_addr is None or not isinstance(to_addr, str))  # from check
-                    or transfer_value is None  # to check  # value check
-                ):
-                    logger.warning(f"Could not parse starknet event into ERC20 Transfer event:  {event}")
-                    continue
-
-                erc20_transfers.append(
-                    ERC20Transfer(
-                        from_address=to_bytes(from_addr, pad=32),
-                        to_address=to_bytes(to_addr, pad=32),
-                        value=transfer_value,
-                        **shared_params,  # type: ignore
-                    )
-                )
-
-            # -----------------------------------------
-            # ERC721 Transfer Cases
-            # -----------------------------------------
-
-            case (
-                ["_from", "_to", "_tokenId"]
-                | ["_from", "to", "tokenId"]
-                | ["from_", "to", "tokenId"]
-                | ["from", "to", "token_id"]
-            ):  # ERC721 transfers
-                token_id = next(
-                    (
-                        event.decoded_params[key]
-                        for key in ["token_id", "_tokenId", "tokenId"]
-                        if key in event.decoded_params
-                    ),
-                    None,
-                )
-
-                from_addr = next(
-                    (event.decoded_params[key] for key in ["_from", "from", "from_"] if key in event.decoded_params),
-                    None,
-                )
-
-                to_addr = next(
-                    (event.decoded_params[key] for key in ["_to", "to"] if key in event.decoded_params), None
-                )
-
-                token_id_int = hex_to_int(token_id) if isinstance(token_id, str) else token_id
-
-                if (
-                    (from_addr is None or not isinstance(from_addr, str))
-                    or (to_addr is None or not isinstance(to_addr, str))
-                    or (token_id_int is None or not isinstance(token_id_int, int))
-                ):
-                    logger.warning(f"Could not parse Starknet Event into ERC721 Transfer: {event}")
-                    continue
-
-                token_id_byte_len = max((token_id_int.bit_length() + 7) // 8, 1)  # 8 bits per byte
-                token_id_bytes = token_id_int.to_bytes(token_id_byte_len, byteorder="big")
-
-                erc721_transfers.append(
-                    ERC721Transfer(
-                        from_address=to_bytes(from_addr, pad=32),
-                        to_address=to_bytes(to_addr, pad=32),
-                        token_id=token_id_bytes,
-                        **shared_params,  # type: ignore
-                    )
-                )
-
-            case _:
-                continue
+        extractor = get_transfer_extractor(tuple(event.decoded_params))
+        if extractor is None:
+            continue
+
+        if extractor.standard == "erc20":
+            if erc20_transfer := _extract_erc20_transfer(event, extractor):
+                erc20_transfers.append(erc20_transfer)
+        elif erc721_transfer := _extract_erc721_transfer(event, extractor):
+            erc721_transfers.append(erc721_transfer)
+
+    if address_encoder is not None:
+        return (
+            encode_erc20_transfers(erc20_transfers, address_encoder),
+            encode_erc721_transfers(erc721_transfers, address_encoder),
+        )
 
     return erc20_transfers, erc721_transfers
+
+
+def partition_events_by_selector(events: list[Event]) -> dict[bytes, list[Event]]:
+    """
+    Group events by their selector (the first event key).  Events without keys are skipped.  Events keep their
+    original order within each group
+    """
+    partitioned: dict[bytes, list[Event]] = {}
+    for event in events:
+        if event.keys:
+            partitioned.setdefault(event.keys[0], []).append(event)
+    return partitioned
+
+
+@overload
+def filter_transfers_batch(
+    events: list[Event],
+    decode_events: Callable[[list[Event]], None] | None = None,
+    address_encoder: None = None,
+) -> tuple[list[ERC20Transfer], list[ERC721Transfer]]: ...
+
+
+@overload
+def filter_transfers_batch(
+    events: list[Event],
+    decode_events: Callable[[list[Event]], None] | None = None,
+    *,
+    address_encoder: AddressEncoder,
+) -> tuple[EncodedERC20Transfers, EncodedERC721Transfers]: ...
+
+
+@overload
+def filter_transfers_batch(
+    events: list[Event],
+    decode_events: Callable[[list[Event]], None] | None,
+    address_encoder: AddressEncoder,
+) -> tuple[EncodedERC20Transfers, EncodedERC721Transfers]: ...
+
+
+def filter_transfers_batch(
+    events: list[Event],
+    decode_events: Callable[[list[Event]], None] | None = None,
+    address_encoder: AddressEncoder | None = None,
+) -> (
+    tuple[list[ERC20Transfer], list[ERC721Transfer]]
+    | tuple[EncodedERC20Transfers, EncodedERC721Transfers]
+):
+    """
+    Batch version of filter_transfers for undecoded events.  Events are partitioned by selector first, so only
+    events with the Transfer selector are decoded & passed to the transfer extractors.
+
+    :param events: Events to filter.  Events can be undecoded
+    :param decode_events:
+        Callback that sets decoded_params on a list of events in place.  If None, events are expected to be
+        decoded already
+    :param address_encoder: If provided, transfers are returned with addresses encoded as ids.  See filter_transfers
+    """
+    transfer_events = partition_events_by_selector(events).get(TRANSFER_SIGNATURE, [])
+    if decode_events and transfer_events:
+        decode_events(transfer_events)
+
+    return filter_transfers(transfer_events, address_encoder)
@@ -1,5 +1,9 @@
+import json
 import logging
-from typing import Any
+import os
+from array import array
+from bisect import bisect_right
+from typing import Any, Iterable
 
 from nethermind.idealis.parse.starknet.event import TRANSFER_SIGNATURE
 from nethermind.idealis.types.base import ERC721Transfer
@@ -32,6 +36,19 @@ V1_IDENTITY_EXTENDED_VERIFIER_DATA_UPDATE = starknet_keccak(b"ExtendedVerifierDa
 V1_IDENTITY_USER_DATA_UPDATE = starknet_keccak(b"UserDataUpdate")
 V1_IDENTITY_EXTENDED_USER_DATA_UPDATE = starknet_keccak(b"ExtendedUserDataUpdate")
 
+ADDR_TO_DOMAIN_SELECTORS = {V1_ADDR_TO_DOMAIN_UPDATE, V2_ADDR_TO_DOMAIN_UPDATE}
+IDENTITY_UPDATE_SELECTORS = {
+    TRANSFER_SIGNATURE,
+    V0_NAMING_DOMAIN_MINT,
+    V1_NAMING_DOMAIN_MINT,
+    V1_IDENTITY_MAIN_ID_UPDATE,
+}
+IDENTITY_DATA_SELECTORS = {
+    V1_IDENTITY_VERIFIER_DATA_UPDATE,
+    V1_IDENTITY_EXTENDED_VERIFIER_DATA_UPDATE,
+    V1_IDENTITY_USER_DATA_UPDATE,
+    V1_IDENTITY_EXTENDED_USER_DATA_UPDATE,
+}
 
 root_logger = logging.getLogger("nethermind")
 logger = root_logger.getChild("parse").getChild("starknet")
@@ -249,22 +266,17 @@ def parse_starknet_id_updates(
     starknet_id_updates = []
 
     grouped_events: dict[tuple[int, int], list[Event]] = {}
+    starknet_id_contracts = {naming_contract, identity_contract, verifier_contract}
 
     for e in events:
-        if not e.contract_address in {naming_contract, identity_contract, verifier_contract}:
-            continue
-
-        tx_key = (e.block_number, e.transaction_index)
-        if tx_key in grouped_events:
-            grouped_events[tx_key].append(e)
-        else:
-            grouped_events[tx_key] = [e]
+        if e.contract_address in starknet_id_contracts and e.keys:
+            grouped_events.setdefault((e.block_number, e.transaction_index), []).append(e)
 
-    sorted_keys = sorted(grouped_events.keys())
-
-    for update_tx in sorted_keys:
+    for update_tx in sorted(grouped_events):
         try:
             update_events = grouped_events[update_tx]
+            # Only scan the tx events with the helpers for update kinds that are present in the tx
+            tx_selectors = {e.keys[0] for e in update_events}
             update_params = {
                 "block_number": update_tx[0],
                 "transaction_index": update_tx[1],
@@ -273,7 +285,9 @@ def parse_starknet_id_updates(
             }
 
             # Simple Subdomain Registration
-            _domain_to_address_updates = _get_addr_to_domain_updates(update_events)
+            _domain_to_address_updates = (
+                _get_addr_to_domain_updates(update_events) if tx_selectors & ADDR_TO_DOMAIN_SELECTORS else None
+            )
             if _domain_to_address_updates:
                 updates = {}
                 for address, domain in _domain_to_address_updates:
@@ -290,9 +304,12 @@ def parse_starknet_id_updates(
                     )
 
             # Domain Identity Update -- All updates tied to a Identity Token ID
-            _id_transfers = _get_identity_transfers(update_events, identity_contract)
-            _domain_mints = _get_domain_mints(update_events, naming_contract)
-            _main_id_updates = _get_main_id_updates(update_events, identity_contract)
+            _id_transfers, _domain_mints, _main_id_updates = None, None, None
+            if tx_selectors & IDENTITY_UPDATE_SELECTORS:
+                _id_transfers = _get_identity_transfers(update_events, identity_contract)
+                _domain_mints = _get_domain_mints(update_events, naming_contract)
+                _main_id_updates = _get_main_id_updates(update_events, identity_contract)
+
             if _id_transfers or _domain_mints or _main_id_updates:
                 distinct_ids = set(_id_transfers or {}).union(_domain_mints or {}).union(_main_id_updates or {})
 
@@ -320,8 +337,10 @@ def parse_starknet_id_updates(
                     )
 
             # Identity User & Verifier Data Update
-            _verifier_data = _get_identity_verifier_data(update_events, identity_contract)
-            _user_data = _get_identity_user_data(update_events, identity_contract)
+            _verifier_data, _user_data = None, None
+            if tx_selectors & IDENTITY_DATA_SELECTORS:
+                _verifier_data = _get_identity_verifier_data(update_events, identity_contract)
+                _user_data = _get_identity_user_data(update_events, identity_contract)
 
             if _verifier_data or _user_data:
                 unique_ids = set(_verifier_data or {}).union(_user_data or {})
@@ -436,3 +455,252 @@ def generate_starknet_id_state(
                     identity.user_data.update(new_user_data)
 
     return identity_state, address_to_domain, address_to_identity
+
+
+def _update_version(block_number: int, transaction_index: int) -> int:
+    return (block_number << 32) | (transaction_index & 0xFFFFFFFF)
+
+
+def _identity_to_json(identity: StarknetIDIdentity) -> dict[str, Any]:
+    return {
+        "owner": identity.owner.hex() if identity.owner else None,
+        "domain": identity.domain,
+        "expire": identity.expire,
+        "verifier_data": {
+            field: [[d.hex() for d in data], verifier.hex()]
+            for field, (data, verifier) in identity.verifier_data.items()
+        },
+        "user_data": {field: [d.hex() for d in data] for field, data in identity.user_data.items()},
+    }
+
+
+def _identity_from_json(identity_id: int, identity_json: dict[str, Any]) -> StarknetIDIdentity:
+    return StarknetIDIdentity(
+        identity_nft_id=identity_id,
+        owner=bytes.fromhex(identity_json["owner"]) if identity_json["owner"] else None,  # type: ignore[arg-type]
+        domain=identity_json["domain"],
+        expire=identity_json["expire"],
+        verifier_data={
+            field: ([bytes.fromhex(d) for d in data], bytes.fromhex(verifier))
+            for field, (data, verifier) in identity_json["verifier_data"].items()
+        },
+        user_data={field: [bytes.fromhex(d) for d in data] for field, data in identity_json["user_data"].items()},
+    )
+
+
+class StarknetIDIndex:
+    """
+    Incrementally maintained Starknet ID state.  Updates are applied in block & transaction order with constant
+    time dict & set updates, instead of rebuilding the state from the full update history with
+    generate_starknet_id_state.
+
+    Alongside the identity state, the index maintains reverse lookups from domain -> identity and
+    owner -> identities, and the history of address -> domain updates, so addresses can be resolved to their
+    domain at any indexed block.
+
+    If a path is provided, the index is snapshotted to a JSON file every checkpoint_interval blocks.  When
+    reopening the index, the last snapshot is loaded, and ingestion can resume from resume_block.
+
+    .. code-block:: python
+
+        index = StarknetIDIndex("starknet_id.json")
+        for events in stream_events(index.resume_block):
+            index.apply_events(events)
+
+        domain = index.resolve_address(address, block_number=700_000)
+
+    :param path: Path of the snapshot file.  If None, the index is only kept in memory
+    :param checkpoint_interval: Number of blocks between automatic checkpoints
+    """
+
+    def __init__(self, path: str | None = None, checkpoint_interval: int = 10_000):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+
+        self.identities: dict[int, StarknetIDIdentity] = {}
+        self.address_to_domain: dict[bytes, str] = {}
+        self.domain_to_identity: dict[str, int] = {}
+        self.owner_to_identities: dict[bytes, set[int]] = {}
+
+        # Address -> (array("Q") of update versions, domain after each update)
+        self._domain_history: dict[bytes, tuple[array, list[str | None]]] = {}
+
+        self._last_version = -1
+        self.last_block = -1
+        self.checkpoint_block = -1
+
+        if path and os.path.exists(path):
+            self._load(path)
+
+    @property
+    def resume_block(self) -> int:
+        """First block that is not covered by the last checkpoint"""
+        return self.checkpoint_block + 1
+
+    def get_identity(self, identity_id: int) -> StarknetIDIdentity | None:
+        return self.identities.get(identity_id)
+
+    def get_domain_identity(self, domain: str) -> StarknetIDIdentity | None:
+        """Return the identity that a domain is minted to"""
+        identity_id = self.domain_to_identity.get(domain)
+        return None if identity_id is None else self.identities.get(identity_id)
+
+    def get_owner_identities(self, owner: bytes) -> list[StarknetIDIdentity]:
+        """Return the identities currently owned by an address"""
+        return [self.identities[identity_id] for identity_id in sorted(self.owner_to_identities.get(owner, ()))]
+
+    def resolve_address(self, address: bytes, block_number: int | None = None) -> str | None:
+        """
+        Resolve an address to its domain.  If block_number is provided, the domain is resolved at the end of that
+        block, otherwise the latest indexed domain is returned.
+        """
+        if block_number is None:
+            return self.address_to_domain.get(address)
+
+        history = self._domain_history.get(address)
+        if history is None:
+            return None
+
+        versions, domains = history
+        position = bisect_right(versions, _update_version(block_number, -1))
+        return domains[position - 1] if position else None
+
+    def _set_address_domain(self, address: bytes, domain: str | None, version: int):
+        if domain is None:
+            self.address_to_domain.pop(address, None)
+        else:
+            self.address_to_domain[address] = domain
+
+        versions, domains = self._domain_history.setdefault(address, (array("Q"), []))
+        if versions and versions[-1] == version:  # Multiple updates in one tx, keep the final domain
+            domains[-1] = domain
+        else:
+            versions.append(version)
+            domains.append(domain)
+
+    def _set_owner(self, identity: StarknetIDIdentity, new_owner: bytes):
+        if identity.owner in self.owner_to_identities:
+            owned = self.owner_to_identities[identity.owner]
+            owned.discard(identity.identity_nft_id)
+            if not owned:
+                del self.owner_to_identities[identity.owner]
+
+        identity.owner = new_owner
+        self.owner_to_identities.setdefault(new_owner, set()).add(identity.identity_nft_id)
+
+    def _apply_identity_update(self, update: StarknetIDUpdate):
+        identity_id = int.from_bytes(update.identity, "big")
+        domains, new_owner = update.data["domains"], update.data["new_owner"]
+
+        identity = self.identities.get(identity_id)
+        if identity is None:
+            # Identities minted without a domain use an empty domain until a domain is minted to the identity
+            identity = StarknetIDIdentity(
+                identity_nft_id=identity_id,
+                owner=None,  # type: ignore[arg-type]
+                domain="",
+                expire=0,
+                verifier_data={},
+                user_data={},
+            )
+            self.identities[identity_id] = identity
+
+        if domains:
+            for domain_name, _ in domains:
+                self.domain_to_identity[domain_name] = identity_id
+            identity.domain, identity.expire = domains[-1]
+
+        if new_owner:
+            self._set_owner(identity, new_owner)
+
+    def _apply_identity_data_update(self, update: StarknetIDUpdate):
+        identity_id = int.from_bytes(update.identity, "big")
+        identity = self.identities.get(identity_id)
+        if identity is None:
+            logger.warning(f"Skipping data update for nonexistent Starknet ID identity {identity_id}")
+            return
+
+        if update.data["verifier_data"]:
+            identity.verifier_data.update(update.data["verifier_data"])
+        if update.data["user_data"]:
+            identity.user_data.update(update.data["user_data"])
+
+    def apply_update(self, update: StarknetIDUpdate):
+        """Apply a single update.  Updates must be applied in block & transaction order"""
+        version = _update_version(update.block_number, update.transaction_index)
+        if version < self._last_version:
+            raise ValueError(
+                f"Starknet ID updates must be applied in order.  Received update for block {update.block_number} "
+                f"tx {update.transaction_index} after block {self.last_block}"
+            )
+
+        if update.block_number > self.last_block >= self.checkpoint_block + self.checkpoint_interval:
+            self.checkpoint()  # All updates for last_block have been applied
+
+        match update.kind:
+            case StarknetIDUpdateKind.address_to_domain_update:
+                self._set_address_domain(update.data["address"], update.data["domain"], version)
+            case StarknetIDUpdateKind.identity_update:
+                self._apply_identity_update(update)
+            case StarknetIDUpdateKind.identity_data_update:
+                self._apply_identity_data_update(update)
+
+        self._last_version, self.last_block = version, update.block_number
+
+    def apply_updates(self, updates: Iterable[StarknetIDUpdate]):
+        for update in updates:
+            self.apply_update(update)
+
+    def apply_events(self, events: list[Event], **contracts: bytes):
+        """
+        Parse Starknet ID updates from events & apply them to the index.  Events must be passed in block order,
+        and every event for a block must be passed in the same call.
+
+        :param events: Events to parse
+        :param contracts: naming_contract, identity_contract & verifier_contract overrides passed to
+            parse_starknet_id_updates
+        """
+        self.apply_updates(parse_starknet_id_updates(events, **contracts))
+
+    def checkpoint(self):
+        """Snapshot the index to disk, and mark every block up to last_block as complete"""
+        if self.path:
+            snapshot = {
+                "block_number": self.last_block,
+                "last_version": self._last_version,
+                "identities": {
+                    str(identity_id): _identity_to_json(identity) for identity_id, identity in self.identities.items()
+                },
+                "domain_to_identity": self.domain_to_identity,
+                "domain_history": {
+                    address.hex(): [list(versions), domains]
+                    for address, (versions, domains) in self._domain_history.items()
+                },
+            }
+
+            snapshot_tmp = self.path + ".tmp"
+            with open(snapshot_tmp, "w") as snapshot_file:
+                json.dump(snapshot, snapshot_file)
+            os.replace(snapshot_tmp, self.path)
+
+        self.checkpoint_block = self.last_block
+
+    def _load(self, path: str):
+        with open(path, "r") as snapshot_file:
+            snapshot = json.load(snapshot_file)
+
+        for identity_id, identity_json in snapshot["identities"].items():
+            identity = _identity_from_json(int(identity_id), identity_json)
+            self.identities[identity.identity_nft_id] = identity
+            if identity.owner:
+                self.owner_to_identities.setdefault(identity.owner, set()).add(identity.identity_nft_id)
+
+        self.domain_to_identity = snapshot["domain_to_identity"]
+        for address_hex, (versions, domains) in snapshot["domain_history"].items():
+            address = bytes.fromhex(address_hex)
+            self._domain_history[address] = (array("Q", versions), domains)
+            if domains[-1] is not None:
+                self.address_to_domain[address] = domains[-1]
+
+        self._last_version = snapshot["last_version"]
+        self.last_block = self.checkpoint_block = snapshot["block_number"]
@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from nethermind.idealis.parse.starknet.event import (
+    TRANSFER_SIGNATURE,
+    filter_transfers_batch,
+)
+from nethermind.idealis.parse.starknet.protocol.starknet_id import (
+    parse_starknet_id_updates,
+)
+from nethermind.idealis.types.starknet.core import Event
+from nethermind.idealis.utils.address_encoder import AddressEncoder
+from nethermind.idealis.utils.starknet.protocol import (
+    STARKNET_ID_MAINNET_IDENTITY_CONTRACT,
+    STARKNET_ID_MAINNET_NAMING_CONTRACT,
+    STARKNET_ID_MAINNET_VERIFIER_CONTRACT,
+)
+
+
+@dataclass(slots=True)
+class EventHandler:
+    """
+    Protocol parser registered with an EventRouter.  Receives every event in a batch emitted by one of the
+    contracts with one of the selectors.  If contracts or selectors is None, events from any contract, or with any
+    selector are matched.
+    """
+
+    name: str
+    handler: Callable[[list[Event]], Any]
+    contracts: frozenset[bytes] | None
+    selectors: frozenset[bytes] | None
+
+    def matches(self, contract_address: bytes, selector: bytes | None) -> bool:
+        return (self.contracts is None or contract_address in self.contracts) and (
+            self.selectors is None or selector in self.selectors
+        )
+
+
+class EventRouter:
+    """
+    Routes a batch of events to protocol parsers in a single pass.  Events are indexed by
+    (contract_address, keys[0]), the matching handlers are resolved once for each distinct pair in the batch, and
+    each handler is called once with its matching events, in their original order.
+
+    .. code-block:: python
+
+        router = EventRouter()
+        router.register("starknet_id", parse_starknet_id_updates, contracts=[naming_contract, identity_contract])
+        router.register("transfers", filter_transfers, selectors=[TRANSFER_SIGNATURE])
+
+        results = router.route(events)
+        starknet_id_updates = results["starknet_id"]
+    """
+
+    def __init__(self):
+        self.handlers: list[EventHandler] = []
+
+    def register(
+        self,
+        name: str,
+        handler: Callable[[list[Event]], Any],
+        contracts: Iterable[bytes] | None = None,
+        selectors: Iterable[bytes] | None = None,
+    ):
+        """
+        Register a protocol parser.
+
+        :param name: Key of the handler result returned by route()
+        :param handler: Callable parsing a list of events
+        :param contracts: Contract addresses the handler parses events from.  If None, matches every contract
+        :param selectors: Event selectors (keys[0]) the handler parses.  If None, matches every selector
+        """
+        if any(registered.name == name for registered in self.handlers):
+            raise ValueError(f"Event handler {name} is already registered")
+
+        self.handlers.append(
+            EventHandler(
+                name=name,
+                handler=handler,
+                contracts=None if contracts is None else frozenset(contracts),
+                selectors=None if selectors is None else frozenset(selectors),
+            )
+        )
+
+    def partition(self, events: list[Event]) -> dict[str, list[Event]]:
+        """Partition a batch of events into the events matched by each handler"""
+        handler_events: dict[str, list[Event]] = {handler.name: [] for handler in self.handlers}
+        routes: dict[tuple[bytes, bytes | None], list[list[Event]]] = {}
+
+        for event in events:
+            route_key = (event.contract_address, event.keys[0] if event.keys else None)
+            route = routes.get(route_key)
+            if route is None:
+                route = routes[route_key] = [
+                    handler_events[handler.name] for handler in self.handlers if handler.matches(*route_key)
+                ]
+
+            for matched_events in route:
+                matched_events.append(event)
+
+        return handler_events
+
+    def route(self, events: list[Event]) -> dict[str, Any]:
+        """
+        Dispatch a batch of events to the registered handlers.  Handlers without any matching events are not
+        called, and are omitted from the results.
+
+        :return: Mapping of handler name -> handler result
+        """
+        return {
+            handler.name: handler.handler(matched_events)
+            for handler, matched_events in zip(self.handlers, self.partition(events).values())
+            if matched_events
+        }
+
+
+def get_protocol_router(
+    decode_events: Callable[[list[Event]], None] | None = None,
+    naming_contract: bytes = STARKNET_ID_MAINNET_NAMING_CONTRACT,
+    identity_contract: bytes = STARKNET_ID_MAINNET_IDENTITY_CONTRACT,
+    verifier_contract: bytes = STARKNET_ID_MAINNET_VERIFIER_CONTRACT,
+    address_encoder: AddressEncoder | None = None,
+) -> EventRouter:
+    """
+    Return an EventRouter with the built in protocol parsers registered.
+
+    * ``starknet_id``: list[StarknetIDUpdate] from parse_starknet_id_updates
+    * ``transfers``: (erc20_transfers, erc721_transfers) from filter_transfers_batch
+
+    :param decode_events:
+        Callback that sets decoded_params on a list of events in place.  Only Transfer events are decoded.  If
+        None, events are expected to be decoded already
+    :param address_encoder: If provided, transfers are returned with addresses encoded as ids
+    """
+    starknet_id_contracts = (naming_contract, identity_contract, verifier_contract)
+
+    router = EventRouter()
+    router.register(
+        "starknet_id",
+        lambda events: parse_starknet_id_updates(events, *starknet_id_contracts),
+        contracts=starknet_id_contracts,
+    )
+    router.register(
+        "transfers",
+        lambda events: filter_transfers_batch(events, decode_events, address_encoder),
+        selectors=[TRANSFER_SIGNATURE],
+    )
+    return router
@@ -0,0 +1,83 @@
+from array import array
+from typing import Any
+
+from nethermind.idealis.types.starknet.core import StateDiff
+from nethermind.idealis.types.starknet.state import DecodedStateDiff
+
+
+def _felt(hex_felt: str) -> bytes:
+    return int(hex_felt, 16).to_bytes(32, "big")
+
+
+def _felt_column(hex_felts: list[str]) -> bytes:
+    return b"".join(_felt(hex_felt) for hex_felt in hex_felts)
+
+
+def parse_state_diff_columns(
+    state_diff: dict[str, Any],
+    block_number: int,
+    tx_hash: bytes,
+    transaction_index: int = -1,
+) -> DecodedStateDiff:
+    """
+    Decode a JSON state diff from a Starknet RPC response into a DecodedStateDiff with fixed width binary columns.
+    Hex strings are decoded once, and each felt is stored as 32 bytes, instead of a 66 character hex string
+    inside nested dicts.
+
+    :param state_diff: JSON state diff from the trace or state update response
+    :param block_number: Block number of the state diff
+    :param tx_hash: Transaction hash of the state diff
+    :param transaction_index: Transaction index of the state diff.  -1 for block level state updates
+    """
+    storage_contracts, storage_keys, storage_values = bytearray(), bytearray(), bytearray()
+    storage_offsets = array("I", [0])
+
+    for contract_diff in state_diff.get("storage_diffs", []):
+        storage_contracts += _felt(contract_diff["address"])
+        for storage_entry in contract_diff["storage_entries"]:
+            storage_keys += _felt(storage_entry["key"])
+            storage_values += _felt(storage_entry["value"])
+        storage_offsets.append(len(storage_keys) // 32)
+
+    nonces = state_diff.get("nonces", [])
+    deployed_contracts = state_diff.get("deployed_contracts", [])
+    replaced_classes = state_diff.get("replaced_classes", [])
+    declared_classes = state_diff.get("declared_classes", [])
+
+    return DecodedStateDiff(
+        block_number=block_number,
+        tx_hash=tx_hash,
+        transaction_index=transaction_index,
+        storage_contracts=bytes(storage_contracts),
+        storage_offsets=storage_offsets,
+        storage_keys=bytes(storage_keys),
+        storage_values=bytes(storage_values),
+        nonce_contracts=_felt_column([nonce["contract_address"] for nonce in nonces]),
+        nonces=_felt_column([nonce["nonce"] for nonce in nonces]),
+        deployed_addresses=_felt_column([deployed["address"] for deployed in deployed_contracts]),
+        deployed_class_hashes=_felt_column([deployed["class_hash"] for deployed in deployed_contracts]),
+        replaced_addresses=_felt_column([replaced["contract_address"] for replaced in replaced_classes]),
+        replaced_class_hashes=_felt_column([replaced["class_hash"] for replaced in replaced_classes]),
+        declared_class_hashes=_felt_column([declared["class_hash"] for declared in declared_classes]),
+        declared_compiled_class_hashes=_felt_column(
+            [declared["compiled_class_hash"] for declared in declared_classes]
+        ),
+        deprecated_declared_classes=_felt_column(state_diff.get("deprecated_declared_classes", [])),
+    )
+
+
+def decode_state_diff(state_diff: StateDiff) -> DecodedStateDiff:
+    """Convert a StateDiff returned by the trace parsers into a DecodedStateDiff"""
+    return parse_state_diff_columns(
+        state_diff={
+            "storage_diffs": state_diff.storage_diffs,
+            "nonces": state_diff.nonces,
+            "deployed_contracts": state_diff.deployed_contracts,
+            "replaced_classes": state_diff.replaced_classes,
+            "declared_classes": state_diff.declared_classes,
+            "deprecated_declared_classes": state_diff.deprecated_declared_classes,
+        },
+        block_number=state_diff.block_number,
+        tx_hash=state_diff.tx_hash,
+        transaction_index=state_diff.transaction_index,
+    )
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
-from dataclasses import fields as dataclass_fields
-from typing import Any, Sequence
+from typing import Any, Callable, Collection, Iterable, Iterator, Sequence
 
+from nethermind.idealis.metrics import instrument_parser
 from nethermind.idealis.parse.shared.trace import (
+    TraceTree,
     get_root_trace,
     get_toplevel_child_traces,
 )
@@ -12,6 +13,7 @@ from nethermind.idealis.types.starknet.core import (
     StateDiff,
     Trace,
     TraceCall,
+    Transaction,
 )
 from nethermind.idealis.types.starknet.enums import EntryPointType, TraceCallType
 from nethermind.idealis.utils import to_bytes
@@ -19,6 +21,21 @@ from nethermind.starknet_abi.utils import starknet_keccak
 
 EXECUTE_SELECTOR = starknet_keccak(b"__execute__")
 
+TRACE_SECTIONS = frozenset(
+    {
+        "validate_traces",
+        "validate_events",
+        "constructor_traces",
+        "constructor_events",
+        "execute_traces",
+        "execute_events",
+        "fee_transfer_traces",
+        "fee_transfer_events",
+        "state_diff",
+    }
+)
+""" Sections of a ParsedTransactionTrace that can be requested with the sections argument of the trace unpackers """
+
 
 def get_execute_trace(traces: list[Trace]) -> Trace | None:
     """
@@ -43,9 +60,12 @@ def get_user_operations(traces: list[Trace] | None) -> list[DecodedOperation]:
     if traces is None or len(traces) == 0:
         return []
 
-    execute_trace = get_execute_trace(traces)
+    return _get_user_operations(TraceTree(traces), get_execute_trace(traces))
+
+
+def _get_user_operations(trace_tree: TraceTree, execute_trace: Trace | None) -> list[DecodedOperation]:
     if execute_trace is None:
-        top_trace = get_root_trace(traces)
+        top_trace = get_root_trace(trace_tree)
         return [
             DecodedOperation(
                 operation_name=top_trace.function_name,
@@ -53,7 +73,7 @@ def get_user_operations(traces: list[Trace] | None) -> list[DecodedOperation]:
             )
         ]
 
-    multicalls: Sequence[Trace] = get_toplevel_child_traces(traces, execute_trace.trace_address)
+    multicalls: Sequence[Trace] = get_toplevel_child_traces(trace_tree, execute_trace.trace_address)
     multicalls = sorted(multicalls, key=lambda t: t.trace_address)
     decoded_ops = []
     for call in multicalls:
@@ -84,51 +104,144 @@ class ParsedTransactionTrace:
     fee_transfer_events: list[Event]
 
 
-# TODO: Improve this spaghetti
 @dataclass(slots=True)
 class ParsedBlockTrace(ParsedTransactionTrace):
     state_diff: list[StateDiff]
 
     @classmethod
     def init(cls):
-        return ParsedBlockTrace(**{field.name: list() for field in dataclass_fields(ParsedBlockTrace)})
+        return ParsedBlockTrace(
+            state_diff=[],
+            validate_traces=[],
+            constructor_traces=[],
+            execute_traces=[],
+            fee_transfer_traces=[],
+            validate_events=[],
+            constructor_events=[],
+            execute_events=[],
+            fee_transfer_events=[],
+        )
 
     def add_transaction_trace(self, transaction_trace: ParsedTransactionTrace):
-        for dataclass_field in dataclass_fields(transaction_trace):
-            if dataclass_field.name == "state_diff":
-                if isinstance(transaction_trace.state_diff, StateDiff):
-                    self.state_diff += [transaction_trace.state_diff]
-                continue
-
-            tx_field = getattr(transaction_trace, dataclass_field.name)
-            if len(tx_field):
-                block_field = getattr(self, dataclass_field.name)
-                block_field += tx_field
+        if transaction_trace.state_diff is not None:
+            self.state_diff.append(transaction_trace.state_diff)
+
+        self.validate_traces.extend(transaction_trace.validate_traces)
+        self.constructor_traces.extend(transaction_trace.constructor_traces)
+        self.execute_traces.extend(transaction_trace.execute_traces)
+        self.fee_transfer_traces.extend(transaction_trace.fee_transfer_traces)
+        self.validate_events.extend(transaction_trace.validate_events)
+        self.constructor_events.extend(transaction_trace.constructor_events)
+        self.execute_events.extend(transaction_trace.execute_events)
+        self.fee_transfer_events.extend(transaction_trace.fee_transfer_events)
 
     def add_block_trace(self, block_trace: "ParsedBlockTrace"):
-        for dataclass_field in dataclass_fields(block_trace):
-            block_field = getattr(self, dataclass_field.name)
-            add_data = getattr(block_trace, dataclass_field.name)
-            if add_data is None:
-                continue
-
-            block_field += add_data
+        if block_trace.state_diff:
+            self.state_diff.extend(block_trace.state_diff)
+
+        self.validate_traces.extend(block_trace.validate_traces)
+        self.constructor_traces.extend(block_trace.constructor_traces)
+        self.execute_traces.extend(block_trace.execute_traces)
+        self.fee_transfer_traces.extend(block_trace.fee_transfer_traces)
+        self.validate_events.extend(block_trace.validate_events)
+        self.constructor_events.extend(block_trace.constructor_events)
+        self.execute_events.extend(block_trace.execute_events)
+        self.fee_transfer_events.extend(block_trace.fee_transfer_events)
 
     @classmethod
     def from_block_traces(cls, block_traces: Sequence["ParsedBlockTrace"]) -> "ParsedBlockTrace":
-        output_trace = block_traces[0]
-        if output_trace.state_diff is None:
-            output_trace.state_diff = []
-
-        for block_trace in block_traces[1:]:
+        """
+        Merge block traces into a new ParsedBlockTrace.  The input traces are not modified, and the returned
+        trace never shares lists with the inputs
+        """
+        output_trace = cls.init()
+        for block_trace in block_traces:
             output_trace.add_block_trace(block_trace)
 
         return output_trace
 
 
+def get_block_user_operations(
+    block_trace: ParsedBlockTrace,
+    decode_traces: Callable[[list[Trace]], Any] | None = None,
+) -> dict[tuple[int, int], list[DecodedOperation]]:
+    """
+    Extract the user operations of every transaction in a ParsedBlockTrace.  Execute traces are grouped by
+    transaction, and the __execute__ trace of each transaction is found in the same pass, so extraction is linear
+    in the number of traces instead of re-filtering traces for each transaction.
+
+    .. code-block:: python
+
+        decoder = PessimisticDecoder(rpc_url)
+        user_ops = get_block_user_operations(
+            block_trace, decode_traces=lambda traces: decode_traces_batch(traces, decoder)
+        )
+        set_transaction_user_operations(transactions, user_ops)
+
+    :param block_trace: Parsed traces for one or more blocks
+    :param decode_traces:
+        Callback that sets function_name, decoded_inputs & decoded_outputs on a list of traces in place.  Called once
+        with every trace in the block, so traces can be decoded in per-class batches.  If None, traces are expected
+        to be decoded already
+    :return: {(block_number, transaction_index): [DecodedOperation, ...]}
+    """
+    if decode_traces:
+        all_traces = (
+            block_trace.validate_traces
+            + block_trace.constructor_traces
+            + block_trace.execute_traces
+            + block_trace.fee_transfer_traces
+        )
+        if all_traces:
+            decode_traces(all_traces)
+
+    tx_traces: dict[tuple[int, int], list[Trace]] = {}
+    tx_execute_traces: dict[tuple[int, int], Trace] = {}
+
+    for trace in block_trace.execute_traces:
+        tx_key = (trace.block_number, trace.transaction_index)
+        tx_traces.setdefault(tx_key, []).append(trace)
+
+        if trace.selector == EXECUTE_SELECTOR:  # Track the deepest __execute__ trace, matching get_execute_trace
+            execute_trace = tx_execute_traces.get(tx_key)
+            if execute_trace is None or len(trace.trace_address) > len(execute_trace.trace_address):
+                tx_execute_traces[tx_key] = trace
+
+    return {
+        tx_key: _get_user_operations(TraceTree(traces), tx_execute_traces.get(tx_key))
+        for tx_key, traces in tx_traces.items()
+    }
+
+
+def set_transaction_user_operations(
+    transactions: Iterable[Transaction],
+    user_operations: dict[tuple[int, int], list[DecodedOperation]],
+):
+    """Set user_operations in place on transactions using the output of get_block_user_operations"""
+    for transaction in transactions:
+        tx_key = (transaction.block_number, transaction.transaction_index)
+        transaction.user_operations = user_operations.get(tx_key, [])
+
+
+def _count_block_trace_objects(block_trace: ParsedBlockTrace) -> int:
+    return (
+        len(block_trace.state_diff)
+        + len(block_trace.validate_traces)
+        + len(block_trace.constructor_traces)
+        + len(block_trace.execute_traces)
+        + len(block_trace.fee_transfer_traces)
+        + len(block_trace.validate_events)
+        + len(block_trace.constructor_events)
+        + len(block_trace.execute_events)
+        + len(block_trace.fee_transfer_events)
+    )
+
+
+@instrument_parser("starknet_trace_block", count_objects=_count_block_trace_objects)
 def unpack_trace_block_response(
     trace_response: list[dict[str, Any]],
     block_number: int,
+    sections: Collection[str] | None = None,
 ) -> ParsedBlockTrace:
     """
     Unpack the trace response into a list of Trace dataclasses.
@@ -136,9 +249,11 @@ def unpack_trace_block_response(
 
     :param trace_response: JSON decoded Trace response.
     :param block_number: The block number of the trace response.
+    :param sections: Sections to parse.  See unpack_trace_response()
 
     :return:
     """
+    sections = _validate_sections(sections)
     block_trace = ParsedBlockTrace.init()
 
     for transaction_index, trace_dict in enumerate(trace_response):
@@ -146,6 +261,7 @@ def unpack_trace_block_response(
             trace_response=trace_dict,
             block_number=block_number,
             transaction_index=transaction_index,
+            sections=sections,
         )
 
         block_trace.add_transaction_trace(transaction_trace)
@@ -202,59 +318,101 @@ def _get_root_call(
     )
 
 
-def unpack_trace_response(
+def _validate_sections(sections: Collection[str] | None) -> frozenset[str]:
+    if sections is None:
+        return TRACE_SECTIONS
+
+    sections = frozenset(sections)
+    if unknown_sections := sections - TRACE_SECTIONS:
+        raise ValueError(
+            f"Unknown trace sections {sorted(unknown_sections)}.  Valid sections: {sorted(TRACE_SECTIONS)}"
+        )
+    return sections
+
+
+def unpack_trace_response(  # pylint: disable=too-many-locals
     trace_response: dict[str, Any],
     block_number: int,
     transaction_index: int,
     tx_hash: bytes | None = None,
+    sections: Collection[str] | None = None,
 ) -> ParsedTransactionTrace:
     """
     Unpack the trace response into a list of Trace dataclasses.
     Generates TraceAddresses for each unpacked trace
 
+    If sections is passed, only the requested sections are parsed, and the remaining sections are returned empty.
+    Skipped sections never construct Trace or Event dataclasses, so an indexer only requiring
+    ``{"execute_events", "state_diff"}`` avoids the cost of building every trace.
+
     :param trace_response: JSON decoded Trace response.
     :param block_number:
     :param transaction_index:
     :param tx_hash:
+    :param sections: Names of the ParsedTransactionTrace fields to parse.  Defaults to all TRACE_SECTIONS
 
     :return:
     """
+    sections = _validate_sections(sections)
+
     if tx_hash is None:
         tx_hash = to_bytes(trace_response["transaction_hash"], pad=32)
 
     trace_root = trace_response["trace_root"] if "trace_root" in trace_response else trace_response
 
-    root_call = _get_root_call(trace_root, block_number, transaction_index)
+    validate_traces: list[Trace] = []
+    validate_events: list[Event] = []
+    execute_traces: list[Trace] = []
+    execute_events: list[Event] = []
+    fee_transfer_traces: list[Trace] = []
+    fee_transfer_events: list[Event] = []
+    constructor_traces: list[Trace] = []
+    constructor_events: list[Event] = []
+
+    if sections - {"state_diff"}:
+        root_call = _get_root_call(trace_root, block_number, transaction_index)
+
+        if "validate_traces" in sections or "validate_events" in sections:
+            validate_traces, validate_events = parse_validate_traces(
+                trace_root, root_call, "validate_traces" in sections, "validate_events" in sections
+            )
 
-    validate_traces, validate_events = parse_validate_traces(trace_root, root_call)
+        if "execute_traces" in sections or "execute_events" in sections:
+            execute_traces, execute_events = parse_execute_trace(
+                trace_root, root_call, "execute_traces" in sections, "execute_events" in sections
+            )
 
-    execute_traces, execute_events = parse_execute_trace(trace_root, root_call)
+        if "fee_transfer_invocation" in trace_root and (
+            "fee_transfer_traces" in sections or "fee_transfer_events" in sections
+        ):
+            fee_transfer_traces, fee_transfer_events = parse_trace_call(
+                trace_call_dict=trace_root["fee_transfer_invocation"],
+                root_call=root_call,
+                trace_path=[0],
+                include_traces="fee_transfer_traces" in sections,
+                include_events="fee_transfer_events" in sections,
+            )
 
-    if "fee_transfer_invocation" in trace_root:
-        fee_transfer_traces, fee_transfer_events = parse_trace_call(
-            trace_call_dict=trace_root["fee_transfer_invocation"],
-            root_call=root_call,
-            trace_path=[0],
-        )
-    else:
-        fee_transfer_traces, fee_transfer_events = [], []
+        if "constructor_invocation" in trace_root and (
+            "constructor_traces" in sections or "constructor_events" in sections
+        ):
+            constructor_traces, constructor_events = parse_constructor_trace(
+                trace_root["constructor_invocation"],
+                root_call,
+                "constructor_traces" in sections,
+                "constructor_events" in sections,
+            )
 
-    if "state_diff" in trace_root:
+    if "state_diff" in trace_root and "state_diff" in sections:
         state_diff = parse_state_diff(
             state_diff=trace_root["state_diff"],
             block_number=block_number,
             tx_hash=tx_hash,
+            transaction_index=transaction_index,
         )
     else:
         state_diff = None
 
-    if "constructor_invocation" in trace_root:
-        constructor_traces, constructor_events = parse_constructor_trace(
-            trace_root["constructor_invocation"], root_call
-        )
-    else:
-        constructor_traces, constructor_events = [], []
-
     return ParsedTransactionTrace(
         state_diff=state_diff,
         validate_traces=validate_traces,
@@ -271,6 +429,8 @@ def unpack_trace_response(
 def parse_validate_traces(
     trace_root: dict[str, Any],
     root_call: Trace,
+    include_traces: bool = True,
+    include_events: bool = True,
 ) -> tuple[list[Trace], list[Event]]:
     # Early Starknet Impl Had no __validate__ invocation
     if "validate_invocation" not in trace_root:
@@ -280,12 +440,16 @@ def parse_validate_traces(
         trace_call_dict=trace_root["validate_invocation"],
         root_call=root_call,
         trace_path=[0],
+        include_traces=include_traces,
+        include_events=include_events,
     )
 
 
 def parse_execute_trace(
     trace_root: dict[str, Any],
     root_call: Trace,
+    include_traces: bool = True,
+    include_events: bool = True,
 ) -> tuple[list[Trace], list[Event]]:
     """
     Parses JSON Response from trace_root['execute_invocation']
@@ -293,6 +457,8 @@ def parse_execute_trace(
 
     :param trace_root: trace['trace_root']
     :param root_call: root call for trace
+    :param include_traces: If False, Trace dataclasses are not constructed
+    :param include_events: If False, Event dataclasses are not constructed
 
     :return: (list[execute_traces], list[execute_events])
     """
@@ -301,6 +467,9 @@ def parse_execute_trace(
 
     execute_trace_json = trace_root["execute_invocation"]
     if "revert_reason" in execute_trace_json:
+        if not include_traces:
+            return [], []
+
         execute_traces = [
             Trace(
                 block_number=root_call.block_number,
@@ -325,25 +494,34 @@ def parse_execute_trace(
             trace_call_dict=execute_trace_json,
             root_call=root_call,
             trace_path=[0],
+            include_traces=include_traces,
+            include_events=include_events,
         )
 
     return execute_traces, execute_events
 
 
 def parse_constructor_trace(
-    constructor_trace_json: dict[str, Any], root_call: Trace
+    constructor_trace_json: dict[str, Any],
+    root_call: Trace,
+    include_traces: bool = True,
+    include_events: bool = True,
 ) -> tuple[list[Trace], list[Event]]:
     return parse_trace_call(
         trace_call_dict=constructor_trace_json,
         root_call=root_call,
         trace_path=[0],
+        include_traces=include_traces,
+        include_events=include_events,
     )
 
 
-def parse_trace_call(
+def parse_trace_call(  # pylint: disable=too-many-positional-arguments,too-many-arguments
     trace_call_dict: dict[str, Any],
     root_call: Trace,
     trace_path: list[int],
+    include_traces: bool = True,
+    include_events: bool = True,
 ) -> tuple[
     list[Trace],  # traces
     list[Event],  # events
@@ -357,6 +535,8 @@ def parse_trace_call(
             trace_call_dict=subcall_dict,
             root_call=root_call,
             trace_path=trace_path + [subcall_idx],
+            include_traces=include_traces,
+            include_events=include_events,
         )
         child_traces += traces
         child_events += events
@@ -365,13 +545,20 @@ def parse_trace_call(
 
     # Does nothing if events array is empty
     called_contract = to_bytes(trace_call_dict["contract_address"], pad=32)
-    call_events = parse_events(
-        trace_call_dict=trace_call_dict["events"],
-        contract_address=called_contract,
-        block_number=root_call.block_number,
-        transaction_index=root_call.transaction_index,
-        class_hash=class_hash,
+    call_events = (
+        parse_events(
+            trace_call_dict=trace_call_dict["events"],
+            contract_address=called_contract,
+            block_number=root_call.block_number,
+            transaction_index=root_call.transaction_index,
+            class_hash=class_hash,
+        )
+        if include_events
+        else []
     )
+    if not include_traces:
+        return [], call_events + child_events
+
     call_trace = Trace(
         contract_address=called_contract,
         block_number=root_call.block_number,
@@ -418,6 +605,7 @@ def parse_state_diff(
     state_diff: dict[str, Any],
     block_number: int,
     tx_hash: bytes,
+    transaction_index: int = -1,
 ) -> StateDiff:
     return StateDiff(
         block_number=block_number,
@@ -428,6 +616,7 @@ def parse_state_diff(
         deprecated_declared_classes=state_diff["deprecated_declared_classes"],
         declared_classes=state_diff["declared_classes"],
         replaced_classes=state_diff["replaced_classes"],
+        transaction_index=transaction_index,
     )
 
 
@@ -447,30 +636,52 @@ def replace_delegate_calls(traces: list[Trace]) -> list[Trace]:
 
         tx_grouped_traces[(trace.block_number, trace.transaction_index)].append(trace)
 
-    output_traces = []
+    return list(iter_replace_delegate_calls(tx_grouped_traces.values()))
 
-    for tx_traces in tx_grouped_traces.values():
-        output_traces += replace_delegate_calls_for_tx(tx_traces)
-
-    return output_traces
 
+def iter_replace_delegate_calls(tx_traces: Iterable[list[Trace]]) -> Iterator[Trace]:
+    """
+    Streaming version of replace_delegate_calls for traces that are already grouped by transaction.  Each group is
+    rewritten & yielded before the next group is consumed, so traces can be streamed from a block iterator
+    without buffering the full trace set.
 
-def replace_delegate_calls_for_tx(traces: list[Trace]) -> list[Trace]:
-    output_traces = []
-    trace_queue = traces.copy()
+    :param tx_traces: Iterable of per-transaction trace lists, each sorted by trace address
+    """
+    for traces in tx_traces:
+        yield from replace_delegate_calls_for_tx(traces)
 
-    while len(trace_queue):
-        trace = trace_queue.pop(0)
-        if len(trace_queue):
-            next_trace = trace_queue[0]
-            if next_trace.call_type == TraceCallType.delegate and next_trace.trace_address[:-1] == trace.trace_address:
-                new_trace_address, trace_addr_len = trace.trace_address, len(next_trace.trace_address)
 
-                for child in [t for t in trace_queue if t.trace_address[:trace_addr_len] == next_trace.trace_address]:
-                    child.trace_address = new_trace_address + child.trace_address[trace_addr_len:]
+def replace_delegate_calls_for_tx(traces: list[Trace]) -> list[Trace]:
+    """
+    Replace call traces that are immediately followed by a delegate call with the delegate, moving the delegate
+    & its subtree up to the trace address of the replaced call.  Traces must be from a single transaction, and
+    sorted by trace address.
 
-                trace = trace_queue.pop(0)
-                trace.trace_address = new_trace_address
+    Runs in linear time.  Instead of rescanning the remaining traces for every delegate, the rewritten address of
+    each moved trace is indexed by its original address, and every trace address is rebuilt from the rewritten
+    address of its parent.
+    """
+    output_traces = []
+    rewritten_addresses: dict[tuple[int, ...], list[int]] = {}  # Original Trace Address -> New Trace Address
+
+    trace_idx, trace_count = 0, len(traces)
+    while trace_idx < trace_count:
+        trace = traces[trace_idx]
+        original_address = trace.trace_address
+
+        parent_address = rewritten_addresses.get(tuple(original_address[:-1]))
+        if parent_address is not None:
+            trace.trace_address = parent_address + original_address[-1:]
+            rewritten_addresses[tuple(original_address)] = trace.trace_address
+
+        trace_idx += 1
+        if trace_idx < trace_count:
+            next_trace = traces[trace_idx]
+            if next_trace.call_type == TraceCallType.delegate and next_trace.trace_address[:-1] == original_address:
+                rewritten_addresses[tuple(next_trace.trace_address)] = trace.trace_address
+                next_trace.trace_address = trace.trace_address
+                trace = next_trace
+                trace_idx += 1
 
         output_traces.append(trace)
 
@@ -0,0 +1,77 @@
+from typing import Any
+
+from nethermind.idealis.metrics import instrument_parser
+from nethermind.idealis.parse.ethereum.execution import parse_receipt_logs
+from nethermind.idealis.types.ethereum import Event
+from nethermind.idealis.types.zk_sync import EraBlock, EraTransaction
+from nethermind.idealis.utils import hex_to_int, to_bytes
+
+
+@instrument_parser("zk_sync_era_block")
+def parse_era_block_response(
+    block_json: dict[str, Any],
+    receipts_json: list[dict[str, Any]],
+) -> tuple[EraBlock, list[EraTransaction], list[Event]]:
+    """
+    Parse a zkSync Era eth_getBlockByNumber response (with full transactions), joined with the
+    eth_getBlockReceipts response for the block.  Receipts are joined to transactions by transaction index, and fill
+    the gas_used & error fields.
+
+    :param block_json: JSON decoded eth_getBlockByNumber result
+    :param receipts_json: JSON decoded eth_getBlockReceipts result
+    :return: (block, transactions, receipt logs)
+    """
+    block_number = hex_to_int(block_json["number"])
+    block_timestamp = hex_to_int(block_json["timestamp"])
+
+    receipts = {hex_to_int(receipt["transactionIndex"]): receipt for receipt in receipts_json}
+    transactions = []
+
+    for transaction in block_json["transactions"]:
+        if isinstance(transaction, str):  # Transaction hash instead of full transaction dict
+            continue
+
+        transaction_index = hex_to_int(transaction["transactionIndex"])
+        receipt = receipts.get(transaction_index)
+        if receipt is None:
+            raise ValueError(f"Missing receipt for zkSync Era transaction {transaction['hash']}")
+
+        transactions.append(
+            EraTransaction(
+                transaction_hash=to_bytes(transaction["hash"], pad=32),
+                block_number=block_number,
+                transaction_index=transaction_index,
+                timestamp=block_timestamp,
+                gas_used=hex_to_int(receipt["gasUsed"]),
+                error=None if hex_to_int(receipt["status"]) == 1 else "reverted",
+                nonce=hex_to_int(transaction["nonce"]),
+                from_address=to_bytes(transaction["from"], pad=20),
+                to_address=to_bytes(transaction["to"], pad=20) if transaction["to"] else None,
+                input=to_bytes(transaction["input"]),
+                value=hex_to_int(transaction["value"]),
+                gas_available=hex_to_int(transaction["gas"]),
+                gas_price=hex_to_int(receipt.get("effectiveGasPrice", transaction["gasPrice"])),
+                decoded_signature=None,
+                decoded_input=None,
+            )
+        )
+
+    parsed_block = EraBlock(
+        block_number=block_number,
+        timestamp=block_timestamp,
+        base_fee_per_gas=hex_to_int(block_json["baseFeePerGas"]),
+        miner=to_bytes(block_json["miner"], pad=20),
+        difficulty=hex_to_int(block_json["difficulty"]),
+        extra_data=to_bytes(block_json["extraData"]),
+        gas_limit=hex_to_int(block_json["gasLimit"]),
+        gas_used=hex_to_int(block_json["gasUsed"]),
+        hash=to_bytes(block_json["hash"], pad=32),
+        nonce=to_bytes(block_json["nonce"]),
+        parent_hash=to_bytes(block_json["parentHash"], pad=32),
+        size=hex_to_int(block_json["size"]),
+        state_root=to_bytes(block_json["stateRoot"], pad=32),
+        total_difficulty=hex_to_int(block_json["totalDifficulty"]),
+    )
+
+    # Receipt logs share the Ethereum log format
+    return parsed_block, transactions, parse_receipt_logs(receipts_json)
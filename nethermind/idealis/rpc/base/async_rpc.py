@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from typing import Any, Callable, NoReturn
+from typing import Any, Awaitable, Callable, NoReturn
 
 import aiohttp
 from aiohttp.client_exceptions import ClientResponse, ContentTypeError
@@ -13,6 +14,13 @@ from nethermind.idealis.exceptions import (
     RPCTimeoutError,
     StateError,
 )
+from nethermind.idealis.metrics import (
+    metrics_enabled,
+    record_rpc_error,
+    record_rpc_rate_limit,
+    record_rpc_response,
+    rpc_metrics_trace_config,
+)
 
 root_logger = logging.getLogger("nethermind")
 logger = root_logger.getChild("idealis").getChild("rpc")
@@ -24,6 +32,7 @@ def create_aiohttp_session(
     max_connections: int = 100,
     max_keepalive: int = 30,
     timeout: int = 60,
+    collect_metrics: bool | None = None,
 ) -> aiohttp.ClientSession:
     """
     Create an aiohttp session with the given parameters.
@@ -31,6 +40,9 @@ def create_aiohttp_session(
     :param max_connections: Maximum number of connections to allow.
     :param max_keepalive: Maximum number of seconds to keep a connection open.
     :param timeout: Maximum number of seconds to wait for a response.
+    :param collect_metrics:
+        Record per-method request latency to the metrics sink.  Defaults to True if a metrics sink is set when the
+        session is created
 
     :return: aiohttp.ClientSession
     """
@@ -39,12 +51,51 @@ def create_aiohttp_session(
         keepalive_timeout=max_keepalive,
     )
 
+    if collect_metrics is None:
+        collect_metrics = metrics_enabled()
+
     return aiohttp.ClientSession(
         connector=connector,
         timeout=aiohttp.ClientTimeout(total=timeout),
+        trace_configs=[rpc_metrics_trace_config()] if collect_metrics else None,
     )
 
 
+def _rpc_method(payload: dict[str, Any] | list[dict[str, Any]]) -> str:
+    if isinstance(payload, dict):
+        return payload.get("method", "unknown")
+    return "batch"
+
+
+def bounded_rpc_requester(
+    rpc_url: str,
+    aiohttp_session: aiohttp.ClientSession,
+    max_concurrency: int,
+) -> Callable[[str, Any], Awaitable[Any]]:
+    """
+    Return an async rpc_request(method, params) function that posts a JSON RPC request and returns the parsed
+    result.  Every request made through the returned function shares a single budget of max_concurrency in-flight
+    requests, so fetchers issuing several requests per block can bound concurrency across a whole block range.
+
+    .. code-block:: python
+
+        rpc_request = bounded_rpc_requester(rpc_url, session, max_concurrency=32)
+        block_json, receipts_json = await asyncio.gather(
+            rpc_request("eth_getBlockByNumber", [hex(block_number), True]),
+            rpc_request("eth_getBlockReceipts", [hex(block_number)]),
+        )
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _rpc_request(method: str, params: Any) -> Any:
+        payload = {"id": 1, "jsonrpc": "2.0", "method": method, "params": params}
+        async with semaphore:
+            async with aiohttp_session.post(url=rpc_url, json=payload) as response:
+                return await parse_async_rpc_response(payload, response)
+
+    return _rpc_request
+
+
 async def parse_async_rpc_response(
     payload: dict[str, Any],
     response: ClientResponse,
@@ -56,6 +107,53 @@ async def parse_async_rpc_response(
     :param response: AioHttp Response Object
     :return: response.json()['result'] if successful, and raises a formatted exception if not
     """
+    if not metrics_enabled():
+        return await _parse_async_rpc_response(payload, response)
+
+    return await _parse_with_metrics(_parse_async_rpc_response, payload, response)
+
+
+async def parse_async_rpc_batch_response(
+    payload: list[dict[str, Any]],
+    response: ClientResponse,
+) -> list[dict[str, Any]]:
+    """
+    Parse the response to a JSON RPC batch request.  Errors for individual requests are not raised, and are
+    returned in the response objects, so a single failed call does not fail the batch.  Errors affecting the
+    whole batch (rate limits, host errors, rejected batches) are raised like parse_async_rpc_response.
+
+    :param payload: List of RPC Request JSONs.  Each request must have a unique id
+    :param response: AioHttp Response Object
+    :return: Response objects ({"id", "result"} or {"id", "error"}) in the order of the payload
+    """
+    if not metrics_enabled():
+        return await _parse_async_rpc_batch_response(payload, response)
+
+    return await _parse_with_metrics(_parse_async_rpc_batch_response, payload, response)
+
+
+async def _parse_with_metrics(
+    parse_func: Callable[[Any, ClientResponse], Awaitable[Any]],
+    payload: dict[str, Any] | list[dict[str, Any]],
+    response: ClientResponse,
+) -> Any:
+    method = _rpc_method(payload)
+    try:
+        result = await parse_func(payload, response)
+    except RPCError as e:
+        if isinstance(e, RPCRateLimitError):
+            record_rpc_rate_limit(method)
+        record_rpc_error(method, type(e).__name__)
+        raise e
+
+    record_rpc_response(method, response.content.total_bytes)
+    return result
+
+
+async def _parse_async_rpc_response(
+    payload: dict[str, Any],
+    response: ClientResponse,
+) -> Any:
     try:
         response_json = await response.json()  # Async read response bytes
         response.release()  # Release the connection back to the pool, keeping TCP conn alive
@@ -70,31 +168,67 @@ async def parse_async_rpc_response(
             return return_json
 
         except KeyError:
-            if "error" in response_json.keys():
-                raise RPCError(f"Error in RPC response:  {response_json['error']}.  Request Payload: {payload}")
+            _raise_rpc_json_error(payload, response, response_json)
 
-            if "message" in response_json.keys():
-                if "rate limit" in response_json["message"] or "rate-limit" in response_json["message"]:
-                    raise RPCRateLimitError(f"Rate Limits Exceeded for RPC {response.url}")
+    except ContentTypeError:
+        await _raise_rpc_status_error(payload, response)
 
-            raise RPCError(f"Error for RPC {response.url} -- Response: {response_json}  -- Request Payload: {payload}")
+    except TimeoutError:
+        raise RPCTimeoutError(f"Timeout Error for RPC Host {response.host}")
+
+
+async def _parse_async_rpc_batch_response(
+    payload: list[dict[str, Any]],
+    response: ClientResponse,
+) -> list[dict[str, Any]]:
+    try:
+        response_json = await response.json()  # Async read response bytes
+        response.release()  # Release the connection back to the pool, keeping TCP conn alive
 
     except ContentTypeError:
-        match response.status:
-            case 1015 | 429:
-                raise RPCRateLimitError("JSON RPC Server Initializing Rate Limits")
-            case 500 | 502 | 503 | 504:
-                raise RPCHostError("Internal Server Error")
-
-            case _:
-                logger.error(f"Unexpected Error in response for request: {payload}")
-                logger.error(f"Response Information: {response.request_info}")
-                logger.error(f"Error Code: {response.status} --  Response Text: {await response.text()}")
-                raise RPCError("Unexpected Content Type AioHttp Error")
+        await _raise_rpc_status_error(payload, response)
 
     except TimeoutError:
         raise RPCTimeoutError(f"Timeout Error for RPC Host {response.host}")
 
+    if not isinstance(response_json, list):  # Batch was rejected as a whole
+        _raise_rpc_json_error(payload, response, response_json)
+
+    # Batch responses can be returned in any order
+    responses_by_id = {response_item.get("id"): response_item for response_item in response_json}
+    return [
+        responses_by_id.get(
+            request["id"],
+            {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32603, "message": "Missing batch response"}},
+        )
+        for request in payload
+    ]
+
+
+def _raise_rpc_json_error(payload: Any, response: ClientResponse, response_json: Any) -> NoReturn:
+    if "error" in response_json.keys():
+        raise RPCError(f"Error in RPC response:  {response_json['error']}.  Request Payload: {payload}")
+
+    if "message" in response_json.keys():
+        if "rate limit" in response_json["message"] or "rate-limit" in response_json["message"]:
+            raise RPCRateLimitError(f"Rate Limits Exceeded for RPC {response.url}")
+
+    raise RPCError(f"Error for RPC {response.url} -- Response: {response_json}  -- Request Payload: {payload}")
+
+
+async def _raise_rpc_status_error(payload: Any, response: ClientResponse) -> NoReturn:
+    match response.status:
+        case 1015 | 429:
+            raise RPCRateLimitError("JSON RPC Server Initializing Rate Limits")
+        case 500 | 502 | 503 | 504:
+            raise RPCHostError("Internal Server Error")
+
+        case _:
+            logger.error(f"Unexpected Error in response for request: {payload}")
+            logger.error(f"Response Information: {response.request_info}")
+            logger.error(f"Error Code: {response.status} --  Response Text: {await response.text()}")
+            raise RPCError("Unexpected Content Type AioHttp Error")
+
 
 async def parse_beacon_api_async_response(response: ClientResponse, error_handler: Callable[[str], NoReturn]):
     match response.status:
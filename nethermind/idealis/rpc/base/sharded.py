@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, TypeVar
+
+from aiohttp import ClientSession
+
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
+
+root_logger = logging.getLogger("nethermind")
+logger = root_logger.getChild("idealis").getChild("rpc").getChild("sharded")
+
+BatchResult = TypeVar("BatchResult")
+
+BlockBatchFetcher = Callable[[list[int], str, ClientSession], Awaitable[BatchResult]]
+"""
+Async fetcher with the signature fetcher(block_numbers, rpc_url, aiohttp_session).  Must be a module level function
+so it can be pickled and sent to worker processes.
+"""
+
+
+def _fetch_block_range(
+    range_fetcher: Callable[..., Awaitable[BatchResult]],
+    fetcher_args: tuple[Any, ...],
+    blocks: list[int],
+    rpc_url: str,
+    aiohttp_session: ClientSession,
+) -> Awaitable[BatchResult]:
+    return range_fetcher(*fetcher_args, blocks[0], blocks[-1] + 1, rpc_url, aiohttp_session)
+
+
+def block_range_fetcher(range_fetcher: Callable[..., Awaitable[BatchResult]], *args: Any) -> BlockBatchFetcher:
+    """
+    Adapt a range fetcher with the signature range_fetcher(*args, from_block, to_block, rpc_url, aiohttp_session),
+    like get_events_for_contract, to a BlockBatchFetcher.  Each batch of blocks is requested as a single
+    [from_block, to_block) range.  The range fetcher & args must be picklable.
+
+    .. code-block:: python
+
+        fetcher = block_range_fetcher(get_events_for_contract, contract_address, topics)
+        batches = sharded_backfill(fetcher, 18_000_000, 18_100_000, rpc_url, batch_size=2_000)
+    """
+    return partial(_fetch_block_range, range_fetcher, args)
+
+
+def shard_block_range(from_block: int, to_block: int, shard_count: int) -> list[tuple[int, int]]:
+    """
+    Split a block range into contiguous shards of near equal size.  Shards are returned in block order, and empty
+    shards are dropped when the range is smaller than the shard count.
+
+    >>> shard_block_range(0, 10, 3)
+    [(0, 4), (4, 7), (7, 10)]
+
+    :param from_block: Inclusive start block
+    :param to_block: Exclusive end block
+    :param shard_count: Number of shards to split the range into
+    :return: [(shard_from_block, shard_to_block), ...]
+    """
+    if shard_count < 1:
+        raise ValueError(f"shard_count must be positive, got {shard_count}")
+
+    block_count = max(to_block - from_block, 0)
+    shard_size, remainder = divmod(block_count, shard_count)
+
+    shards = []
+    shard_start = from_block
+    for shard_idx in range(shard_count):
+        shard_end = shard_start + shard_size + (1 if shard_idx < remainder else 0)
+        if shard_end > shard_start:
+            shards.append((shard_start, shard_end))
+        shard_start = shard_end
+
+    return shards
+
+
+def _fetch_shard(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    fetcher: BlockBatchFetcher[BatchResult],
+    from_block: int,
+    to_block: int,
+    rpc_url: str,
+    batch_size: int,
+    max_connections: int,
+) -> list[BatchResult]:
+    """
+    Worker process entrypoint.  Runs an event loop with its own aiohttp session, and fetches the shard in batches
+    of batch_size blocks.  Batch results are returned in block order.
+    """
+
+    async def _run_shard() -> list[BatchResult]:
+        session = create_aiohttp_session(max_connections=max_connections)
+        try:
+            batch_results = []
+            for batch_start in range(from_block, to_block, batch_size):
+                batch_blocks = list(range(batch_start, min(batch_start + batch_size, to_block)))
+                batch_results.append(await fetcher(batch_blocks, rpc_url, session))
+            return batch_results
+        finally:
+            await session.close()
+
+    logger.debug(f"Worker {os.getpid()} fetching shard {from_block} -> {to_block}")
+    return asyncio.run(_run_shard())
+
+
+def sharded_backfill(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    fetcher: BlockBatchFetcher[BatchResult],
+    from_block: int,
+    to_block: int,
+    rpc_url: str,
+    worker_count: int | None = None,
+    batch_size: int = 100,
+    shards_per_worker: int = 4,
+    max_connections: int = 100,
+) -> list[BatchResult]:
+    """
+    Backfill a block range across multiple processes.  The range is split into contiguous shards, and each shard is
+    fetched & parsed by a worker process with its own aiohttp session.  Once network requests are batched, parsing
+    large responses is CPU bound, so spreading parsing across processes scales with the number of cores.
+
+    Each worker returns the parsed dataclasses for its shard, and the coordinator returns the batch results in block
+    order, regardless of which worker finishes first.  Merging the batches is left to the caller, since each fetcher
+    returns a different result shape.
+
+    .. code-block:: python
+
+        from nethermind.idealis.rpc.starknet import trace_blocks
+
+        batches = sharded_backfill(trace_blocks, 600_000, 601_000, rpc_url, worker_count=32)
+        traces = ParsedBlockTrace.from_block_traces(batches)
+
+    :param fetcher:  Module level async fetcher with signature fetcher(block_numbers, rpc_url, aiohttp_session)
+    :param from_block: Inclusive start block
+    :param to_block: Exclusive end block
+    :param rpc_url: JSON RPC URL passed to the fetcher
+    :param worker_count: Number of worker processes.  Defaults to os.cpu_count()
+    :param batch_size: Number of blocks passed to each fetcher call inside a worker
+    :param shards_per_worker:
+        Number of shards to create per worker.  Smaller shards balance load when some blocks are far more expensive
+        to parse than others
+    :param max_connections: Max connections for the aiohttp session of each worker
+    :return: List of fetcher results, one per batch, ordered by block number
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    worker_count = worker_count or os.cpu_count() or 1
+    shards = shard_block_range(from_block, to_block, worker_count * shards_per_worker)
+
+    logger.info(
+        f"Backfilling blocks {from_block} -> {to_block} across {worker_count} processes in {len(shards)} shards"
+    )
+
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        shard_futures = [
+            executor.submit(
+                _fetch_shard,
+                fetcher,
+                shard_from,
+                shard_to,
+                rpc_url,
+                batch_size,
+                max_connections,
+            )
+            for shard_from, shard_to in shards
+        ]
+
+        ordered_batches: list[Any] = []
+        for shard_future in shard_futures:  # Futures are consumed in submission order, preserving block order
+            ordered_batches.extend(shard_future.result())
+
+    return ordered_batches
@@ -1,14 +1,17 @@
 from .consensus import (
     get_beacon_block,
     get_current_slot,
+    stream_blob_sidecars,
     sync_get_beacon_block,
     sync_get_current_slot,
 )
 from .execution import (
     debug_trace_block,
+    get_block_bundles,
     get_blocks,
     get_current_block,
     get_events_for_contract,
+    sharded_get_events_for_contract,
     sync_get_current_block,
     trace_block,
 )
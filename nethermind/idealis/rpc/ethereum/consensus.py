@@ -1,16 +1,22 @@
+import asyncio
 import logging
-from typing import Callable, NoReturn
+from collections import deque
+from typing import AsyncIterator, Callable, Iterable, NoReturn
 
 import requests
 from aiohttp import ClientSession
 
 from nethermind.idealis.exceptions import BlockNotFoundError
-from nethermind.idealis.parse.ethereum.consensus import parse_blob_sidecar_response
+from nethermind.idealis.parse.ethereum.consensus import (
+    parse_blob_sidecar_response,
+    parse_blob_sidecar_ssz,
+)
 from nethermind.idealis.rpc.base.async_rpc import (
     parse_beacon_api_async_response,
     parse_beacon_api_response,
 )
 from nethermind.idealis.types.ethereum.consensus import BeaconBlock, BlobSidecar
+from nethermind.idealis.utils.blob_store import BlobStore
 
 root_logger = logging.getLogger("nethermind")
 logger = root_logger.getChild("rpc").getChild("ethereum").getChild("consensus")
@@ -54,13 +60,28 @@ async def get_beacon_block(
     beacon_api_url: str,
     aiohttp_session: ClientSession,
     error_handler: Callable[[str], NoReturn],
+    ssz: bool = False,
 ) -> tuple[BeaconBlock | None, list[BlobSidecar]]:
+    """
+    Get the beacon block header & blob sidecars for a slot.
+
+    :param ssz:
+        Request the SSZ encoded response (``Accept: application/octet-stream``), which skips hex & JSON decoding,
+        and returns blob_data as memoryviews.  Falls back to JSON if the beacon node returns a JSON response
+    """
     logger.debug(f"Requesting Beacon Block for slot {slot}")
 
     async with aiohttp_session.get(
         url=f"{beacon_api_url}/eth/v1/beacon/blob_sidecars/{slot}",
+        headers={"Accept": "application/octet-stream"} if ssz else None,
     ) as response:
         try:
+            if response.status == 200 and response.content_type == "application/octet-stream":
+                response_bytes = await response.read()
+                logger.debug(f"Finished Reading SSZ Response Bytes for Beacon Block {slot}")
+
+                return parse_blob_sidecar_ssz(response_bytes)
+
             response_json = await parse_beacon_api_async_response(response, error_handler)
             logger.debug(f"Finished Reading HTTP Response Bytes & Decoding JSON for Beacon Block {slot}")
 
@@ -71,6 +92,77 @@ async def get_beacon_block(
             return None, []
 
 
+async def stream_blob_sidecars(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    slots: Iterable[int],
+    beacon_api_url: str,
+    aiohttp_session: ClientSession,
+    error_handler: Callable[[str], NoReturn],
+    blob_store: BlobStore | None = None,
+    max_concurrency: int = 16,
+    ssz: bool = True,
+) -> AsyncIterator[tuple[BeaconBlock, list[BlobSidecar]]]:
+    """
+    Stream the blob sidecars for a range of slots.  Up to max_concurrency slots are requested at once, and
+    results are yielded in slot order.  Slots without blobs, and missed slots are skipped.
+
+    If a blob_store is provided, blobs are written to the store as each slot is received, and the blob_data of
+    yielded sidecars are memoryviews into the store, so backfilled blobs are not held in memory.
+
+    .. code-block:: python
+
+        blob_store = BlobStore("blobs.bin")
+        async for beacon_block, blob_sidecars in stream_blob_sidecars(
+            range(7_700_000, 7_800_000), beacon_api_url, session, handle_beacon_api_lighthouse_errors, blob_store
+        ):
+            ...
+
+        blob_store.close()
+
+    :param slots: Slots to fetch, in the order they are yielded
+    :param beacon_api_url: Beacon API URL
+    :param aiohttp_session: Aiohttp Client Session
+    :param error_handler: Beacon API 404 error handler
+    :param blob_store: Store to write blobs into
+    :param max_concurrency: Maximum number of in-flight slot requests
+    :param ssz: Request SSZ encoded responses
+    """
+    slot_iter = iter(slots)
+    pending: deque[asyncio.Task] = deque()
+
+    def _schedule():
+        for slot in slot_iter:
+            pending.append(
+                asyncio.create_task(get_beacon_block(slot, beacon_api_url, aiohttp_session, error_handler, ssz))
+            )
+            if len(pending) >= max_concurrency:
+                return
+
+    _schedule()
+    try:
+        while pending:
+            beacon_block, blob_sidecars = await pending.popleft()
+            _schedule()
+
+            if beacon_block is None or not blob_sidecars:
+                continue
+
+            if blob_store is not None:
+                for sidecar in blob_sidecars:
+                    sidecar.blob_data = blob_store.put(
+                        sidecar.slot,
+                        sidecar.blob_index,
+                        sidecar.blob_data,
+                        sidecar.kzg_commitment,
+                        sidecar.kzg_proof,
+                    )
+
+            yield beacon_block, blob_sidecars
+
+    finally:
+        for task in pending:
+            task.cancel()
+
+
 def sync_get_beacon_block(
     slot: int,
     beacon_api_url: str,
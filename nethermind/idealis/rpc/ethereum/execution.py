@@ -1,11 +1,12 @@
 import asyncio
 import logging
-from typing import Any, Sequence
+from typing import Any, Literal, Sequence
 
 import requests
 from aiohttp import ClientSession
 
 from nethermind.idealis.parse.ethereum.execution import (
+    apply_block_receipts,
     parse_get_block_response,
     parse_get_logs_response,
 )
@@ -13,8 +14,12 @@ from nethermind.idealis.parse.ethereum.trace import (
     unpack_debug_trace_block_response,
     unpack_trace_block_response,
 )
-from nethermind.idealis.rpc.base.async_rpc import parse_async_rpc_response
-from nethermind.idealis.types.ethereum import Block, Event, Transaction
+from nethermind.idealis.rpc.base.async_rpc import (
+    bounded_rpc_requester,
+    parse_async_rpc_response,
+)
+from nethermind.idealis.rpc.base.sharded import block_range_fetcher, sharded_backfill
+from nethermind.idealis.types.ethereum import Block, BlockBundle, Event, Transaction
 from nethermind.idealis.utils import to_hex
 
 root_logger = logging.getLogger("nethermind")
@@ -124,6 +129,66 @@ async def debug_trace_block(
         return unpack_debug_trace_block_response(block_traces, block_number)
 
 
+async def get_block_bundles(
+    blocks: Sequence[int],
+    rpc_url: str,
+    aiohttp_session: ClientSession,
+    trace_method: Literal["trace_block", "debug_traceBlockByNumber"] | None = "trace_block",
+    max_concurrency: int = 32,
+) -> list[BlockBundle]:
+    """
+    Fetch blocks with their receipts & traces, joined per block.  For each block, eth_getBlockByNumber,
+    eth_getBlockReceipts & the trace method are requested concurrently, and every request for the range shares a
+    single concurrency budget.
+
+    Receipts are joined to transactions by transaction index, filling gas_used & gas_price, and receipt logs are
+    returned as the block events, so eth_getLogs is not required.
+
+    :param blocks: Block numbers to fetch
+    :param rpc_url: JSON RPC URL supporting eth_getBlockReceipts, and the trace method
+    :param aiohttp_session: Aiohttp Client Session
+    :param trace_method: Trace method to request.  If None, traces are not requested
+    :param max_concurrency: Maximum number of in-flight RPC requests
+    :return: BlockBundles, in the order of the blocks
+    """
+    _rpc_request = bounded_rpc_requester(rpc_url, aiohttp_session, max_concurrency)
+
+    async def _get_block_bundle(block_number: int) -> BlockBundle:
+        block_requests = [
+            _rpc_request("eth_getBlockByNumber", [hex(block_number), True]),
+            _rpc_request("eth_getBlockReceipts", [hex(block_number)]),
+        ]
+        if trace_method:
+            block_requests.append(_rpc_request(trace_method, [block_number]))
+
+        block_json, receipts_json, *traces_json = await asyncio.gather(*block_requests)
+        logger.debug(f"Async POST -- block, receipts & traces for block {block_number} returned")
+
+        block, transactions = parse_get_block_response(block_json)
+        bundle = BlockBundle(
+            block=block,
+            transactions=transactions,
+            events=apply_block_receipts(transactions, receipts_json),
+        )
+
+        if trace_method == "trace_block":
+            (
+                bundle.call_traces,
+                bundle.create_traces,
+                bundle.reward_traces,
+                bundle.suicide_traces,
+            ) = unpack_trace_block_response(traces_json[0])
+        elif trace_method == "debug_traceBlockByNumber":
+            # Debug trace events are skipped, since receipt logs are already parsed
+            bundle.call_traces, bundle.create_traces, _ = unpack_debug_trace_block_response(
+                traces_json[0], block_number
+            )
+
+        return bundle
+
+    return list(await asyncio.gather(*[_get_block_bundle(block) for block in blocks]))
+
+
 async def get_events_for_contract(  # pylint: disable=too-many-positional-arguments,too-many-arguments
     contract_address: bytes | list[bytes],
     topics: list[bytes | list[bytes]],
@@ -170,3 +235,39 @@ async def get_events_for_contract(  # pylint: disable=too-many-positional-argume
         events_json = await parse_async_rpc_response(payload, events_response)
 
         return parse_get_logs_response(events_json)
+
+
+def sharded_get_events_for_contract(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    contract_address: bytes | list[bytes],
+    topics: list[bytes | list[bytes]],
+    from_block: int,
+    to_block: int,
+    rpc_url: str,
+    worker_count: int | None = None,
+    batch_size: int = 2_000,
+    max_connections: int = 100,
+) -> list[Event]:
+    """
+    Multi-process version of get_events_for_contract.  Splits the block range into shards that are fetched &
+    parsed in worker processes, and merges the events in block order.
+
+    :param contract_address: Contract address to get events for.  Can also pass a list of contract addresses
+    :param topics: List of topics to filter events by
+    :param from_block: Inclusive start block
+    :param to_block: Exclusive end block
+    :param rpc_url: JSON RPC URL implementing the eth_getLogs method
+    :param worker_count: Number of worker processes.  Defaults to os.cpu_count()
+    :param batch_size: Number of blocks requested in each eth_getLogs call
+    :param max_connections: Max connections for the aiohttp session of each worker
+    """
+    batches = sharded_backfill(
+        block_range_fetcher(get_events_for_contract, contract_address, topics),
+        from_block=from_block,
+        to_block=to_block,
+        rpc_url=rpc_url,
+        worker_count=worker_count,
+        batch_size=batch_size,
+        max_connections=max_connections,
+    )
+
+    return [event for events in batches for event in events]
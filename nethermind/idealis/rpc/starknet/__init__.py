@@ -5,13 +5,19 @@ from .contract import (
     update_contract_implementation,
 )
 from .core import (
+    StarknetCallRequest,
+    StarknetCallResult,
     get_blocks,
     get_blocks_with_txns,
     get_class_abis,
+    get_class_abis_batched,
     get_current_block,
     get_events_for_contract,
+    sharded_get_blocks_with_txns,
+    sharded_get_events_for_contract,
     starknet_call,
+    starknet_multicall,
     sync_get_class_abi,
     sync_get_current_block,
 )
-from .trace import trace_blocks, trace_transaction
+from .trace import sharded_trace_blocks, trace_blocks, trace_transaction
@@ -1,4 +1,7 @@
+import asyncio
 import logging
+from concurrent.futures import Executor
+from typing import Any
 
 from aiohttp import ClientSession
 
@@ -8,13 +11,13 @@ from nethermind.idealis.parse.starknet.abi import (
     is_class_erc721_token,
     is_class_proxy,
 )
-from nethermind.idealis.rpc.starknet.core import get_class_abis
+from nethermind.idealis.rpc.starknet.core import get_class_abis_batched
 from nethermind.idealis.types.starknet.contracts import (
     ClassDeclaration,
     ContractDeployment,
 )
 from nethermind.idealis.types.starknet.core import Transaction
-from nethermind.idealis.types.starknet.enums import StarknetTxType
+from nethermind.idealis.types.starknet.enums import ProxyKind, StarknetTxType
 from nethermind.starknet_abi.dispatch import DecodingDispatcher, StarknetAbi
 from nethermind.starknet_abi.exceptions import InvalidCalldataError, TypeDecodeError
 from nethermind.starknet_abi.utils import starknet_keccak
@@ -25,12 +28,28 @@ root_logger = logging.getLogger("nethermind")
 logger = root_logger.getChild("rpc").getChild("starknet")
 
 
-async def get_class_declarations(
+def classify_class_abi(class_hash: bytes, class_abi: list[dict[str, Any]]) -> tuple[ProxyKind | None, bool, bool, bool]:
+    """
+    Classify a class ABI as (proxy_kind, is_account, is_erc20, is_erc721).  Defined at module level so it can be
+    pickled and run in a process pool.
+    """
+    declare_class_abi = StarknetAbi.from_json(abi_json=class_abi, class_hash=class_hash, abi_name="")
+    return (
+        is_class_proxy(declare_class_abi),
+        is_class_account(declare_class_abi),
+        is_class_erc20_token(declare_class_abi),
+        is_class_erc721_token(declare_class_abi),
+    )
+
+
+async def get_class_declarations(  # pylint: disable=too-many-positional-arguments,too-many-arguments,too-many-locals
     declare_transactions: list[Transaction],
     deploy_transactions: list[Transaction],
     json_rpc: str,
     client_session: ClientSession,
     known_classes: set[bytes] | None = None,
+    batch_size: int = 20,
+    executor: Executor | None = None,
 ) -> list[ClassDeclaration]:
     """
     Parse Transactions into ClassDeclaration details.
@@ -39,21 +58,26 @@ async def get_class_declarations(
     later versions, and deploy_account transactions cannot do this, and all classes are defined using declare
     transactions
 
-    This unfortunately has a synchronous constraint within the block range.  It has to order transactions within
-    each block  to track which deploy is the first tx to show up with a class hash.
-    This can be paralellized across blocks however, ie
+    Only the first transaction with each class hash can declare the class.  Declarations are resolved in three
+    steps, so the whole range is queried with a few concurrent batch requests instead of serial requests per
+    transaction:
 
-        asyncio.gather(get_class_declarations(...) for from_blk, to_blk in ((0, 100), (100, 200)))
+        1. Transactions are ordered, and the first transaction for each unknown class hash is collected
+        2. Classes are queried in batches at their declaration block, and classes first seen in a deploy
+           transaction are also queried at the previous block to check if the deploy declared the class
+        3. Declarations are generated in transaction order, and ABIs are classified in the executor
 
     :param declare_transactions: Declare transactions
     :param deploy_transactions: v0 Deploy transactions that are able to declare classes
     :param json_rpc: JSON RPC endpoint to query for classes @ block number
     :param client_session: Aiohttp Client Session for sending RPC requests
     :param known_classes: Cache of classes that we know are already deployed, and don't need to query chain to check
+    :param batch_size: Maximum number of classes per batch request
+    :param executor:
+        Executor to classify class ABIs in.  Pass a ProcessPoolExecutor to classify ABIs in parallel.  If None,
+        the event loop's default executor is used
     """
 
-    class_declarations = []
-
     if known_classes is None:
         known_classes = set()
 
@@ -62,70 +86,72 @@ async def get_class_declarations(
         key=lambda t: (t.block_number, t.transaction_index),
     )
 
+    candidate_txns: dict[bytes, Transaction] = {}
     for tx in ordered_txns:
         if tx.class_hash is None:
             logger.error(f"Cannot Parse Transaction into ClassDeclaration: {tx}")
             continue
 
-        # If deploy transaction, and we know class hash already exists, can skip
-        # If declare transaction and class already exists, skip
-        if tx.class_hash in known_classes:
+        # Classes are only declared by the first transaction containing the class hash
+        if tx.class_hash in known_classes or tx.class_hash in candidate_txns:
             continue
 
-        if tx.type == StarknetTxType.deploy:
-            prev_class = await get_class_abis(
-                class_hashes=[tx.class_hash],
-                rpc_url=json_rpc,
-                aiohttp_session=client_session,
-                block_number=tx.block_number - 1,
-            )
-            class_exists_before = False if prev_class[0] is None else True
-        else:
-            class_exists_before = False
-
-        known_classes.add(tx.class_hash)
-        # If the class is known before or not, we still know it now and dont need to re-query the RPC
-
-        if class_exists_before:  # Skip when Deploy txn didnt create class
-            continue
+        candidate_txns[tx.class_hash] = tx
+
+    # If the class is known before or not, we still know it now and dont need to re-query the RPC
+    known_classes.update(candidate_txns.keys())
+
+    deploy_txns = [tx for tx in candidate_txns.values() if tx.type == StarknetTxType.deploy]
+    previous_classes, declared_classes = await asyncio.gather(
+        get_class_abis_batched(
+            [(tx.class_hash, tx.block_number - 1) for tx in deploy_txns],  # type: ignore[misc]
+            json_rpc,
+            client_session,
+            batch_size,
+        ),
+        get_class_abis_batched(
+            [(tx.class_hash, tx.block_number) for tx in candidate_txns.values()],  # type: ignore[misc]
+            json_rpc,
+            client_session,
+            batch_size,
+        ),
+    )
 
-        get_classes_response = await get_class_abis(
-            class_hashes=[tx.class_hash], rpc_url=json_rpc, aiohttp_session=client_session, block_number=tx.block_number
+    # Skip when Deploy txn didnt create class
+    existing_classes = {tx.class_hash for tx, (exists, _) in zip(deploy_txns, previous_classes) if exists}
+
+    declarations = [
+        (tx, class_abi)
+        for tx, (_, class_abi) in zip(candidate_txns.values(), declared_classes)
+        if tx.class_hash not in existing_classes
+    ]
+
+    loop = asyncio.get_running_loop()
+    class_types = iter(
+        await asyncio.gather(
+            *[
+                loop.run_in_executor(executor, classify_class_abi, tx.class_hash, class_abi)
+                for tx, class_abi in declarations
+                if class_abi
+            ]
         )
+    )
 
-        if get_classes_response[0] is None:
-            class_declarations.append(
-                ClassDeclaration(
-                    class_hash=tx.class_hash,
-                    declaration_block=tx.block_number,
-                    declaration_timestamp=tx.timestamp,
-                    declare_transaction_hash=tx.transaction_hash,
-                    proxy_kind=None,
-                    is_account=None,
-                    is_erc20=None,
-                    is_erc721=None,
-                )
-            )
-
-        else:
-            declare_class_abi = StarknetAbi.from_json(
-                abi_json=get_classes_response[0],
-                class_hash=tx.class_hash,
-                abi_name="",
-            )
-
-            class_declarations.append(
-                ClassDeclaration(
-                    class_hash=tx.class_hash,
-                    declaration_block=tx.block_number,
-                    declaration_timestamp=tx.timestamp,
-                    declare_transaction_hash=tx.transaction_hash,
-                    proxy_kind=is_class_proxy(declare_class_abi),
-                    is_account=is_class_account(declare_class_abi),
-                    is_erc20=is_class_erc20_token(declare_class_abi),
-                    is_erc721=is_class_erc721_token(declare_class_abi),
-                )
+    class_declarations = []
+    for tx, class_abi in declarations:
+        proxy_kind, is_account, is_erc20, is_erc721 = next(class_types) if class_abi else (None, None, None, None)
+        class_declarations.append(
+            ClassDeclaration(
+                class_hash=tx.class_hash,  # type: ignore[arg-type]
+                declaration_block=tx.block_number,
+                declaration_timestamp=tx.timestamp,
+                declare_transaction_hash=tx.transaction_hash,
+                proxy_kind=proxy_kind,
+                is_account=is_account,
+                is_erc20=is_erc20,
+                is_erc721=is_erc721,
             )
+        )
 
     return class_declarations
 
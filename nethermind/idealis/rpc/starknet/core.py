@@ -1,7 +1,8 @@
 import asyncio
 import json
 import logging
-from typing import Any, Sequence
+from dataclasses import dataclass
+from typing import Any, NamedTuple, Sequence
 
 import requests
 from aiohttp import ClientSession
@@ -12,7 +13,11 @@ from nethermind.idealis.parse.starknet.block import (
     parse_block_with_tx_receipts,
 )
 from nethermind.idealis.parse.starknet.event import parse_event_response
-from nethermind.idealis.rpc.base.async_rpc import parse_async_rpc_response
+from nethermind.idealis.rpc.base.async_rpc import (
+    parse_async_rpc_batch_response,
+    parse_async_rpc_response,
+)
+from nethermind.idealis.rpc.base.sharded import block_range_fetcher, sharded_backfill
 from nethermind.idealis.types.starknet.core import Block, Event, Transaction
 from nethermind.idealis.types.starknet.rollup import OutgoingMessage
 from nethermind.idealis.utils import to_bytes, to_hex
@@ -118,7 +123,10 @@ async def get_blocks_with_txns(
             ),
         ) as response:
             block_json = await parse_async_rpc_response(payload, response)
-            logger.debug(f"get_blocks_with_txns -> {block_number} returned {response.content.total_bytes} json bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"get_blocks_with_txns -> {block_number} returned {response.content.total_bytes} json bytes"
+                )
             try:
                 return parse_block_with_tx_receipts(block_json)
             except BaseException as e:
@@ -139,6 +147,45 @@ async def get_blocks_with_txns(
     return out_blocks, out_txns, out_events, out_messages
 
 
+def sharded_get_blocks_with_txns(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    from_block: int,
+    to_block: int,
+    rpc_url: str,
+    worker_count: int | None = None,
+    batch_size: int = 100,
+    max_connections: int = 100,
+) -> tuple[list[Block], list[Transaction], list[Event], list[OutgoingMessage]]:
+    """
+    Multi-process version of get_blocks_with_txns.  Splits the block range into shards that are fetched & parsed
+    in worker processes, and merges the results in block order.
+
+    :param from_block: Inclusive start block
+    :param to_block: Exclusive end block
+    :param rpc_url: Starknet JSON RPC URL
+    :param worker_count: Number of worker processes.  Defaults to os.cpu_count()
+    :param batch_size: Number of blocks requested concurrently by each worker
+    :param max_connections: Max connections for the aiohttp session of each worker
+    """
+    batches = sharded_backfill(
+        get_blocks_with_txns,
+        from_block=from_block,
+        to_block=to_block,
+        rpc_url=rpc_url,
+        worker_count=worker_count,
+        batch_size=batch_size,
+        max_connections=max_connections,
+    )
+
+    out_blocks, out_txns, out_events, out_messages = [], [], [], []
+    for blocks, txns, events, messages in batches:
+        out_blocks += blocks
+        out_txns += txns
+        out_events += events
+        out_messages += messages
+
+    return out_blocks, out_txns, out_events, out_messages
+
+
 def _parse_class_abi_response(
     json_response: dict[str, Any],
     class_hash: bytes,
@@ -238,6 +285,58 @@ async def get_class_abis(
     return class_abis
 
 
+async def get_class_abis_batched(
+    class_ids: Sequence[tuple[bytes, int | None]],
+    rpc_url: str,
+    aiohttp_session: ClientSession,
+    batch_size: int = 20,
+    log_invalid_abis: bool = False,
+) -> list[tuple[bool, list[dict[str, Any]] | None]]:
+    """
+    Query classes at specific blocks using JSON RPC batch requests, which are sent concurrently.  Unlike
+    get_class_abis, existence is reported separately from the ABI, so classes with empty or invalid ABIs are still
+    reported as existing.
+
+    :param class_ids: (class_hash, block_number) pairs to query.  If block_number is None, queries at 'latest'
+    :param rpc_url: URL for Starknet RPC
+    :param aiohttp_session: Async HTTP Client Session
+    :param batch_size: Maximum number of classes per batch request.  Class responses are large, so keep this small
+    :param log_invalid_abis: Log classes with empty or invalid ABIs
+    :return: (class_exists, class_abi) for each class_id, in the same order as class_ids
+    """
+    logger.debug(f"Async Requesting {len(class_ids)} Starknet Classes in batches of {batch_size}")
+
+    payloads = [
+        {
+            "jsonrpc": "2.0",
+            "method": "starknet_getClass",
+            "params": {
+                "class_hash": to_hex(class_hash),
+                "block_id": _starknet_block_id(block_number) if block_number is not None else "latest",
+            },
+            "id": idx,
+        }
+        for idx, (class_hash, block_number) in enumerate(class_ids)
+    ]
+
+    async def _get_batch(batch_payload: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        async with aiohttp_session.post(rpc_url, json=batch_payload) as response:
+            return await parse_async_rpc_batch_response(batch_payload, response)
+
+    batch_responses = await asyncio.gather(
+        *[_get_batch(payloads[idx : idx + batch_size]) for idx in range(0, len(payloads), batch_size)]
+    )
+
+    class_responses = []
+    for (class_hash, _), response in zip(class_ids, (res for batch in batch_responses for res in batch)):
+        if "error" in response:
+            class_responses.append((False, None))
+        else:
+            class_responses.append((True, _parse_class_abi_response(response, class_hash, log_invalid_abis)))
+
+    return class_responses
+
+
 async def get_contract_impl_class(
     contract_address: bytes,
     block_id: str | int | bytes,
@@ -380,3 +479,145 @@ async def starknet_call(  # pylint: disable=too-many-positional-arguments,too-ma
         if "error" in response_json:
             return None
         return response_json["result"]
+
+
+class StarknetCallRequest(NamedTuple):
+    """
+    Single contract call for starknet_multicall.  If block_id is None, the block_id passed to starknet_multicall
+    is used.
+    """
+
+    contract_address: bytes
+    entry_point_selector: bytes
+    calldata: Sequence[bytes] = ()
+    block_id: int | str | bytes | None = None
+
+
+@dataclass(slots=True)
+class StarknetCallResult:
+    """Result of a call in starknet_multicall.  If the call failed, result is None and error holds the RPC error"""
+
+    result: list[str] | None
+    error: dict[str, Any] | None = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def _starknet_call_params(call: StarknetCallRequest, block_id: int | str | bytes) -> dict[str, Any]:
+    return {
+        "request": {
+            "contract_address": to_hex(call.contract_address, pad=32),
+            "entry_point_selector": to_hex(call.entry_point_selector, pad=32),
+            "calldata": [to_hex(data.lstrip(b"\x00")) for data in call.calldata],
+        },
+        "block_id": _starknet_block_id(block_id),
+    }
+
+
+async def starknet_multicall(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    calls: Sequence[StarknetCallRequest],
+    aiohttp_session: ClientSession,
+    rpc_url: str,
+    block_id: int | str | bytes = "latest",
+    batch_size: int = 100,
+) -> list[StarknetCallResult]:
+    """
+    Execute many Starknet contract calls using JSON RPC batch requests.  Identical calls (contract, selector,
+    calldata & block) are only requested once, and batches are sent concurrently.
+
+    Errors are isolated per call, so a reverted call or missing entry point returns a StarknetCallResult with
+    the RPC error, instead of failing every other call in the batch.  Errors affecting a whole batch (rate limits,
+    host errors) are raised.
+
+    .. code-block:: python
+
+        results = await starknet_multicall(
+            [StarknetCallRequest(token, starknet_keccak(b"decimals")) for token in tokens],
+            aiohttp_session,
+            rpc_url,
+        )
+        decimals = [int(res.result[0], 16) if res.success else None for res in results]
+
+    :param calls:  Contract calls to execute
+    :param aiohttp_session:  Async HTTP Client Session
+    :param rpc_url:  URL for Starknet RPC
+    :param block_id:  Default block to call the contracts at.  Defaults to 'latest'
+    :param batch_size:  Maximum number of calls per JSON RPC batch request
+    :return:  Call results, in the same order as calls
+    """
+    unique_calls: dict[tuple, int] = {}
+    call_indexes = []
+    payloads = []
+
+    for call in calls:
+        call_block = block_id if call.block_id is None else call.block_id
+        call_key = (call.contract_address, call.entry_point_selector, tuple(call.calldata), call_block)
+        if call_key not in unique_calls:
+            unique_calls[call_key] = len(payloads)
+            payloads.append(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "starknet_call",
+                    "params": _starknet_call_params(call, call_block),
+                    "id": len(payloads),
+                }
+            )
+        call_indexes.append(unique_calls[call_key])
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"starknet_multicall -> {len(calls)} calls, {len(payloads)} unique calls")
+
+    async def _call_batch(batch_payload: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        async with aiohttp_session.post(rpc_url, json=batch_payload) as response:
+            return await parse_async_rpc_batch_response(batch_payload, response)
+
+    batch_responses = await asyncio.gather(
+        *[_call_batch(payloads[idx : idx + batch_size]) for idx in range(0, len(payloads), batch_size)]
+    )
+
+    unique_results = [
+        StarknetCallResult(result=None, error=response["error"])
+        if "error" in response
+        else StarknetCallResult(result=response["result"])
+        for batch in batch_responses
+        for response in batch
+    ]
+    return [unique_results[call_idx] for call_idx in call_indexes]
+
+
+def sharded_get_events_for_contract(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    contract_address: bytes,
+    event_keys: list[bytes],
+    from_block: int,
+    to_block: int,
+    rpc_url: str,
+    worker_count: int | None = None,
+    batch_size: int = 1_000,
+    max_connections: int = 100,
+) -> list[Event]:
+    """
+    Multi-process version of get_events_for_contract.  Splits the block range into shards that are fetched &
+    parsed in worker processes, and merges the events in block order.
+
+    :param contract_address: Contract to search
+    :param event_keys: list of event selectors to query
+    :param from_block: Inclusive start block
+    :param to_block: Exclusive end block
+    :param rpc_url: Starknet JSON RPC URL
+    :param worker_count: Number of worker processes.  Defaults to os.cpu_count()
+    :param batch_size: Number of blocks in each paginated starknet_getEvents query
+    :param max_connections: Max connections for the aiohttp session of each worker
+    """
+    batches = sharded_backfill(
+        block_range_fetcher(get_events_for_contract, contract_address, event_keys),
+        from_block=from_block,
+        to_block=to_block,
+        rpc_url=rpc_url,
+        worker_count=worker_count,
+        batch_size=batch_size,
+        max_connections=max_connections,
+    )
+
+    return [event for events in batches for event in events]
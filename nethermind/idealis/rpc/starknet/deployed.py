@@ -1,42 +1,259 @@
-import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Sequence
 
 from aiohttp import ClientSession
 
-from nethermind.idealis.rpc.starknet import get_current_block, starknet_call
+from nethermind.idealis.rpc.starknet import (
+    StarknetCallRequest,
+    StarknetCallResult,
+    get_current_block,
+    starknet_multicall,
+)
 from nethermind.idealis.types.base.tokens import ERC20TokenData
-from nethermind.idealis.utils import to_bytes
+from nethermind.idealis.utils import to_bytes, to_hex
 from nethermind.starknet_abi.utils import starknet_keccak
 
+root_logger = logging.getLogger("nethermind")
+logger = root_logger.getChild("rpc").getChild("starknet").getChild("deployed")
+
+BYTE_ARRAY_WORD_SIZE = 31
+
+_METADATA_SELECTORS = [starknet_keccak(name) for name in (b"name", b"symbol", b"decimals")]
+_TOTAL_SUPPLY_SELECTORS = [starknet_keccak(name) for name in (b"totalSupply", b"total_supply")]
+
+
+def decode_starknet_string(result: Sequence[str] | None) -> str | None:
+    """
+    Decode a string returned from a contract call.  Cairo 0 & early Cairo 1 tokens return a short string packed
+    into a single felt, and newer tokens return a Cairo ByteArray, serialized as
+    [data_len, *data_words, pending_word, pending_word_len], where each data word holds 31 bytes.
+
+    Invalid UTF-8 is replaced instead of raising, and None is returned if the result is not a string encoding.
+
+    >>> decode_starknet_string(["0x4574686572"])
+    'Ether'
+    >>> decode_starknet_string(["0x0", "0x4574686572", "0x5"])
+    'Ether'
+    >>> decode_starknet_string(["0x0", "0x4574686572", "0x2"]) is None
+    True
+    """
+    if not result:
+        return None
+
+    if len(result) == 1:
+        return to_bytes(result[0]).lstrip(b"\x00").decode("utf-8", errors="replace")
+
+    data_len = int(result[0], 16)
+    if data_len != len(result) - 3:
+        return None
+
+    pending_len = int(result[-1], 16)
+    if pending_len >= BYTE_ARRAY_WORD_SIZE:
+        return None
+
+    string_bytes = b"".join(to_bytes(word, pad=BYTE_ARRAY_WORD_SIZE) for word in result[1:-2])
+    if pending_len:
+        try:
+            string_bytes += int(result[-2], 16).to_bytes(pending_len, "big")
+        except OverflowError:  # Pending word is longer than pending_len
+            return None
+
+    return string_bytes.decode("utf-8", errors="replace")
+
+
+def _decode_int(result: list[str] | None) -> int | None:
+    if not result:
+        return None
+    if len(result) == 2:  # Cairo 1 u256 is returned as (low, high)
+        return int(result[0], 16) + (int(result[1], 16) << 128)
+    return int(result[0], 16)
+
+
+@dataclass(slots=True)
+class _CachedToken:
+    token: ERC20TokenData | None  # None if the contract is not an ERC20 token
+    supply_updated_at: float
+
+
+class ERC20MetadataCache:
+    """
+    In-memory cache of ERC20TokenData, optionally persisted to a JSON file.  Name, symbol & decimals are immutable,
+    and cached permanently.  Total supply changes with every mint & burn, and is refreshed once it is older than
+    total_supply_ttl seconds.  Contracts that do not implement the ERC20 metadata functions are also cached, so
+    they are not re-queried on every refresh.
+
+    :param path: Path of the JSON cache file.  If None, the cache is only kept in memory
+    :param total_supply_ttl: Seconds before a cached total supply is refreshed
+    :param clock: Returns the current unix timestamp
+    """
+
+    def __init__(self, path: str | None = None, total_supply_ttl: float = 300, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.total_supply_ttl = total_supply_ttl
+        self.clock = clock
+
+        self._tokens: dict[bytes, _CachedToken] = {}
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, address: bytes) -> bool:
+        return address in self._tokens
+
+    def get(self, address: bytes) -> ERC20TokenData | None:
+        """Return a copy of the cached token data, so callers can not modify the cache"""
+        cached = self._tokens.get(address)
+        return replace(cached.token) if cached and cached.token else None
+
+    def has_metadata(self, address: bytes) -> bool:
+        return address in self._tokens
+
+    def total_supply_expired(self, address: bytes) -> bool:
+        cached = self._tokens.get(address)
+        if cached is None:
+            return True
+        if cached.token is None:
+            return False
+        return self.clock() - cached.supply_updated_at >= self.total_supply_ttl
+
+    def set(self, address: bytes, token: ERC20TokenData | None):
+        self._tokens[address] = _CachedToken(token=replace(token) if token else None, supply_updated_at=self.clock())
+
+    def invalidate(self, address: bytes):
+        """Remove a contract from the cache, ie, after a proxy upgrade"""
+        self._tokens.pop(address, None)
+
+    def _load(self, path: str):
+        with open(path, "r") as cache_file:
+            cache_json = json.load(cache_file)
+
+        for address_hex, cached in cache_json.items():
+            address = to_bytes(address_hex, pad=32)
+            token = cached["token"]
+            self._tokens[address] = _CachedToken(
+                token=ERC20TokenData(address=address, **token) if token else None,
+                supply_updated_at=cached["supply_updated_at"],
+            )
+
+    def save(self):
+        """Atomically write the cache to path"""
+        if not self.path:
+            return
+
+        cache_json = {}
+        for address, cached in self._tokens.items():
+            token_json = None
+            if cached.token:
+                token_json = {
+                    "name": cached.token.name,
+                    "symbol": cached.token.symbol,
+                    "decimals": cached.token.decimals,
+                    "total_supply": cached.token.total_supply,
+                    "update_block": cached.token.update_block,
+                }
+            cache_json[to_hex(address)] = {"token": token_json, "supply_updated_at": cached.supply_updated_at}
+
+        with open(self.path + ".tmp", "w") as cache_file:
+            json.dump(cache_json, cache_file)
+        os.replace(self.path + ".tmp", self.path)
+
+
+def _total_supply(camel: StarknetCallResult, snake: StarknetCallResult) -> int | None:
+    return _decode_int(camel.result) if camel.result else _decode_int(snake.result)
+
+
+async def refresh_erc20_info(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    contracts: Sequence[bytes],
+    json_rpc: str,
+    client_session: ClientSession,
+    cache: ERC20MetadataCache | None = None,
+    batch_size: int = 100,
+) -> dict[bytes, ERC20TokenData | None]:
+    """
+    Fetch ERC20 metadata for many tokens.  The head block is fetched once, and every metadata call is sent at that
+    block using batched starknet_call requests.  If a cache is provided, only the total supply is queried for
+    tokens with cached metadata, and tokens with a fresh total supply are not queried at all.
+
+    .. code-block:: python
+
+        cache = ERC20MetadataCache("erc20_metadata.json", total_supply_ttl=60)
+        tokens = await refresh_erc20_info(token_addresses, json_rpc, session, cache)
+        cache.save()
+
+    :param contracts: Token contract addresses
+    :param json_rpc: Starknet RPC URL
+    :param client_session: Async HTTP Client Session
+    :param cache: Metadata cache to read from & update
+    :param batch_size: Maximum number of calls per JSON RPC batch request
+    :return: {contract: ERC20TokenData}.  Contracts that are not ERC20 tokens map to None
+    """
+    if cache is None:
+        cache = ERC20MetadataCache()
+
+    stale_contracts = [contract for contract in dict.fromkeys(contracts) if cache.total_supply_expired(contract)]
+    if stale_contracts:
+        block_number = await get_current_block(client_session, json_rpc)
+
+        calls = []
+        for contract in stale_contracts:
+            selectors = _TOTAL_SUPPLY_SELECTORS
+            if not cache.has_metadata(contract):
+                selectors = _METADATA_SELECTORS + _TOTAL_SUPPLY_SELECTORS
+            calls.extend(StarknetCallRequest(contract, selector) for selector in selectors)
+
+        results = await starknet_multicall(calls, client_session, json_rpc, block_number, batch_size)
+
+        result_idx = 0
+        for contract in stale_contracts:
+            cached_token = cache.get(contract)
+
+            if cache.has_metadata(contract) and cached_token:
+                camel_supply, snake_supply = results[result_idx : result_idx + 2]
+                result_idx += 2
+                cache.set(
+                    contract,
+                    replace(
+                        cached_token,
+                        total_supply=_total_supply(camel_supply, snake_supply),
+                        update_block=block_number,
+                    ),
+                )
+                continue
+
+            name, symbol, decimals, camel_supply, snake_supply = results[result_idx : result_idx + 5]
+            result_idx += 5
+
+            if name.result is None and symbol.result is None and decimals.result is None:
+                cache.set(contract, None)
+                continue
+
+            cache.set(
+                contract,
+                ERC20TokenData(
+                    address=contract,
+                    name=decode_starknet_string(name.result),
+                    symbol=decode_starknet_string(symbol.result),
+                    decimals=_decode_int(decimals.result),
+                    total_supply=_total_supply(camel_supply, snake_supply),
+                    update_block=block_number,
+                ),
+            )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Refreshed {len(stale_contracts)} of {len(contracts)} ERC20 tokens at block {block_number}")
+
+    return {contract: cache.get(contract) for contract in contracts}
+
 
 async def get_erc20_info(
     contract: bytes,
     json_rpc: str,
     client_session: ClientSession,
 ) -> ERC20TokenData | None:
-    block_number, name, symbol, decimals, total_supply_camel, total_supply_snake = await asyncio.gather(
-        get_current_block(client_session, json_rpc),
-        starknet_call(contract, starknet_keccak(b"name"), [], client_session, json_rpc),
-        starknet_call(contract, starknet_keccak(b"symbol"), [], client_session, json_rpc),
-        starknet_call(contract, starknet_keccak(b"decimals"), [], client_session, json_rpc),
-        starknet_call(contract, starknet_keccak(b"totalSupply"), [], client_session, json_rpc),
-        starknet_call(contract, starknet_keccak(b"total_supply"), [], client_session, json_rpc),
-    )
-
-    if name is None and symbol is None and decimals is None:
-        return None
-
-    if total_supply_camel:
-        total_supply = int(total_supply_camel[0], 16)
-    elif total_supply_snake:
-        total_supply = int(total_supply_snake[0], 16)
-    else:
-        total_supply = None
-
-    return ERC20TokenData(
-        address=contract,
-        name=to_bytes(name[0]).decode("utf-8") if name else None,
-        symbol=to_bytes(symbol[0]).decode("utf-8") if symbol else None,
-        decimals=int(decimals[0], 16) if decimals else None,
-        total_supply=total_supply,
-        update_block=block_number,
-    )
+    return (await refresh_erc20_info([contract], json_rpc, client_session))[contract]
@@ -1,5 +1,7 @@
 import asyncio
 import logging
+from functools import partial
+from typing import Collection
 
 from aiohttp import ClientSession
 
@@ -10,6 +12,7 @@ from nethermind.idealis.parse.starknet.trace import (
     unpack_trace_response,
 )
 from nethermind.idealis.rpc.base.async_rpc import parse_async_rpc_response
+from nethermind.idealis.rpc.base.sharded import sharded_backfill
 from nethermind.idealis.utils import to_hex
 from nethermind.idealis.utils.formatting import pprint_hash
 
@@ -21,7 +24,18 @@ async def trace_blocks(
     block_numbers: list[int],
     rpc_url: str,
     aiohttp_session: ClientSession,
+    sections: Collection[str] | None = None,
 ) -> ParsedBlockTrace:
+    """
+    Trace blocks with starknet_traceBlockTransactions, and unpack the traces into a single ParsedBlockTrace
+
+    :param block_numbers: Blocks to trace
+    :param rpc_url: Starknet JSON RPC URL
+    :param aiohttp_session: aiohttp session
+    :param sections:
+        Trace sections to parse, ie {"execute_events", "state_diff"}.  Unrequested sections are returned empty.
+        Defaults to all sections.  See parse.starknet.trace.TRACE_SECTIONS
+    """
     logger.debug(f"Requesting Traces for {len(block_numbers)} Blocks")
 
     async def _trace_block(block_number: int):
@@ -37,9 +51,10 @@ async def trace_blocks(
             ),
         ) as response:
             block_traces = await parse_async_rpc_response(payload, response)
-            logger.debug(f"trace_blocks -> {block_number} returned {response.content.total_bytes} json bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"trace_blocks -> {block_number} returned {response.content.total_bytes} json bytes")
             try:
-                return unpack_trace_block_response(block_traces, block_number)
+                return unpack_trace_block_response(block_traces, block_number, sections)
             except BaseException as e:
                 logger.error(f"Error parsing block traces {block_number}: {e}")
                 raise e
@@ -48,7 +63,41 @@ async def trace_blocks(
         *[_trace_block(block_number) for block_number in block_numbers]
     )
 
-    return ParsedBlockTrace.from_block_traces([*block_traces])
+    return ParsedBlockTrace.from_block_traces(block_traces)
+
+
+def sharded_trace_blocks(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    from_block: int,
+    to_block: int,
+    rpc_url: str,
+    worker_count: int | None = None,
+    batch_size: int = 20,
+    max_connections: int = 100,
+    sections: Collection[str] | None = None,
+) -> ParsedBlockTrace:
+    """
+    Multi-process version of trace_blocks.  Trace responses are large, and unpacking them into Trace & Event
+    dataclasses is CPU bound, so the block range is split into shards that are traced & parsed in worker processes.
+
+    :param from_block: Inclusive start block
+    :param to_block: Exclusive end block
+    :param rpc_url: Starknet JSON RPC URL
+    :param worker_count: Number of worker processes.  Defaults to os.cpu_count()
+    :param batch_size: Number of blocks traced concurrently by each worker
+    :param max_connections: Max connections for the aiohttp session of each worker
+    :param sections: Trace sections to parse.  Defaults to all sections
+    """
+    batches = sharded_backfill(
+        partial(trace_blocks, sections=None if sections is None else frozenset(sections)),
+        from_block=from_block,
+        to_block=to_block,
+        rpc_url=rpc_url,
+        worker_count=worker_count,
+        batch_size=batch_size,
+        max_connections=max_connections,
+    )
+
+    return ParsedBlockTrace.from_block_traces(batches)
 
 
 async def trace_transaction(
@@ -70,9 +119,11 @@ async def trace_transaction(
         ),
     ) as response:
         tx_trace = await parse_async_rpc_response(payload, response)
-        logger.debug(
-            f"trace_transaction -> {pprint_hash(transaction_hash)} returned {response.content.total_bytes} json bytes"
-        )
+        if logger.isEnabledFor(logging.DEBUG):  # pprint_hash is expensive, skip formatting when debug is disabled
+            logger.debug(
+                f"trace_transaction -> {pprint_hash(transaction_hash)} returned "
+                f"{response.content.total_bytes} json bytes"
+            )
 
         try:
             return unpack_trace_response(tx_trace, block_number, transaction_index, transaction_hash)
@@ -0,0 +1 @@
+from .era_core import get_era_blocks, trace_era_blocks
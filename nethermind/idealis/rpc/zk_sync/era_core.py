@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Sequence
+
+from aiohttp import ClientSession
+
+from nethermind.idealis.parse.ethereum.trace import unpack_debug_trace_block_response
+from nethermind.idealis.parse.zk_sync.era_core import parse_era_block_response
+from nethermind.idealis.rpc.base.async_rpc import bounded_rpc_requester
+from nethermind.idealis.types.ethereum import Event
+from nethermind.idealis.types.ethereum.core import (
+    CallTraceResponse,
+    CreateTraceResponse,
+)
+from nethermind.idealis.types.zk_sync import EraBlock, EraTransaction
+
+root_logger = logging.getLogger("nethermind")
+logger = root_logger.getChild("rpc").getChild("zk_sync").getChild("era_core")
+
+
+async def get_era_blocks(
+    blocks: Sequence[int],
+    rpc_url: str,
+    aiohttp_session: ClientSession,
+    max_concurrency: int = 32,
+) -> tuple[list[EraBlock], list[EraTransaction], list[Event]]:
+    """
+    Fetch zkSync Era blocks with their transactions & receipt logs.  For each block, eth_getBlockByNumber &
+    eth_getBlockReceipts are requested concurrently, and every request for the range shares a single concurrency
+    budget.
+
+    :param blocks: Block numbers to fetch
+    :param rpc_url: zkSync Era JSON RPC URL
+    :param aiohttp_session: Aiohttp Client Session
+    :param max_concurrency: Maximum number of in-flight RPC requests
+    :return: (blocks, transactions, events), in the order of the blocks
+    """
+    logger.debug(f"Async POST -- get {len(blocks)} zkSync Era blocks")
+    _rpc_request = bounded_rpc_requester(rpc_url, aiohttp_session, max_concurrency)
+
+    async def _get_block(block_number: int) -> tuple[EraBlock, list[EraTransaction], list[Event]]:
+        block_json, receipts_json = await asyncio.gather(
+            _rpc_request("eth_getBlockByNumber", [hex(block_number), True]),
+            _rpc_request("eth_getBlockReceipts", [hex(block_number)]),
+        )
+        return parse_era_block_response(block_json, receipts_json)
+
+    output_blocks, output_transactions, output_events = [], [], []
+    for block, transactions, events in await asyncio.gather(*[_get_block(block) for block in blocks]):
+        output_blocks.append(block)
+        output_transactions.extend(transactions)
+        output_events.extend(events)
+
+    return output_blocks, output_transactions, output_events
+
+
+async def trace_era_blocks(
+    blocks: Sequence[int],
+    rpc_url: str,
+    aiohttp_session: ClientSession,
+    max_concurrency: int = 32,
+) -> tuple[list[CallTraceResponse], list[CreateTraceResponse]]:
+    """
+    Fetch call traces for a range of zkSync Era blocks with debug_traceBlockByNumber & the callTracer.  Traces are
+    parsed into the Ethereum trace dataclasses.
+
+    :param blocks: Block numbers to trace
+    :param rpc_url: zkSync Era JSON RPC URL
+    :param aiohttp_session: Aiohttp Client Session
+    :param max_concurrency: Maximum number of in-flight RPC requests
+    :return: (call_traces, create_traces), in the order of the blocks
+    """
+    logger.debug(f"Async POST -- trace {len(blocks)} zkSync Era blocks")
+    _rpc_request = bounded_rpc_requester(rpc_url, aiohttp_session, max_concurrency)
+
+    async def _trace_block(block_number: int) -> tuple[list[CallTraceResponse], list[CreateTraceResponse], list[Event]]:
+        block_traces = await _rpc_request("debug_traceBlockByNumber", [hex(block_number), {"tracer": "callTracer"}])
+        return unpack_debug_trace_block_response(block_traces, block_number)
+
+    call_traces, create_traces = [], []
+    for block_call_traces, block_create_traces, _ in await asyncio.gather(*[_trace_block(b) for b in blocks]):
+        call_traces.extend(block_call_traces)
+        create_traces.extend(block_create_traces)
+
+    return call_traces, create_traces
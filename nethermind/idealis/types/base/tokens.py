@@ -1,3 +1,4 @@
+from array import array
 from dataclasses import dataclass
 
 from .db_interface import DataclassDBInterface
@@ -54,3 +55,54 @@ class ERC20BalanceDiff(DataclassDBInterface):
     balance_diff: int
     transfers_received: int
     transfers_sent: int
+
+
+@dataclass(slots=True)
+class EncodedERC20Transfers:
+    """
+    Columnar ERC20 transfers, with addresses encoded as AddressEncoder ids.  Each column is indexed by transfer
+    """
+
+    block_numbers: array  # array("Q")
+    token_ids: array  # array("I")
+    from_ids: array  # array("I")
+    to_ids: array  # array("I")
+    values: list[int]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+@dataclass(slots=True)
+class EncodedERC721Transfers:
+    """
+    Columnar ERC721 transfers, with token contract & holder addresses encoded as AddressEncoder ids.  Each column is
+    indexed by transfer
+    """
+
+    block_numbers: array  # array("Q")
+    token_ids: array  # array("I")
+    from_ids: array  # array("I")
+    to_ids: array  # array("I")
+    nft_ids: list[bytes]
+
+    def __len__(self) -> int:
+        return len(self.nft_ids)
+
+
+@dataclass(slots=True)
+class EncodedERC20BalanceDiffs:
+    """
+    Columnar ERC20 balance diffs, with addresses encoded as AddressEncoder ids.  Each column is indexed by
+    (token, holder) account
+    """
+
+    block_number: int
+    token_ids: array  # array("I")
+    holder_ids: array  # array("I")
+    balance_diffs: list[int]
+    transfers_received: array  # array("I")
+    transfers_sent: array  # array("I")
+
+    def __len__(self) -> int:
+        return len(self.balance_diffs)
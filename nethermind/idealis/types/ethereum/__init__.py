@@ -1,4 +1,4 @@
 from .consensus import BeaconBlock, BlobSidecar
-from .core import Block
+from .core import Block, BlockBundle
 from .core import CallTraceResponse as Trace
 from .core import Event, Transaction
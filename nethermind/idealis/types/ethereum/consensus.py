@@ -24,7 +24,7 @@ class BeaconBlock:
 class BlobSidecar(DataclassDBInterface):
     slot: int
     blob_index: int
-    blob_data: bytes
+    blob_data: bytes | memoryview  # memoryview when parsed from SSZ, or read from a BlobStore
     kzg_commitment: bytes
     kzg_proof: bytes
     kzg_commitment_inclusion_proof: list[bytes]
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 from nethermind.idealis.types.base import DataclassDBInterface
@@ -120,3 +120,20 @@ class Transaction:
     input: bytes | None
     decoded_input: dict[str, Any] | None
     function_name: str | None
+
+
+@dataclass(slots=True)
+class BlockBundle:
+    """
+    Block joined with its transactions, receipt logs & traces.  Transactions have the receipt fields (gas_used &
+    gas_price) filled from eth_getBlockReceipts
+    """
+
+    block: Block
+    transactions: list[Transaction]
+    events: list[Event]
+
+    call_traces: list[CallTraceResponse] = field(default_factory=list)
+    create_traces: list[CreateTraceResponse] = field(default_factory=list)
+    reward_traces: list[RewardTraceResponse] = field(default_factory=list)
+    suicide_traces: list[SuicideTraceResponse] = field(default_factory=list)
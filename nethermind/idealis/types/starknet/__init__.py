@@ -1,2 +1,3 @@
 from .contracts import ContractImplementation, StarknetClass
 from .core import Block, DecodedOperation, Event, Message, StateDiff, Trace, Transaction
+from .state import DecodedStateDiff
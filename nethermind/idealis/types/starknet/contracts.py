@@ -72,3 +72,16 @@ class ContractDeployment(DataclassDBInterface):
     deploy_timestamp: int
 
     constructor_args: dict[str, Any] | None  # Decoded constructor args
+
+
+@dataclass(slots=True)
+class ClassFeatures(DataclassDBInterface):
+    """
+    Traits of a Starknet class that are derived from its ABI.  Computed once per class by ClassFeatureIndex
+    """
+
+    proxy_kind: ProxyKind | None
+    is_account: bool
+    is_erc20: bool
+    is_erc721: bool
+    is_upgradeable: bool  # Implements upgrade() or replace_to(), or emits Upgraded events
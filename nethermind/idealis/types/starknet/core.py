@@ -173,3 +173,5 @@ class StateDiff:
     deprecated_declared_classes: list[Any]
     declared_classes: list[Any]
     replaced_classes: list[Any]
+
+    transaction_index: int = -1
@@ -0,0 +1,106 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator
+
+FELT_SIZE = 32
+
+
+def _felt_at(column: bytes, index: int) -> bytes:
+    return column[index * FELT_SIZE : (index + 1) * FELT_SIZE]
+
+
+def _iter_felts(column: bytes) -> Iterator[bytes]:
+    return (column[offset : offset + FELT_SIZE] for offset in range(0, len(column), FELT_SIZE))
+
+
+@dataclass(slots=True)
+class DecodedStateDiff:
+    """
+    Compact binary representation of a Starknet state diff.  Every address, key, value & class hash is stored as a
+    32 byte big-endian felt in flat bytes columns, where the i-th felt of a column is stored at
+    column[i * 32 : (i + 1) * 32].
+
+    Storage entries are grouped by contract.  The storage entries of the contract at storage_contracts[i] are
+    stored at the entry indexes storage_offsets[i] -> storage_offsets[i + 1] of the storage_keys & storage_values
+    columns, and storage_index maps each contract address to i.
+    """
+
+    block_number: int
+    tx_hash: bytes
+    transaction_index: int
+
+    storage_contracts: bytes
+    storage_offsets: array  # array("I"), len(contracts) + 1
+    storage_keys: bytes
+    storage_values: bytes
+
+    nonce_contracts: bytes
+    nonces: bytes
+
+    deployed_addresses: bytes
+    deployed_class_hashes: bytes
+
+    replaced_addresses: bytes
+    replaced_class_hashes: bytes
+
+    declared_class_hashes: bytes
+    declared_compiled_class_hashes: bytes
+    deprecated_declared_classes: bytes
+
+    storage_index: dict[bytes, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.storage_index:
+            self.storage_index = {
+                contract: contract_idx for contract_idx, contract in enumerate(_iter_felts(self.storage_contracts))
+            }
+
+    @property
+    def storage_entry_count(self) -> int:
+        return len(self.storage_keys) // FELT_SIZE
+
+    def storage_range(self, contract_address: bytes) -> tuple[int, int] | None:
+        """Return the (start, end) storage entry indexes for a contract, or None if its storage was not updated"""
+        contract_idx = self.storage_index.get(contract_address)
+        if contract_idx is None:
+            return None
+        return self.storage_offsets[contract_idx], self.storage_offsets[contract_idx + 1]
+
+    def contract_storage(self, contract_address: bytes) -> dict[bytes, bytes]:
+        """Return the updated storage slots of a contract as {key: value}"""
+        storage_range = self.storage_range(contract_address)
+        if storage_range is None:
+            return {}
+
+        start, end = storage_range
+        keys = self.storage_keys[start * FELT_SIZE : end * FELT_SIZE]
+        values = self.storage_values[start * FELT_SIZE : end * FELT_SIZE]
+        return dict(zip(_iter_felts(keys), _iter_felts(values)))
+
+    def iter_storage(self) -> Iterator[tuple[bytes, bytes, bytes]]:
+        """Iterate over every storage update as (contract_address, key, value)"""
+        for contract_idx, contract in enumerate(_iter_felts(self.storage_contracts)):
+            for entry_idx in range(self.storage_offsets[contract_idx], self.storage_offsets[contract_idx + 1]):
+                yield contract, _felt_at(self.storage_keys, entry_idx), _felt_at(self.storage_values, entry_idx)
+
+    def iter_nonces(self) -> Iterator[tuple[bytes, int]]:
+        """Iterate over nonce updates as (contract_address, nonce)"""
+        return (
+            (contract, int.from_bytes(nonce, "big"))
+            for contract, nonce in zip(_iter_felts(self.nonce_contracts), _iter_felts(self.nonces))
+        )
+
+    def iter_deployed_contracts(self) -> Iterator[tuple[bytes, bytes]]:
+        """Iterate over deployed contracts as (contract_address, class_hash)"""
+        return zip(_iter_felts(self.deployed_addresses), _iter_felts(self.deployed_class_hashes))
+
+    def iter_replaced_classes(self) -> Iterator[tuple[bytes, bytes]]:
+        """Iterate over class replacements as (contract_address, class_hash)"""
+        return zip(_iter_felts(self.replaced_addresses), _iter_felts(self.replaced_class_hashes))
+
+    def iter_declared_classes(self) -> Iterator[tuple[bytes, bytes]]:
+        """Iterate over declared Cairo 1 classes as (class_hash, compiled_class_hash)"""
+        return zip(_iter_felts(self.declared_class_hashes), _iter_felts(self.declared_compiled_class_hashes))
+
+    def iter_deprecated_declared_classes(self) -> Iterator[bytes]:
+        return _iter_felts(self.deprecated_declared_classes)
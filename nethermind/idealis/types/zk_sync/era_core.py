@@ -27,10 +27,10 @@ class EraTransaction:
     transaction_index: int
     timestamp: int
     gas_used: int
-    error: str
+    error: str | None  # None if the transaction succeeded
     nonce: int
     from_address: bytes
-    to_address: bytes
+    to_address: bytes | None
     input: bytes
     value: int
     gas_available: int
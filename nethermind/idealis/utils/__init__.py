@@ -1,3 +1,6 @@
+from nethermind.idealis.utils.interning import get_intern_table
+
+
 def to_hex(hex_encode_str: bytes | str, pad: int | None = None) -> str:
     """
     Convert a bytestring to a hex string.
@@ -19,10 +22,23 @@ def to_bytes(hexstr: str, pad: int | None = None) -> bytes:
     """
     Convert a hex string to a bytestring.  If hexstring is '0x' prefixed, the prefix is removed.
 
+    If interning is enabled with utils.interning.enable_interning(), results for pad=20 and pad=32 are interned,
+    and repeated hex strings return the same bytes object.
+
     :param hexstr:  Hex string to convert.
     :param pad: Zero-Pad Hexstring before converting to bytes (default: False).
     :return:
     """
+    if pad and (intern_table := get_intern_table(pad)) is not None:
+        interned = intern_table.get(hexstr)
+        if interned is None:
+            interned = intern_table.add(hexstr, _to_bytes(hexstr, pad))
+        return interned
+
+    return _to_bytes(hexstr, pad)
+
+
+def _to_bytes(hexstr: str, pad: int | None) -> bytes:
     if pad:
         hexstr = zero_pad_hexstr(hexstr, pad)
 
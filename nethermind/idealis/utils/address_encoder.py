@@ -0,0 +1,108 @@
+import logging
+import os
+from array import array
+from typing import Iterable, Sequence
+
+root_logger = logging.getLogger("nethermind")
+logger = root_logger.getChild("address_encoder")
+
+MAX_ADDRESS_ID = 2**32 - 1
+
+
+class AddressEncoder:
+    """
+    Bidirectional map between addresses and dense uint32 ids.  Ids are assigned in order of first appearance,
+    starting from 0, so they can be used as indexes into arrays & lists for aggregations, and are far cheaper to
+    hash & store than 20 or 32 byte addresses.
+
+    If a path is provided, the address table is persisted as an append-only file of length-prefixed addresses,
+    and ids are stable across runs.  New addresses are written to disk on flush().
+
+    .. code-block:: python
+
+        encoder = AddressEncoder("addresses.bin")
+        holder_ids = encoder.encode_many(holders)
+        balances = [0] * len(encoder)
+        for holder_id, value in zip(holder_ids, values):
+            balances[holder_id] += value
+
+        encoder.flush()
+
+    :param path: Path of the address table file.  If None, the encoder is only kept in memory
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+
+        self._ids: dict[bytes, int] = {}
+        self._addresses: list[bytes] = []
+        self._persisted_count = 0
+
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def __contains__(self, address: bytes) -> bool:
+        return address in self._ids
+
+    def _load(self, path: str):
+        with open(path, "rb") as address_file:
+            table_bytes = address_file.read()
+
+        offset = 0
+        while offset < len(table_bytes):
+            address_len = table_bytes[offset]
+            address = table_bytes[offset + 1 : offset + 1 + address_len]
+            if len(address) != address_len:  # Partial write from an interrupted flush
+                logger.warning(f"Discarding truncated address at offset {offset} of {path}")
+                os.truncate(path, offset)
+                break
+
+            self._ids[address] = len(self._addresses)
+            self._addresses.append(address)
+            offset += 1 + address_len
+
+        self._persisted_count = len(self._addresses)
+
+    def encode(self, address: bytes) -> int:
+        """Return the id of an address, assigning the next id if the address is new"""
+        address_id = self._ids.get(address)
+        if address_id is None:
+            address_id = len(self._addresses)
+            if address_id > MAX_ADDRESS_ID:
+                raise OverflowError("AddressEncoder cannot encode more than 2**32 addresses")
+
+            self._ids[address] = address_id
+            self._addresses.append(address)
+
+        return address_id
+
+    def encode_many(self, addresses: Iterable[bytes]) -> array:
+        """Encode addresses into an array("I") of ids"""
+        return array("I", [self.encode(address) for address in addresses])
+
+    def lookup(self, address: bytes) -> int | None:
+        """Return the id of an address without assigning a new id"""
+        return self._ids.get(address)
+
+    def decode(self, address_id: int) -> bytes:
+        return self._addresses[address_id]
+
+    def decode_many(self, address_ids: Sequence[int]) -> list[bytes]:
+        addresses = self._addresses
+        return [addresses[address_id] for address_id in address_ids]
+
+    def flush(self):
+        """Append addresses assigned since the last flush to the address table file"""
+        if not self.path or self._persisted_count == len(self._addresses):
+            return
+
+        new_addresses = self._addresses[self._persisted_count :]
+        with open(self.path, "ab") as address_file:
+            address_file.write(b"".join(bytes([len(address)]) + address for address in new_addresses))
+            address_file.flush()
+            os.fsync(address_file.fileno())
+
+        self._persisted_count = len(self._addresses)
@@ -0,0 +1,156 @@
+import logging
+import mmap
+import os
+import struct
+
+root_logger = logging.getLogger("nethermind")
+logger = root_logger.getChild("blob_store")
+
+BLOB_SIZE = 131_072
+
+# slot, blob_index, kzg_commitment, kzg_proof
+_INDEX_RECORD = struct.Struct(">QQ48s48s")
+
+
+class BlobStore:
+    """
+    Memory mapped store of EIP-4844 blobs, keyed by (slot, blob_index).  Blobs are written into a preallocated,
+    memory mapped data file, and are read back as memoryviews into the map, so stored blobs are held in the page
+    cache instead of as Python bytes objects.
+
+    Each blob is recorded in an index file of fixed width (slot, blob_index, kzg_commitment, kzg_proof) records.
+    Index records are only written on flush(), after the blob data is flushed, so the index never references blobs
+    that were not written to disk.  Blobs added after the last flush are discarded when the store is reopened.
+
+    .. code-block:: python
+
+        blob_store = BlobStore("blobs.bin")
+        async for beacon_block, blob_sidecars in stream_blob_sidecars(range(start, end), ..., blob_store=blob_store):
+            ...
+
+        blob_store.flush()
+        blob = blob_store.get_blob(slot=7785423, blob_index=0)
+
+    :param path: Path of the data file.  The index is stored at path + ".index"
+    :param growth: Number of blobs to preallocate each time the data file is grown
+    """
+
+    def __init__(self, path: str, growth: int = 256):
+        self.path = path
+        self.growth = growth
+
+        self._records: dict[tuple[int, int], int] = {}
+        self._slot_blobs: dict[int, list[int]] = {}
+        self._index = bytearray()
+        self._flushed_count = 0
+
+        if os.path.exists(path + ".index"):
+            with open(path + ".index", "rb") as index_file:
+                index_bytes = index_file.read()
+
+            complete_bytes = len(index_bytes) - len(index_bytes) % _INDEX_RECORD.size
+            if complete_bytes != len(index_bytes):
+                logger.warning(f"Discarding partial blob index record in {path}.index")
+                os.truncate(path + ".index", complete_bytes)
+
+            self._index = bytearray(index_bytes[:complete_bytes])
+            for record, (slot, blob_index, _, _) in enumerate(_INDEX_RECORD.iter_unpack(self._index)):
+                self._records[(slot, blob_index)] = record
+                self._slot_blobs.setdefault(slot, []).append(blob_index)
+            self._flushed_count = len(self._records)
+
+        self._data_file = open(path, "a+b")  # pylint: disable=consider-using-with
+        self._capacity = os.path.getsize(path) // BLOB_SIZE
+        self._map: mmap.mmap | None = None
+        self._reserve(max(len(self._records), 1))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, blob_key: tuple[int, int]) -> bool:
+        return blob_key in self._records
+
+    def _reserve(self, blob_count: int):
+        """Grow the data file & remap it, so it can hold at least blob_count blobs"""
+        if self._map is not None and blob_count <= self._capacity:
+            return
+
+        if blob_count > self._capacity:
+            self._capacity = max(blob_count, len(self._records) + self.growth)
+            self._data_file.truncate(self._capacity * BLOB_SIZE)
+
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Blobs returned from the old map are still referenced, the map closes once they are released
+
+        self._map = mmap.mmap(self._data_file.fileno(), self._capacity * BLOB_SIZE)
+
+    def put(
+        self,
+        slot: int,
+        blob_index: int,
+        blob: bytes | memoryview,
+        kzg_commitment: bytes = b"",
+        kzg_proof: bytes = b"",
+    ) -> memoryview:
+        """
+        Write a blob to the store, and return a memoryview of the stored blob.  If the blob is already stored, the
+        existing blob is returned.
+        """
+        record = self._records.get((slot, blob_index))
+        if record is None:
+            if len(blob) != BLOB_SIZE:
+                raise ValueError(f"Invalid blob length {len(blob)} for slot {slot} blob {blob_index}")
+
+            record = len(self._records)
+            self._reserve(record + 1)
+            self._map[record * BLOB_SIZE : (record + 1) * BLOB_SIZE] = blob  # type: ignore[index]
+
+            self._index += _INDEX_RECORD.pack(slot, blob_index, kzg_commitment, kzg_proof)
+            self._records[(slot, blob_index)] = record
+            self._slot_blobs.setdefault(slot, []).append(blob_index)
+
+        return self._blob(record)
+
+    def _blob(self, record: int) -> memoryview:
+        return memoryview(self._map)[record * BLOB_SIZE : (record + 1) * BLOB_SIZE]  # type: ignore[arg-type]
+
+    def get_blob(self, slot: int, blob_index: int) -> memoryview | None:
+        """Return a memoryview of a stored blob, or None if the blob is not stored"""
+        record = self._records.get((slot, blob_index))
+        return None if record is None else self._blob(record)
+
+    def get_kzg(self, slot: int, blob_index: int) -> tuple[bytes, bytes] | None:
+        """Return the (kzg_commitment, kzg_proof) of a stored blob"""
+        record = self._records.get((slot, blob_index))
+        if record is None:
+            return None
+
+        _, _, kzg_commitment, kzg_proof = _INDEX_RECORD.unpack_from(self._index, record * _INDEX_RECORD.size)
+        return kzg_commitment, kzg_proof
+
+    def slot_blob_indexes(self, slot: int) -> list[int]:
+        return sorted(self._slot_blobs.get(slot, []))
+
+    def flush(self):
+        """Flush blob data, then append index records for blobs added since the last flush"""
+        if self._flushed_count == len(self._records):
+            return
+
+        self._map.flush()  # type: ignore[union-attr]
+        with open(self.path + ".index", "ab") as index_file:
+            index_file.write(self._index[self._flushed_count * _INDEX_RECORD.size :])
+            index_file.flush()
+            os.fsync(index_file.fileno())
+
+        self._flushed_count = len(self._records)
+
+    def close(self):
+        """Flush & close the store.  Memoryviews returned by the store must be released before closing"""
+        self.flush()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._data_file.close()
@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+INTERNED_PADS = (20, 32)
+""" to_bytes pad lengths that are interned.  20 byte Ethereum addresses, and 32 byte felts, hashes & topics """
+
+
+@dataclass(slots=True)
+class InternStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class BytesInternTable:
+    """
+    Bounded table mapping hex strings to shared bytes objects, so repeated addresses, selectors & class hashes
+    parsed from RPC responses resolve to a single bytes object instead of a new copy for every occurrence.
+
+    Eviction is segmented LRU.  Values seen once are kept in a small probation segment, and are promoted to the
+    protected segment when seen again.  Unique values like transaction hashes only churn through probation, and
+    do not evict hot addresses from the protected segment.
+
+    :param max_size: Maximum number of values in the protected segment
+    :param probation_size: Maximum number of values in the probation segment.  Defaults to max_size // 4
+    """
+
+    def __init__(self, max_size: int = 100_000, probation_size: int | None = None):
+        self.max_size = max_size
+        self.probation_size = max(1, max_size // 4) if probation_size is None else probation_size
+        self.stats = InternStats()
+
+        self._protected: OrderedDict[str, bytes] = OrderedDict()
+        self._probation: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._protected) + len(self._probation)
+
+    def get(self, hexstr: str) -> bytes | None:
+        """Return the interned value for a hex string, or None if it is not interned"""
+        value = self._protected.get(hexstr)
+        if value is not None:
+            self._protected.move_to_end(hexstr)
+            self.stats.hits += 1
+            return value
+
+        value = self._probation.pop(hexstr, None)
+        if value is None:
+            return None
+
+        self.stats.hits += 1
+        self._protected[hexstr] = value  # Seen twice, promote to protected
+        if len(self._protected) > self.max_size:
+            self._protected.popitem(last=False)
+            self.stats.evictions += 1
+
+        return value
+
+    def add(self, hexstr: str, value: bytes) -> bytes:
+        """Add a value to the probation segment, and return it"""
+        self.stats.misses += 1
+        self._probation[hexstr] = value
+        if len(self._probation) > self.probation_size:
+            self._probation.popitem(last=False)
+            self.stats.evictions += 1
+        return value
+
+    def clear(self):
+        self._protected.clear()
+        self._probation.clear()
+        self.stats = InternStats()
+
+
+_intern_tables: dict[int, BytesInternTable] | None = None
+
+
+def enable_interning(max_size: int = 100_000):
+    """
+    Intern the results of to_bytes(..., pad=20) and to_bytes(..., pad=32).  Parsers use to_bytes for addresses,
+    selectors, class hashes & topics, so hot values are shared across every parsed object.  Interned bytes are
+    identical in value to uninterned bytes, so this only changes memory usage & object identity.
+
+    :param max_size: Maximum number of hot values interned for each pad length
+    """
+    global _intern_tables  # pylint: disable=global-statement
+    _intern_tables = {pad: BytesInternTable(max_size) for pad in INTERNED_PADS}
+
+
+def disable_interning():
+    global _intern_tables  # pylint: disable=global-statement
+    _intern_tables = None
+
+
+def interning_enabled() -> bool:
+    return _intern_tables is not None
+
+
+def get_intern_table(pad: int | None) -> BytesInternTable | None:
+    """Return the intern table for a pad length, or None if interning is disabled or the pad is not interned"""
+    if _intern_tables is None:
+        return None
+    return _intern_tables.get(pad)  # type: ignore[arg-type]
+
+
+def intern_stats() -> dict[int, InternStats]:
+    """Return the intern stats for each pad length"""
+    if _intern_tables is None:
+        return {}
+    return {pad: table.stats for pad, table in _intern_tables.items()}
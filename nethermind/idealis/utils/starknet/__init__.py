@@ -1,2 +1,8 @@
-from .decode import PessimisticDecoder
+from .decode import (
+    PessimisticDecoder,
+    decode_events_batch,
+    decode_events_parallel,
+    decode_traces_batch,
+    group_events_by_class,
+)
 from .protocol import decode_starknet_id_domain, encode_starknet_id_domain
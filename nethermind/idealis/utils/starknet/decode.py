@@ -1,11 +1,20 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Sequence
 
+from nethermind.idealis.parse.starknet.abi import (
+    ClassFeatureIndex,
+    IndexedDecodingDispatcher,
+)
 from nethermind.idealis.rpc.starknet import sync_get_class_abi
+from nethermind.idealis.types.starknet.core import Event, Trace
+from nethermind.starknet_abi.decode import decode_from_params, decode_from_types
 from nethermind.starknet_abi.dispatch import (
     ClassDispatcher,
     DecodingDispatcher,
     StarknetAbi,
 )
+from nethermind.starknet_abi.exceptions import InvalidCalldataError, TypeDecodeError
 
 root_logger = logging.getLogger("nethermind")
 logger = root_logger.getChild("starknet").getChild("decoding")
@@ -25,15 +34,20 @@ def get_parsed_class(class_hash, rpc_url) -> StarknetAbi | None:
         return None
 
 
-class PessimisticDecoder(DecodingDispatcher):
+class PessimisticDecoder(IndexedDecodingDispatcher):
+    """
+    DecodingDispatcher that fetches unknown classes from the RPC on first use.  The ClassFeatures of each fetched
+    class are indexed in class_features
+    """
+
     rpc_url: str
     """ Starknet RPC URL to use for fetching class ABIs """
 
     invalid_class_ids: set[bytes]
     """ Set of class IDs that have been fetched but are not valid decode classes """
 
-    def __init__(self, rpc_url: str):
-        super().__init__()
+    def __init__(self, rpc_url: str, class_features: ClassFeatureIndex | None = None):
+        super().__init__(class_features)
         self.rpc_url = rpc_url
         self.invalid_class_ids = set()
 
@@ -53,3 +67,208 @@ class PessimisticDecoder(DecodingDispatcher):
 
         self.add_abi(class_abi)
         return self.class_ids[class_id]
+
+
+# (event_name, decoded_params) for each event in a group, or None if the event could not be decoded
+DecodedEventGroup = list[tuple[str, dict[str, Any]] | None]
+
+_worker_decoder: DecodingDispatcher | None = None
+
+
+def group_events_by_class(
+    events: Sequence[Event],
+    class_resolver: Callable[[bytes, int], bytes | None] | None = None,
+) -> dict[tuple[bytes, bytes], list[Event]]:
+    """
+    Group events by (class_hash, selector).  Events without a class_hash are resolved with class_resolver, and
+    event.class_hash is set in place.  Events without keys, or whose class cannot be resolved, are skipped.
+
+    :param events: Events to group
+    :param class_resolver:
+        Returns the class hash of a contract at a block number, called as class_resolver(contract_address,
+        block_number).  Each (contract, block) pair is only resolved once
+    """
+    groups: dict[tuple[bytes, bytes], list[Event]] = {}
+    resolved_classes: dict[tuple[bytes, int], bytes | None] = {}
+
+    for event in events:
+        if not event.keys:
+            continue
+
+        if event.class_hash is None and class_resolver:
+            contract_block = (event.contract_address, event.block_number)
+            if contract_block not in resolved_classes:
+                resolved_classes[contract_block] = class_resolver(*contract_block)
+            event.class_hash = resolved_classes[contract_block]
+
+        if event.class_hash is None:
+            continue
+
+        groups.setdefault((event.class_hash, event.keys[0]), []).append(event)
+
+    return groups
+
+
+def _decode_event_group(
+    decoder: DecodingDispatcher,
+    class_hash: bytes,
+    selector: bytes,
+    event_keys: list[list[int]],
+    event_data: list[list[int]],
+) -> DecodedEventGroup:
+    """
+    Decode events sharing a class & selector.  The class dispatcher & event ABI are resolved once for the group, and
+    the keys & data of each event are decoded against that ABI.  Groups with an unknown class or selector are
+    skipped after a single lookup
+    """
+    class_dispatcher = decoder.get_class(class_hash)
+    if class_dispatcher is None or selector[-8:] not in class_dispatcher.event_ids:
+        return [None] * len(event_keys)
+
+    event_decoder = decoder.event_types[class_dispatcher.event_ids[selector[-8:]].decoder_reference]
+
+    decoded_events: DecodedEventGroup = []
+    for keys, data in zip(event_keys, event_data):
+        try:
+            decoded_events.append((event_decoder.name, event_decoder.decode(data=data, keys=keys[1:])))
+        except (InvalidCalldataError, KeyError, TypeDecodeError, ValueError) as e:
+            logger.debug(f"Error decoding event 0x{selector.hex()} for class 0x{class_hash.hex()}: {e}")
+            decoded_events.append(None)
+
+    return decoded_events
+
+
+def _group_calldata(group_events: list[Event]) -> tuple[list[list[int]], list[list[int]]]:
+    return (
+        [[int.from_bytes(key) for key in event.keys] for event in group_events],
+        [[int.from_bytes(value) for value in event.data] for event in group_events],
+    )
+
+
+def _apply_decoded_group(group_events: list[Event], decoded_events: DecodedEventGroup) -> int:
+    decoded_count = 0
+    for event, decoded in zip(group_events, decoded_events):
+        if decoded:
+            event.event_name, event.decoded_params = decoded
+            decoded_count += 1
+    return decoded_count
+
+
+def decode_events_batch(
+    events: Sequence[Event],
+    decoder: DecodingDispatcher,
+    class_resolver: Callable[[bytes, int], bytes | None] | None = None,
+) -> int:
+    """
+    Decode events in place, setting event_name & decoded_params.  Events are grouped by (class, selector), and the
+    class & event ABI are resolved once per group instead of once per event.  Groups with unknown classes or
+    selectors are skipped after that single lookup, and groups can be decoded in parallel by
+    decode_events_parallel.  Events that cannot be decoded are left unchanged.
+
+    .. code-block:: python
+
+        decoder = PessimisticDecoder(rpc_url)
+        decode_events_batch(events, decoder)
+        erc20_transfers, erc721_transfers = filter_transfers(events)
+
+    :param events: Events to decode
+    :param decoder: DecodingDispatcher with the event classes loaded
+    :param class_resolver: Resolves class hashes for events without a class_hash.  See group_events_by_class
+    :return: Number of decoded events
+    """
+    decoded_count = 0
+    for (class_hash, selector), group_events in group_events_by_class(events, class_resolver).items():
+        decoded_events = _decode_event_group(decoder, class_hash, selector, *_group_calldata(group_events))
+        decoded_count += _apply_decoded_group(group_events, decoded_events)
+
+    return decoded_count
+
+
+def decode_traces_batch(traces: Sequence[Trace], decoder: DecodingDispatcher) -> int:
+    """
+    Decode traces in place, setting function_name, decoded_inputs & decoded_outputs.  Traces are grouped by
+    (class_hash, selector), and the input & output types of each group are resolved once, then the calldata & result
+    of each trace are decoded against them.  Groups with unknown classes or selectors are skipped with a single
+    lookup, and traces that cannot be decoded are left unchanged.
+
+    :param traces: Traces to decode
+    :param decoder: DecodingDispatcher with the trace classes loaded
+    :return: Number of decoded traces
+    """
+    groups: dict[tuple[bytes, bytes], list[Trace]] = {}
+    for trace in traces:
+        groups.setdefault((trace.class_hash, trace.selector), []).append(trace)
+
+    decoded_count = 0
+    for (class_hash, selector), group_traces in groups.items():
+        class_dispatcher = decoder.get_class(class_hash)
+        if class_dispatcher is None or selector[-8:] not in class_dispatcher.function_ids:
+            continue
+
+        function_dispatcher = class_dispatcher.function_ids[selector[-8:]]
+        input_params, output_types = decoder.function_types[function_dispatcher.decoder_reference]
+
+        for trace in group_traces:
+            try:
+                decoded_inputs = decode_from_params(input_params, [int.from_bytes(value) for value in trace.calldata])
+                decoded_outputs = decode_from_types(output_types, [int.from_bytes(value) for value in trace.result])
+            except (InvalidCalldataError, KeyError, TypeDecodeError, ValueError) as e:
+                logger.debug(f"Error decoding function 0x{selector.hex()} for class 0x{class_hash.hex()}: {e}")
+                continue
+
+            trace.function_name = function_dispatcher.name
+            trace.decoded_inputs, trace.decoded_outputs = decoded_inputs, decoded_outputs
+            decoded_count += 1
+
+    return decoded_count
+
+
+def _init_decode_worker(decoder_factory: Callable[[], DecodingDispatcher]):
+    global _worker_decoder  # pylint: disable=global-statement
+    _worker_decoder = decoder_factory()
+
+
+def _decode_event_group_in_worker(
+    class_hash: bytes,
+    selector: bytes,
+    event_keys: list[list[int]],
+    event_data: list[list[int]],
+) -> DecodedEventGroup:
+    return _decode_event_group(_worker_decoder, class_hash, selector, event_keys, event_data)  # type: ignore[arg-type]
+
+
+def decode_events_parallel(
+    events: Sequence[Event],
+    decoder_factory: Callable[[], DecodingDispatcher],
+    class_resolver: Callable[[bytes, int], bytes | None] | None = None,
+    max_workers: int | None = None,
+) -> int:
+    """
+    Decode events in place using a pool of worker processes.  Each worker builds its own decoder once with
+    decoder_factory, and (class, selector) groups are decoded in parallel.  Only the raw keys & data are sent to
+    the workers, and the results are applied to the events in this process.
+
+    :param events: Events to decode
+    :param decoder_factory:
+        Module level function returning a loaded DecodingDispatcher.  Must be picklable, since it is called in
+        each worker process
+    :param class_resolver: Resolves class hashes for events without a class_hash.  Runs in this process
+    :param max_workers: Number of worker processes.  Defaults to the number of CPUs
+    :return: Number of decoded events
+    """
+    groups = group_events_by_class(events, class_resolver)
+    if not groups:
+        return 0
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_decode_worker, initargs=(decoder_factory,)
+    ) as executor:
+        futures = [
+            (
+                group_events,
+                executor.submit(_decode_event_group_in_worker, class_hash, selector, *_group_calldata(group_events)),
+            )
+            for (class_hash, selector), group_events in groups.items()
+        ]
+
+        return sum(_apply_decoded_group(group_events, future.result()) for group_events, future in futures)
@@ -0,0 +1,304 @@
+import logging
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Iterator
+
+from nethermind.idealis.types.starknet.state import DecodedStateDiff
+
+root_logger = logging.getLogger("nethermind")
+logger = root_logger.getChild("starknet").getChild("storage_history")
+
+# contract_address, storage_key, block_number, transaction_index, value
+_RECORD = struct.Struct(">32s32sQi32s")
+
+# checkpoint_block, record_count, last_version, slot_count
+_INDEX_HEADER = struct.Struct(">qQqQ")
+
+# contract_address, storage_key, update_count.  Followed by the update versions & record indexes as array("Q")
+_INDEX_SLOT = struct.Struct(">32s32sQ")
+
+
+def _version(block_number: int, transaction_index: int) -> int:
+    """
+    Sort key for a storage update.  Block level updates (transaction_index -1) are ordered after every transaction
+    in the block, since a block state update is the state after the block is applied.
+    """
+    return (block_number << 32) | (transaction_index & 0xFFFFFFFF)
+
+
+class StorageHistory:
+    """
+    Local index of contract storage history, built from streamed state diffs.  Answers "value of storage slot K of
+    contract C at block B" and range scans over storage slots without RPC calls.
+
+    Storage updates are appended to a log of fixed width (contract, key, block, tx_index, value) records, and
+    must be appended in block & transaction order.  Each storage slot keeps a sorted list of update versions
+    pointing into the log, so point-in-time lookups are a binary search.  Each contract keeps a sorted list of its
+    storage keys for key range scans.
+
+    If a path is provided, the log is persisted to disk, and records are read from a memory map of the log file.
+    Only records appended since the last checkpoint are held in memory.  Every checkpoint_interval blocks, the log
+    is flushed & remapped, and a snapshot of the slot index is written to path + ".index".  When reopening the
+    history, the index snapshot is loaded instead of replaying the log, and records written after the checkpoint
+    are discarded, so ingestion can safely resume from resume_block after a crash.  Writing the snapshot is
+    proportional to the number of indexed updates, so large histories should use a larger checkpoint_interval.
+
+    .. code-block:: python
+
+        history = StorageHistory("storage_history.log")
+        for block_traces in stream_traces(history.resume_block):
+            history.append_state_diffs(decode_state_diff(diff) for diff in block_traces.state_diff)
+
+        balance = history.get_storage_at(eth_token, balance_key, block_number=600_000)
+
+    :param path: Path of the log file.  If None, the history is only kept in memory
+    :param checkpoint_interval: Number of blocks between automatic checkpoints
+    """
+
+    def __init__(self, path: str | None = None, checkpoint_interval: int = 1_000):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+
+        self._log_map: mmap.mmap | None = None
+        self._mapped_count = 0
+        self._tail = bytearray()  # Records appended after the mapped region of the log
+
+        self._slot_versions: dict[tuple[bytes, bytes], array] = {}  # array("Q") of versions
+        self._slot_records: dict[tuple[bytes, bytes], array] = {}  # array("Q") of log record indexes
+        self._contract_keys: dict[bytes, list[bytes]] = {}
+
+        self._last_version = -1
+        self.last_block = -1
+        self.checkpoint_block = -1
+
+        self._log_file = None
+        if path:
+            self._open_log(path)
+
+    @property
+    def record_count(self) -> int:
+        return self._mapped_count + len(self._tail) // _RECORD.size
+
+    @property
+    def resume_block(self) -> int:
+        """First block that is not covered by the last checkpoint"""
+        return self.checkpoint_block + 1
+
+    def _open_log(self, path: str):
+        checkpoint_records = 0
+        if os.path.exists(path + ".index"):
+            checkpoint_records = self._load_index(path + ".index")
+
+        if os.path.exists(path) and os.path.getsize(path) > checkpoint_records * _RECORD.size:
+            logger.warning(f"Discarding storage history records after checkpoint block {self.checkpoint_block}")
+            os.truncate(path, checkpoint_records * _RECORD.size)
+
+        self._log_file = open(path, "ab")  # pylint: disable=consider-using-with
+        self._remap_log()
+
+    def _remap_log(self):
+        """Map every record written to the log file, and release the in memory tail"""
+        if self._log_map is not None:
+            self._log_map.close()
+            self._log_map = None
+
+        log_size = os.path.getsize(self.path)  # type: ignore[arg-type]
+        if log_size:
+            with open(self.path, "rb") as log_file:  # type: ignore[arg-type]
+                self._log_map = mmap.mmap(log_file.fileno(), log_size, access=mmap.ACCESS_READ)
+
+        self._mapped_count = log_size // _RECORD.size
+        self._tail = bytearray()
+
+    def _load_index(self, index_path: str) -> int:
+        """Load an index snapshot, and return the number of log records it covers"""
+        with open(index_path, "rb") as index_file:
+            index_bytes = memoryview(index_file.read())
+
+        self.checkpoint_block, record_count, self._last_version, slot_count = _INDEX_HEADER.unpack_from(index_bytes)
+        self.last_block = self.checkpoint_block
+
+        offset = _INDEX_HEADER.size
+        for _ in range(slot_count):
+            contract, key, update_count = _INDEX_SLOT.unpack_from(index_bytes, offset)
+            offset += _INDEX_SLOT.size
+
+            versions, records = array("Q"), array("Q")
+            versions.frombytes(index_bytes[offset : (offset := offset + update_count * 8)])
+            records.frombytes(index_bytes[offset : (offset := offset + update_count * 8)])
+
+            slot = (contract, key)
+            self._slot_versions[slot], self._slot_records[slot] = versions, records
+            self._contract_keys.setdefault(contract, []).append(key)  # Slots are stored in sorted order
+
+        return record_count
+
+    def _write_index(self):
+        """Atomically write a snapshot of the slot index, covering every record in the log"""
+        index_tmp = self.path + ".index.tmp"  # type: ignore[operator]
+        with open(index_tmp, "wb") as index_file:
+            index_file.write(
+                _INDEX_HEADER.pack(self.last_block, self.record_count, self._last_version, len(self._slot_versions))
+            )
+            for contract in sorted(self._contract_keys):
+                for key in self._contract_keys[contract]:
+                    versions = self._slot_versions[(contract, key)]
+                    index_file.write(_INDEX_SLOT.pack(contract, key, len(versions)))
+                    index_file.write(versions.tobytes())
+                    index_file.write(self._slot_records[(contract, key)].tobytes())
+
+            index_file.flush()
+            os.fsync(index_file.fileno())
+
+        os.replace(index_tmp, self.path + ".index")  # type: ignore[operator]
+
+    def _append(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+        self,
+        contract: bytes,
+        key: bytes,
+        block_number: int,
+        transaction_index: int,
+        value: bytes,
+    ):
+        version = _version(block_number, transaction_index)
+        if version < self._last_version:
+            raise ValueError(
+                f"Storage updates must be appended in order.  Received update for block {block_number} tx "
+                f"{transaction_index} after block {self.last_block}"
+            )
+
+        record = _RECORD.pack(contract, key, block_number, transaction_index, value)
+        record_index = self.record_count
+        self._tail += record
+        if self._log_file:
+            self._log_file.write(record)
+
+        slot = (contract, key)
+        if slot not in self._slot_versions:
+            self._slot_versions[slot] = array("Q")
+            self._slot_records[slot] = array("Q")
+            insort(self._contract_keys.setdefault(contract, []), key)
+
+        self._slot_versions[slot].append(version)
+        self._slot_records[slot].append(record_index)
+
+        self._last_version, self.last_block = version, block_number
+
+    def append_state_diff(self, state_diff: DecodedStateDiff):
+        """Append the storage updates of a state diff.  Automatically checkpoints every checkpoint_interval blocks"""
+        if state_diff.block_number > self.last_block >= self.checkpoint_block + self.checkpoint_interval:
+            self.checkpoint()  # All updates for last_block have been appended
+
+        for contract, key, value in state_diff.iter_storage():
+            self._append(contract, key, state_diff.block_number, state_diff.transaction_index, value)
+
+    def append_state_diffs(self, state_diffs: Iterable[DecodedStateDiff]):
+        for state_diff in state_diffs:
+            self.append_state_diff(state_diff)
+
+    def checkpoint(self):
+        """
+        Mark every block up to last_block as complete.  If the history is persisted, the log is flushed & remapped,
+        and the slot index snapshot is written
+        """
+        if self._log_file:
+            self._log_file.flush()
+            os.fsync(self._log_file.fileno())
+            self._remap_log()
+            self._write_index()
+
+        self.checkpoint_block = self.last_block
+
+    def close(self):
+        """Checkpoint & close the log.  Only call once every update for last_block has been appended"""
+        self.checkpoint()
+        if self._log_map is not None:
+            self._log_map.close()
+            self._log_map = None
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+    def _record(self, record_index: int) -> tuple[bytes, bytes, int, int, bytes]:
+        if record_index < self._mapped_count:
+            return _RECORD.unpack_from(self._log_map, record_index * _RECORD.size)  # type: ignore[arg-type]
+        return _RECORD.unpack_from(self._tail, (record_index - self._mapped_count) * _RECORD.size)
+
+    def get_storage_at(
+        self,
+        contract_address: bytes,
+        key: bytes,
+        block_number: int,
+        transaction_index: int | None = None,
+    ) -> bytes | None:
+        """
+        Return the value of a storage slot after the block (or after the transaction) is applied.  Returns None if
+        the slot was not updated in the indexed history before the block.
+
+        :param contract_address: 32 byte contract address
+        :param key: 32 byte storage key
+        :param block_number: Block number to lookup
+        :param transaction_index: If provided, lookup the value after this transaction in the block
+        """
+        slot = (contract_address, key)
+        versions = self._slot_versions.get(slot)
+        if versions is None:
+            return None
+
+        version = _version(block_number, -1 if transaction_index is None else transaction_index)
+        position = bisect_right(versions, version)
+        if position == 0:
+            return None
+
+        return self._record(self._slot_records[slot][position - 1])[4]
+
+    def iter_slot_history(
+        self,
+        contract_address: bytes,
+        key: bytes,
+        from_block: int = 0,
+        to_block: int | None = None,
+    ) -> Iterator[tuple[int, int, bytes]]:
+        """
+        Iterate over updates to a storage slot as (block_number, transaction_index, value)
+
+        :param from_block: Inclusive start block
+        :param to_block: Inclusive end block.  If None, iterates to the end of the history
+        """
+        slot = (contract_address, key)
+        versions = self._slot_versions.get(slot)
+        if versions is None:
+            return
+
+        start = bisect_left(versions, _version(from_block, 0))
+        end = len(versions) if to_block is None else bisect_right(versions, _version(to_block, -1))
+
+        for record_index in self._slot_records[slot][start:end]:
+            _, _, block_number, transaction_index, value = self._record(record_index)
+            yield block_number, transaction_index, value
+
+    def scan_contract_storage(
+        self,
+        contract_address: bytes,
+        block_number: int,
+        key_start: bytes | None = None,
+        key_end: bytes | None = None,
+    ) -> Iterator[tuple[bytes, bytes]]:
+        """
+        Iterate over the storage of a contract at a block as (key, value), ordered by key.  Only slots updated in
+        the indexed history are returned.
+
+        :param key_start: Inclusive start key
+        :param key_end: Exclusive end key
+        """
+        keys = self._contract_keys.get(contract_address, [])
+        start = 0 if key_start is None else bisect_left(keys, key_start)
+        end = len(keys) if key_end is None else bisect_left(keys, key_end)
+
+        for key in keys[start:end]:
+            value = self.get_storage_at(contract_address, key, block_number)
+            if value is not None:
+                yield key, value
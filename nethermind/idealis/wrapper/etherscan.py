@@ -1,8 +1,14 @@
+import asyncio
+import json
 import logging
+import os
+import time
 from typing import Any
 
 import requests
+from aiohttp import ClientSession
 
+from nethermind.idealis.exceptions import RPCRateLimitError
 from nethermind.idealis.types.ethereum import Transaction
 from nethermind.idealis.utils import to_bytes
 
@@ -10,6 +16,9 @@ root_logger = logging.getLogger("nethermind")
 logger = root_logger.getChild("entro").getChild("backfill").getChild("etherscan")
 
 
+ETHERSCAN_MAX_RESULTS = 10_000
+""" Etherscan paged APIs only return the first page * offset <= 10,000 results for a query """
+
 # janky...  Fix later if etherscan API is implemented on other chains
 
 
@@ -31,16 +40,7 @@ def handle_etherscan_error(response: requests.Response) -> Any:
     """
     match response.status_code:
         case 200:
-            response_data = response.json()
-            if response_data.get("status") == "1":
-                return response_data["result"]
-
-            # Error Handling Section
-            match response_data["message"]:
-                case "Missing/Invalid API Key":
-                    raise ValueError("Invalid Etherscan API Key")
-                case _:
-                    raise RuntimeError("Unhandled Etherscan Error: " + response_data)
+            return _etherscan_result(response.json())
         case _:
             raise ConnectionError(
                 f"Unexpected Response Status Code ({response.status_code}) for Etherscan API. "
@@ -48,6 +48,22 @@ def handle_etherscan_error(response: requests.Response) -> Any:
             )
 
 
+def _etherscan_result(response_data: dict[str, Any]) -> Any:
+    if response_data.get("status") == "1":
+        return response_data["result"]
+
+    # Error Handling Section
+    match response_data["message"]:
+        case "Missing/Invalid API Key":
+            raise ValueError("Invalid Etherscan API Key")
+        case "No transactions found":
+            return []
+        case _:
+            if isinstance(response_data.get("result"), str) and "rate limit" in response_data["result"].lower():
+                raise RPCRateLimitError(f"Etherscan Rate Limit Exceeded: {response_data['result']}")
+            raise RuntimeError(f"Unhandled Etherscan Error: {response_data}")
+
+
 def get_transactions_for_account(  # pylint: disable=too-many-locals, too-many-arguments
     api_key: str,
     api_endpoint: str,
@@ -89,6 +105,8 @@ def get_transactions_for_account(  # pylint: disable=too-many-locals, too-many-a
             timeout=300,
         )
         raw_tx_batch = handle_etherscan_error(response)
+        if not raw_tx_batch:
+            return output_transactions
 
         logger.debug(
             f"Queried {len(raw_tx_batch)} Txns from blocks {raw_tx_batch[0]['blockNumber']} "
@@ -110,6 +128,276 @@ def get_transactions_for_account(  # pylint: disable=too-many-locals, too-many-a
         search_block = int(parsed_transactions[-1].block_number) + 1
 
 
+class EtherscanAccountCache:
+    """
+    On-disk cache of Etherscan transaction history.  For each account, the completed block ranges & the raw
+    Etherscan transactions inside those ranges are stored as a JSON file in the cache directory, so repeated
+    backfills of an account only request blocks outside the completed ranges.
+
+    Account files are written to a temporary file & atomically replaced on flush(), so an interrupted write never
+    corrupts the cache.
+
+    :param path: Directory of the account cache files
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self._ranges: dict[bytes, list[tuple[int, int]]] = {}
+        self._transactions: dict[bytes, dict[str, dict[str, Any]]] = {}
+
+    def _account_path(self, account_address: bytes) -> str:
+        return os.path.join(self.path, f"{account_address.hex()}.json")
+
+    def _load(self, account_address: bytes):
+        if account_address in self._ranges:
+            return
+
+        ranges: list[tuple[int, int]] = []
+        transactions: dict[str, dict[str, Any]] = {}
+        if os.path.exists(account_path := self._account_path(account_address)):
+            with open(account_path, "r") as account_file:
+                account_cache = json.load(account_file)
+
+            ranges = [(start, end) for start, end in account_cache["ranges"]]
+            transactions = {tx_data["hash"]: tx_data for tx_data in account_cache["transactions"]}
+
+        self._ranges[account_address] = ranges
+        self._transactions[account_address] = transactions
+
+    def completed_ranges(self, account_address: bytes) -> list[tuple[int, int]]:
+        """Return the sorted & merged [start, end) block ranges completed for an account"""
+        self._load(account_address)
+        return list(self._ranges[account_address])
+
+    def missing_ranges(self, account_address: bytes, from_block: int, to_block: int) -> list[tuple[int, int]]:
+        """Return the [start, end) block ranges between from_block & to_block that are not cached"""
+        missing, search_block = [], from_block
+        for start, end in self.completed_ranges(account_address):
+            if end <= search_block:
+                continue
+            if start >= to_block:
+                break
+            if start > search_block:
+                missing.append((search_block, start))
+            search_block = max(search_block, end)
+
+        if search_block < to_block:
+            missing.append((search_block, to_block))
+        return missing
+
+    def add_range(self, account_address: bytes, from_block: int, to_block: int, tx_batch: list[dict[str, Any]]):
+        """
+        Record a completed [from_block, to_block) range, and the raw Etherscan transactions fetched for it.
+        Transactions already in the cache are replaced, so overlapping ranges are deduplicated.
+        """
+        self._load(account_address)
+        self._transactions[account_address].update((tx_data["hash"], tx_data) for tx_data in tx_batch)
+
+        merged: list[tuple[int, int]] = []
+        for start, end in sorted(self._ranges[account_address] + [(from_block, to_block)]):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self._ranges[account_address] = merged
+
+    def get_transactions(self, account_address: bytes, from_block: int, to_block: int) -> list[dict[str, Any]]:
+        """Return the raw Etherscan transactions cached for an account within [from_block, to_block)"""
+        self._load(account_address)
+        return [
+            tx_data
+            for tx_data in self._transactions[account_address].values()
+            if from_block <= int(tx_data["blockNumber"]) < to_block
+        ]
+
+    def flush(self, account_address: bytes):
+        """Write the cached ranges & transactions for an account to disk"""
+        if account_address not in self._ranges:
+            return
+
+        account_path = self._account_path(account_address)
+        with open(account_path + ".tmp", "w") as account_file:
+            json.dump(
+                {
+                    "ranges": self._ranges[account_address],
+                    "transactions": list(self._transactions[account_address].values()),
+                },
+                account_file,
+            )
+            account_file.flush()
+            os.fsync(account_file.fileno())
+
+        os.replace(account_path + ".tmp", account_path)
+
+
+class _RequestThrottle:
+    """Spaces request start times evenly, so concurrent requests stay within a requests-per-second limit"""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1 / requests_per_second
+        self._next_request = 0.0
+
+    async def wait(self):
+        now = time.monotonic()
+        delay = self._next_request - now
+        self._next_request = max(now, self._next_request) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# pylint: disable-next=too-many-locals
+async def async_get_transactions_for_account(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    api_key: str,
+    api_endpoint: str,
+    from_block: int,
+    to_block: int,
+    account_address: bytes,
+    aiohttp_session: ClientSession,
+    page_size: int = 1000,
+    shard_blocks: int = 250_000,
+    requests_per_second: float = 5,
+    max_concurrency: int = 8,
+    max_retries: int = 5,
+    cache: EtherscanAccountCache | None = None,
+) -> list[Transaction]:
+    """
+    Fetches all transactions for an account address from the Etherscan API.  The block range is split into shards
+    of shard_blocks blocks, and shards are paged concurrently, with request starts spaced to stay within
+    requests_per_second.  Each page ending inside a block is trimmed to the last complete block, and the next page
+    starts at the trimmed block, so transactions on page boundaries are fetched exactly once.
+
+    If a cache is provided, only block ranges missing from the cache are requested.  Each shard is recorded in the
+    cache once it completes.  If a shard fails, the unfinished shards are cancelled and awaited before the cache is
+    flushed, so an interrupted backfill resumes from every completed shard.
+
+    .. code-block:: python
+
+        cache = EtherscanAccountCache("etherscan_cache")
+        transactions = await async_get_transactions_for_account(
+            api_key, "https://api.etherscan.io/api", 0, current_block + 1, account, session, cache=cache
+        )
+
+    :param api_key:
+    :param api_endpoint:
+    :param from_block: Inclusive start block
+    :param to_block:
+        Exclusive end block.  Cached ranges are treated as complete, so to_block should not be past the chain head
+    :param account_address:
+    :param aiohttp_session:
+    :param page_size:
+    :param shard_blocks: Number of blocks in each concurrently fetched shard
+    :param requests_per_second: API rate limit.  Free Etherscan API keys are limited to 5 requests per second
+    :param max_concurrency: Maximum number of in-flight requests
+    :param max_retries: Retries for each request that is rate limited by the API
+    :param cache: On-disk account cache.  If None, every block in the range is requested
+    :return: Transactions sorted by block number & transaction index
+    """
+    throttle = _RequestThrottle(requests_per_second)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _request_page(start_block: int, end_block: int, page: int = 1) -> list[dict[str, Any]]:
+        params = {
+            "module": "account",
+            "action": "txlist",
+            "address": "0x" + account_address.hex(),
+            "startblock": start_block,
+            "endblock": end_block,
+            "page": page,
+            "offset": page_size,
+            "sort": "asc",
+            "apikey": api_key,
+        }
+        for attempt in range(max_retries + 1):
+            async with semaphore:
+                await throttle.wait()
+                async with aiohttp_session.get(api_endpoint, params=params) as response:
+                    if response.status != 200:
+                        raise ConnectionError(
+                            f"Unexpected Response Status Code ({response.status}) for Etherscan API. "
+                            f"Response Data: {await response.text()}"
+                        )
+                    response_data = await response.json()
+
+            try:
+                return _etherscan_result(response_data)
+            except RPCRateLimitError:
+                if attempt == max_retries:
+                    raise
+                logger.debug(f"Etherscan rate limited blocks {start_block} - {end_block}, retrying")
+                await asyncio.sleep(2**attempt * throttle.interval)
+
+        raise RPCRateLimitError("Etherscan Rate Limit Exceeded")  # Unreachable, satisfies type checkers
+
+    async def _fetch_shard(shard_start: int, shard_end: int) -> list[dict[str, Any]]:
+        shard_transactions: list[dict[str, Any]] = []
+        search_block = shard_start
+
+        while search_block < shard_end:
+            raw_tx_batch = await _request_page(search_block, shard_end - 1)
+            if len(raw_tx_batch) < page_size:
+                shard_transactions.extend(raw_tx_batch)
+                break
+
+            first_block, last_block = int(raw_tx_batch[0]["blockNumber"]), int(raw_tx_batch[-1]["blockNumber"])
+            if first_block == last_block:
+                # A single block fills the page, so page through the block instead of trimming it
+                shard_transactions.extend(await _fetch_block(last_block, raw_tx_batch))
+                search_block = last_block + 1
+            else:
+                shard_transactions.extend(_trim_last_block(raw_tx_batch))
+                search_block = last_block
+
+        logger.debug(f"Fetched {len(shard_transactions)} Txns from blocks {shard_start} - {shard_end - 1}")
+        if cache:
+            cache.add_range(account_address, shard_start, shard_end, shard_transactions)
+        return shard_transactions
+
+    async def _fetch_block(block_number: int, first_page: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        block_transactions, page = list(first_page), 1
+        while len(first_page) == page_size:
+            if (page + 1) * page_size > ETHERSCAN_MAX_RESULTS:
+                logger.warning(f"Block {block_number} exceeds the Etherscan result window, transactions truncated")
+                break
+            page += 1
+            first_page = await _request_page(block_number, block_number, page)
+            block_transactions.extend(first_page)
+        return block_transactions
+
+    fetch_ranges = cache.missing_ranges(account_address, from_block, to_block) if cache else [(from_block, to_block)]
+    shards = [
+        (shard_start, min(shard_start + shard_blocks, range_end))
+        for range_start, range_end in fetch_ranges
+        for shard_start in range(range_start, range_end, shard_blocks)
+    ]
+    logger.info(f"Fetching {len(shards)} shards of Etherscan transactions for 0x{account_address.hex()}")
+
+    shard_tasks = [asyncio.create_task(_fetch_shard(start, end)) for start, end in shards]
+    try:
+        shard_results = await asyncio.gather(*shard_tasks)
+    except BaseException:
+        # Settle the remaining shards before flushing, so no shard completes after the flush
+        for task in shard_tasks:
+            task.cancel()
+        await asyncio.gather(*shard_tasks, return_exceptions=True)
+        raise
+    finally:
+        if cache:
+            cache.flush(account_address)
+
+    if cache:
+        raw_transactions = cache.get_transactions(account_address, from_block, to_block)
+    else:
+        raw_transactions = list({tx_data["hash"]: tx_data for result in shard_results for tx_data in result}.values())
+
+    transactions = _parse_etherscan_transactions(raw_transactions)
+    transactions.sort(key=lambda tx: (tx.block_number, tx.transaction_index))
+
+    logger.info(f"Fetched {len(transactions)} Transactions from Etherscan API")
+    return transactions
+
+
 def _trim_last_block(tx_batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
     last_block = int(tx_batch[-1]["blockNumber"])
     slice_index = -1
@@ -0,0 +1,105 @@
+import pytest
+
+from nethermind.idealis.parse.shared.erc_20_tokens import (
+    ERC20Transfer,
+    decode_balance_diffs,
+    encode_erc20_transfers,
+    generate_balance_diffs,
+    generate_encoded_balance_diffs,
+)
+from nethermind.idealis.utils.address_encoder import AddressEncoder
+from tests.addresses import (
+    STARKNET_ACCOUNT_1,
+    STARKNET_ACCOUNT_2,
+    STARKNET_ACCOUNT_3,
+    STARKNET_ETH,
+    STARKNET_NULL_ADDRESS,
+    STARKNET_USDC,
+)
+
+
+def test_address_encoder_roundtrip(tmp_path):
+    encoder_path = str(tmp_path / "addresses.bin")
+    encoder = AddressEncoder(encoder_path)
+
+    ids = encoder.encode_many([STARKNET_ETH, STARKNET_ACCOUNT_1, STARKNET_ETH, b"\x12" * 20])
+    assert list(ids) == [0, 1, 0, 2]
+    assert encoder.decode_many(ids) == [STARKNET_ETH, STARKNET_ACCOUNT_1, STARKNET_ETH, b"\x12" * 20]
+    assert encoder.lookup(STARKNET_USDC) is None
+    assert len(encoder) == 3
+
+    encoder.flush()
+    encoder.encode(STARKNET_USDC)
+    encoder.flush()
+
+    reloaded = AddressEncoder(encoder_path)
+    assert len(reloaded) == 4
+    assert reloaded.lookup(STARKNET_USDC) == 3
+    assert reloaded.decode(2) == b"\x12" * 20
+
+    with open(encoder_path, "ab") as address_file:
+        address_file.write(bytes([32]) + b"\x00" * 5)  # Interrupted flush
+
+    assert len(AddressEncoder(encoder_path)) == 4
+
+
+def test_encoded_balance_diffs_match_balance_diffs():
+    transfer_defaults = {"block_number": 100, "transaction_index": 0, "event_index": 0}
+    transfers = [
+        ERC20Transfer(
+            token_address=token,
+            from_address=from_address,
+            to_address=to_address,
+            value=value,
+            **transfer_defaults,
+        )
+        for token, from_address, to_address, value in [
+            (STARKNET_ETH, STARKNET_ACCOUNT_1, STARKNET_ACCOUNT_2, 100),
+            (STARKNET_ETH, STARKNET_NULL_ADDRESS, STARKNET_ACCOUNT_1, 50),
+            (STARKNET_USDC, STARKNET_ACCOUNT_2, STARKNET_ACCOUNT_3, 200),
+            (STARKNET_ETH, STARKNET_ACCOUNT_2, STARKNET_ACCOUNT_3, 30),
+        ]
+    ]
+
+    encoder = AddressEncoder()
+    encoded_transfers = encode_erc20_transfers(transfers, encoder)
+    assert len(encoded_transfers) == 4
+    assert encoded_transfers.token_ids.typecode == "I"
+
+    encoded_diffs = generate_encoded_balance_diffs(
+        encoded_transfers, encoder, reference_block=200, zero_address=STARKNET_NULL_ADDRESS
+    )
+    expected = generate_balance_diffs(transfers, reference_block=200, zero_address=STARKNET_NULL_ADDRESS)
+
+    def _key(diff):
+        return diff.token_address, diff.holder_address
+
+    assert sorted(decode_balance_diffs(encoded_diffs, encoder), key=_key) == sorted(expected, key=_key)
+
+
+
+def test_encoded_balance_diffs_only_encode_zero_address_for_mints():
+    transfer = ERC20Transfer(
+        block_number=100,
+        transaction_index=0,
+        event_index=0,
+        token_address=STARKNET_ETH,
+        from_address=STARKNET_ACCOUNT_1,
+        to_address=STARKNET_ACCOUNT_2,
+        value=100,
+    )
+    encoder = AddressEncoder()
+    encoded_diffs = generate_encoded_balance_diffs(encode_erc20_transfers([transfer], encoder), encoder, 200)
+
+    assert len(encoded_diffs) == 2
+    assert len(encoder) == 3
+    assert b"\x00" * 20 not in encoder
+
+
+def test_address_encoder_overflow(monkeypatch):
+    monkeypatch.setattr("nethermind.idealis.utils.address_encoder.MAX_ADDRESS_ID", 1)
+    encoder = AddressEncoder()
+    encoder.encode_many([STARKNET_ETH, STARKNET_USDC])
+
+    with pytest.raises(OverflowError):
+        encoder.encode(STARKNET_ACCOUNT_1)
@@ -0,0 +1,60 @@
+import pytest
+
+from nethermind.idealis.parse.ethereum.execution import parse_get_block_response
+from nethermind.idealis.utils import to_bytes
+from nethermind.idealis.utils.interning import (
+    BytesInternTable,
+    disable_interning,
+    enable_interning,
+    intern_stats,
+)
+from tests.utils import load_rpc_response
+
+
+@pytest.fixture
+def interning():
+    enable_interning()
+    yield
+    disable_interning()
+
+
+def test_to_bytes_interning(interning):
+    address = "0x49d36570d4e46f48e99674bd3fcc84644ddd6b96f7c741b1562b82f9e004dc7"
+
+    first, second = to_bytes(address, pad=32), to_bytes(address, pad=32)
+    assert first == second == bytes.fromhex("0" + address[2:])
+    assert first is second
+
+    assert to_bytes("0x1", pad=20) is to_bytes("0x1", pad=20)
+    assert to_bytes("0x1", pad=20) != to_bytes("0x1", pad=32)
+    assert to_bytes(address) is not to_bytes(address)  # Only padded results are interned
+
+    assert intern_stats()[32].misses == 2
+
+
+def test_intern_table_eviction():
+    table = BytesInternTable(max_size=2, probation_size=2)
+    for value in ["0xa", "0xb", "0xa", "0xb"]:
+        if table.get(value) is None:
+            table.add(value, bytes.fromhex(value[2:].zfill(2)))
+
+    # Unique values churn through probation without evicting the protected values
+    for unique_value in range(10):
+        table.add(hex(unique_value), bytes([unique_value]))
+
+    assert table.get("0xa") == b"\x0a" and table.get("0xb") == b"\x0b"
+    assert len(table) == 4
+    assert table.stats.evictions == 8
+
+
+def test_parsers_share_interned_addresses(interning):
+    _, transactions = parse_get_block_response(
+        load_rpc_response("ethereum", "getBlockByNumber_txs_14422234.json")["result"]
+    )
+
+    addresses: dict[bytes, bytes] = {}
+    for transaction in transactions:
+        if transaction.to_address:
+            assert addresses.setdefault(transaction.to_address, transaction.to_address) is transaction.to_address
+
+    assert len(addresses) < len(transactions)  # Block contains repeated to addresses
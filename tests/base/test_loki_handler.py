@@ -0,0 +1,175 @@
+import gzip
+import json
+import logging
+import time
+
+import pytest
+import requests
+
+from nethermind.idealis.logging import LokiLoggerHandler
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+class FakeLokiSession:
+    def __init__(self, status_codes: list[int] | None = None):
+        self.status_codes = status_codes or []
+        self.pushes: list[dict] = []
+        self.attempts = 0
+
+    def post(self, url, data, headers, timeout):  # pylint: disable=unused-argument
+        self.attempts += 1
+        if self.status_codes:
+            status_code = self.status_codes.pop(0)
+            if status_code == 0:
+                raise requests.ConnectionError("Connection Refused")
+            if status_code >= 400:
+                return FakeResponse(status_code)
+
+        assert headers["Content-Encoding"] == "gzip"
+        self.pushes.append(json.loads(gzip.decompress(data)))
+        return FakeResponse(204)
+
+    def close(self):
+        pass
+
+
+def _create_handler(fake_session: FakeLokiSession, **kwargs) -> LokiLoggerHandler:
+    handler = LokiLoggerHandler(
+        "http://localhost:3100/loki/api/v1/push",
+        write_delay=60,
+        logger_labels={"application": "idealis-tests"},
+        retry_backoff=0.001,
+        **kwargs,
+    )
+    handler._request_session = fake_session  # pylint: disable=protected-access
+    return handler
+
+
+def _record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("nethermind", level, __file__, 1, message, None, None)
+
+
+def _pushed_messages(fake_session: FakeLokiSession) -> list[str]:
+    return [entry[1] for push in fake_session.pushes for stream in push["streams"] for entry in stream["values"]]
+
+
+def test_batches_and_flushes_on_close():
+    fake_session = FakeLokiSession()
+    handler = _create_handler(fake_session, batch_size=3)
+
+    for idx in range(7):
+        handler.emit(_record(f"log {idx}"))
+
+    handler.close()
+
+    assert _pushed_messages(fake_session) == [f"log {idx}" for idx in range(7)]
+    assert all(len(push["streams"][0]["values"]) <= 3 for push in fake_session.pushes)
+    assert fake_session.pushes[0]["streams"][0]["stream"] == {"application": "idealis-tests"}
+
+
+def test_drop_newest_when_full():
+    fake_session = FakeLokiSession()
+    handler = _create_handler(fake_session, max_queue_size=5, batch_size=100)
+
+    for idx in range(8):
+        handler.emit(_record(f"log {idx}"))
+    handler.close()
+
+    assert handler.dropped_records == 3
+    assert _pushed_messages(fake_session) == [f"log {idx}" for idx in range(5)]
+
+
+def test_drop_oldest_when_full():
+    fake_session = FakeLokiSession()
+    handler = _create_handler(fake_session, max_queue_size=5, batch_size=100, drop_policy="oldest")
+
+    for idx in range(8):
+        handler.emit(_record(f"log {idx}"))
+    handler.close()
+
+    assert handler.dropped_records == 3
+    assert _pushed_messages(fake_session) == [f"log {idx}" for idx in range(3, 8)]
+
+
+def test_sample_policy_keeps_warnings():
+    fake_session = FakeLokiSession()
+    handler = _create_handler(fake_session, max_queue_size=10, batch_size=100, drop_policy="sample", sample_every=2)
+
+    for idx in range(10):
+        handler.emit(_record(f"debug {idx}", logging.DEBUG))
+    handler.emit(_record("warning", logging.WARNING))
+    handler.close()
+
+    messages = _pushed_messages(fake_session)
+    assert messages[:5] == [f"debug {idx}" for idx in range(5)]
+    assert messages[-1] == "warning"
+    assert len(messages) < 11
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for the shipper thread"
+        time.sleep(0.005)
+
+
+def test_retries_failed_pushes():
+    fake_session = FakeLokiSession(status_codes=[503, 0])
+    handler = _create_handler(fake_session, max_retries=3, batch_size=1)
+
+    handler.emit(_record("retried"))  # Full batch wakes the shipper thread
+    _wait_for(lambda: fake_session.pushes)
+
+    assert fake_session.attempts == 3
+    assert _pushed_messages(fake_session) == ["retried"]
+    assert handler.failed_batches == 0
+    handler.close()
+
+
+def test_drops_batch_after_max_retries(capsys):
+    fake_session = FakeLokiSession(status_codes=[503, 503, 503])
+    handler = _create_handler(fake_session, max_retries=2, batch_size=1)
+
+    handler.emit(_record("dropped"))
+    _wait_for(lambda: handler.failed_batches)
+
+    assert fake_session.attempts == 3
+    assert handler.failed_batches == 1
+    assert handler.dropped_records == 1
+    assert "Dropped 1 logs" in capsys.readouterr().err
+    handler.close()
+
+
+def test_flush_does_not_retry():
+    fake_session = FakeLokiSession(status_codes=[0, 0, 0])
+    handler = _create_handler(fake_session, max_retries=5, batch_size=100)
+
+    for idx in range(6):
+        handler.emit(_record(f"log {idx}"))
+
+    handler.batch_size = 2
+    handler.flush()  # Loki is unreachable, so the first batch is dropped with the rest of the queue
+
+    assert fake_session.attempts == 1
+    assert handler.failed_batches == 1
+    assert handler.dropped_records == 6
+
+    handler.emit(_record("after flush"))
+    handler.close()
+    assert _pushed_messages(fake_session) == []
+    assert fake_session.attempts == 2
+
+
+def test_invalid_drop_policy():
+    with pytest.raises(ValueError):
+        LokiLoggerHandler("http://localhost:3100", drop_policy="random")  # type: ignore
+
+    with pytest.raises(ValueError):
+        LokiLoggerHandler("http://localhost:3100", max_retries=-1)
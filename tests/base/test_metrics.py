@@ -0,0 +1,145 @@
+import pytest
+
+from nethermind.idealis.exceptions import RPCRateLimitError
+from nethermind.idealis.metrics import (
+    PARSE_OBJECTS,
+    PARSE_SECONDS,
+    RPC_ERRORS,
+    RPC_RATE_LIMITS,
+    RPC_REQUEST_SECONDS,
+    RPC_REQUESTS,
+    RPC_RESPONSE_BYTES,
+    CallbackMetricsSink,
+    InMemoryMetricsSink,
+    instrument_parser,
+    set_metrics_sink,
+)
+from nethermind.idealis.parse.ethereum.execution import parse_get_block_response
+from nethermind.idealis.rpc.base.async_rpc import (
+    create_aiohttp_session,
+    parse_async_rpc_batch_response,
+    parse_async_rpc_response,
+)
+from tests.replay import ReplayRPCServer
+from tests.utils import load_rpc_response
+
+
+@pytest.fixture
+def metrics_sink():
+    sink = InMemoryMetricsSink()
+    set_metrics_sink(sink)
+    yield sink
+    set_metrics_sink(None)
+
+
+def test_parser_metrics_disabled_by_default():
+    calls = []
+
+    @instrument_parser("test_parser")
+    def _parse(data):
+        calls.append(data)
+        return data
+
+    assert _parse([1, 2, 3]) == [1, 2, 3]
+    assert calls == [[1, 2, 3]]
+
+
+def test_parser_metrics(metrics_sink):
+    block_json = load_rpc_response("ethereum", "getBlockByNumber_txs_14422234.json")
+    block, transactions = parse_get_block_response(block_json["result"])
+
+    hist = metrics_sink.histogram(PARSE_SECONDS, parser="ethereum_block")
+    assert hist is not None and hist.count == 1
+    assert metrics_sink.counter_value(PARSE_OBJECTS, parser="ethereum_block") == len(transactions) + 1
+
+
+def test_callback_sink():
+    recorded = []
+    set_metrics_sink(CallbackMetricsSink(lambda *metric: recorded.append(metric)))
+    try:
+        instrument_parser("test_parser")(lambda data: data)(("block", ["tx_1", "tx_2"]))
+    finally:
+        set_metrics_sink(None)
+
+    assert [(kind, name) for kind, name, _, _ in recorded] == [
+        ("histogram", PARSE_SECONDS),
+        ("counter", PARSE_OBJECTS),
+    ]
+    assert recorded[1][2:] == (3, {"parser": "test_parser"})
+
+
+def test_prometheus_text(metrics_sink):
+    metrics_sink.increment(RPC_REQUESTS, 2, {"method": "eth_call", "status": "200"})
+    metrics_sink.observe(RPC_REQUEST_SECONDS, 0.02, {"method": "eth_call"})
+    metrics_sink.observe(RPC_REQUEST_SECONDS, 3.0, {"method": "eth_call"})
+
+    text = metrics_sink.prometheus_text()
+
+    assert "# TYPE idealis_rpc_requests_total counter" in text
+    assert 'idealis_rpc_requests_total{method="eth_call",status="200"} 2' in text
+    assert 'idealis_rpc_request_seconds_bucket{method="eth_call",le="0.025"} 1' in text
+    assert 'idealis_rpc_request_seconds_bucket{method="eth_call",le="5"} 2' in text
+    assert 'idealis_rpc_request_seconds_bucket{method="eth_call",le="+Inf"} 2' in text
+    assert 'idealis_rpc_request_seconds_count{method="eth_call"} 2' in text
+
+
+@pytest.mark.asyncio
+async def test_rpc_request_metrics(metrics_sink):
+    async with ReplayRPCServer() as server:
+        session = create_aiohttp_session()
+        try:
+            async with session.post(
+                server.url,
+                json=(payload := {"jsonrpc": "2.0", "id": 1, "method": "trace_block", "params": ["0x1"]}),
+            ) as response:
+                await parse_async_rpc_response(payload, response)
+        finally:
+            await session.close()
+
+    assert metrics_sink.counter_value(RPC_REQUESTS, method="trace_block", status="200") == 1
+    assert metrics_sink.histogram(RPC_REQUEST_SECONDS, method="trace_block").count == 1
+    assert metrics_sink.counter_value(RPC_RESPONSE_BYTES, method="trace_block") == server.stats.bytes_sent
+
+
+@pytest.mark.asyncio
+async def test_rpc_rate_limit_metrics(metrics_sink):
+    async with ReplayRPCServer(rate_limit=1) as server:
+        session = create_aiohttp_session()
+        try:
+            for _ in range(2):
+                async with session.post(
+                    server.url,
+                    json=(payload := {"jsonrpc": "2.0", "id": 1, "method": "trace_block", "params": ["0x1"]}),
+                ) as response:
+                    try:
+                        await parse_async_rpc_response(payload, response)
+                    except RPCRateLimitError:
+                        pass
+        finally:
+            await session.close()
+
+    assert metrics_sink.counter_value(RPC_REQUESTS, method="trace_block", status="429") == 1
+    assert metrics_sink.counter_value(RPC_RATE_LIMITS, method="trace_block") == 1
+    assert metrics_sink.counter_value(RPC_ERRORS, method="trace_block", kind="RPCRateLimitError") == 1
+
+
+@pytest.mark.asyncio
+async def test_rpc_batch_response_metrics(metrics_sink):
+    def _handler(params):
+        if params[0] == "0x2":
+            raise ValueError("execution reverted")
+        return params[0]
+
+    async with ReplayRPCServer(method_handlers={"eth_call": _handler}) as server:
+        session = create_aiohttp_session()
+        payload = [{"jsonrpc": "2.0", "id": idx, "method": "eth_call", "params": [hex(idx)]} for idx in range(4)]
+        try:
+            async with session.post(server.url, json=payload) as response:
+                responses = await parse_async_rpc_batch_response(payload, response)
+        finally:
+            await session.close()
+
+    assert [res.get("result") for res in responses] == ["0x0", "0x1", None, "0x3"]
+    assert responses[2]["error"]["message"] == "execution reverted"
+    assert metrics_sink.counter_value(RPC_REQUESTS, method="batch", status="200") == 1
+    assert metrics_sink.counter_value(RPC_RESPONSE_BYTES, method="batch") == server.stats.bytes_sent
@@ -0,0 +1,109 @@
+import asyncio
+import os
+
+import pytest
+
+from nethermind.idealis.rpc.base.sharded import (
+    block_range_fetcher,
+    shard_block_range,
+    sharded_backfill,
+)
+from nethermind.idealis.rpc.ethereum import sharded_get_events_for_contract
+from nethermind.idealis.utils import to_bytes
+from tests.replay import ReplayRPCServer
+
+CONTRACT = to_bytes("0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2", pad=20)
+
+
+async def _fake_block_fetcher(blocks, rpc_url, aiohttp_session):
+    assert rpc_url == "http://localhost:1234"
+    assert not aiohttp_session.closed
+    return [(block, os.getpid()) for block in blocks]
+
+
+async def _fake_range_fetcher(contract, from_block, to_block, rpc_url, aiohttp_session):
+    assert not aiohttp_session.closed
+    return [(contract, from_block, to_block)]
+
+
+def _get_logs_handler(params):
+    log_filter = params[0]
+    return [
+        {
+            "address": log_filter["address"],
+            "blockNumber": hex(block),
+            "transactionIndex": "0x0",
+            "logIndex": "0x0",
+            "data": "0x",
+            "topics": log_filter["topics"],
+            "removed": False,
+        }
+        for block in range(int(log_filter["fromBlock"], 16), int(log_filter["toBlock"], 16) + 1)
+    ]
+
+
+def test_shard_block_range():
+    assert shard_block_range(0, 10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert shard_block_range(100, 104, 4) == [(100, 101), (101, 102), (102, 103), (103, 104)]
+
+    # More shards than blocks drops empty shards
+    assert shard_block_range(0, 2, 8) == [(0, 1), (1, 2)]
+    assert shard_block_range(10, 10, 4) == []
+
+    with pytest.raises(ValueError):
+        shard_block_range(0, 10, 0)
+
+
+def test_sharded_backfill_preserves_block_order():
+    batches = sharded_backfill(
+        _fake_block_fetcher,
+        from_block=1_000,
+        to_block=1_250,
+        rpc_url="http://localhost:1234",
+        worker_count=3,
+        batch_size=16,
+    )
+
+    assert all(len(batch) <= 16 for batch in batches)
+
+    blocks = [block for batch in batches for block, _ in batch]
+    assert blocks == list(range(1_000, 1_250))
+
+    worker_pids = {pid for batch in batches for _, pid in batch}
+    assert os.getpid() not in worker_pids
+
+
+def test_sharded_block_range_fetcher():
+    batches = sharded_backfill(
+        block_range_fetcher(_fake_range_fetcher, b"contract"),
+        from_block=0,
+        to_block=100,
+        rpc_url="http://localhost:1234",
+        worker_count=2,
+        batch_size=30,
+    )
+
+    ranges = [batch_range for batch in batches for batch_range in batch]
+    assert all(contract == b"contract" for contract, _, _ in ranges)
+    assert ranges[0][1:] == (0, 13)
+    assert ranges[-1][2] == 100
+    assert all(prev[2] == current[1] for prev, current in zip(ranges, ranges[1:]))
+
+
+@pytest.mark.asyncio
+async def test_sharded_get_events_for_contract():
+    async with ReplayRPCServer(method_handlers={"eth_getLogs": _get_logs_handler}) as server:
+        events = await asyncio.to_thread(
+            sharded_get_events_for_contract,
+            CONTRACT,
+            [b"\x01" * 32],
+            18_000_000,
+            18_000_500,
+            server.url,
+            worker_count=2,
+            batch_size=50,
+        )
+
+    assert [event.block_number for event in events] == list(range(18_000_000, 18_000_500))
+    assert all(event.contract_address == CONTRACT for event in events)
+    assert server.stats.method_counts["eth_getLogs"] == 16
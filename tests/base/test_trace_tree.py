@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+
+import pytest
+
+from nethermind.idealis.parse.shared.trace import (
+    TraceTree,
+    get_root_trace,
+    get_toplevel_child_traces,
+    group_traces,
+)
+
+
+@dataclass
+class SimpleTrace:
+    trace_address: list[int]
+
+
+TRACES = [
+    SimpleTrace([0]),
+    SimpleTrace([0, 0]),
+    SimpleTrace([0, 1]),
+    SimpleTrace([0, 1, 0]),
+    SimpleTrace([0, 1, 0, 0]),
+    SimpleTrace([0, 1, 1]),
+    SimpleTrace([0, 2]),
+]
+
+
+def test_trace_tree_lookups():
+    tree = TraceTree(TRACES)
+
+    assert len(tree) == 7
+    assert tree.root() is TRACES[0]
+    assert tree.node_id([0, 1, 0]) == 3
+    assert tree.get([0, 2]) is TRACES[6]
+    assert tree.get([0, 3]) is None
+
+    assert tree.children([0]) == [TRACES[1], TRACES[2], TRACES[6]]
+    assert tree.children([0, 1]) == [TRACES[3], TRACES[5]]
+    assert tree.children([0, 0]) == []
+
+    assert list(tree.iter_subtree([0, 1])) == [TRACES[2], TRACES[3], TRACES[4], TRACES[5]]
+    assert list(tree.iter_subtree([0])) == TRACES
+
+
+def test_shared_helpers_accept_trace_tree():
+    tree = TraceTree(TRACES)
+
+    assert get_root_trace(tree) is get_root_trace(TRACES)
+    for trace in TRACES:
+        assert get_toplevel_child_traces(tree, trace.trace_address) == get_toplevel_child_traces(
+            TRACES, trace.trace_address
+        )
+
+    assert group_traces(tree) == group_traces(TRACES)
+    assert group_traces(TRACES) == (
+        TRACES[0],
+        [
+            (TRACES[1], None),
+            (TRACES[2], [(TRACES[3], [(TRACES[4], None)]), (TRACES[5], None)]),
+            (TRACES[6], None),
+        ],
+    )
+
+
+def test_trace_tree_duplicate_roots():
+    tree = TraceTree([SimpleTrace([0]), SimpleTrace([0, 0]), SimpleTrace([0])])
+
+    with pytest.raises(ValueError):
+        tree.root()
+
+    assert len(tree.children([0])) == 1
@@ -0,0 +1,10 @@
+from tests.benchmarks.harness import BENCHMARK_RESULTS
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not BENCHMARK_RESULTS:
+        return
+
+    terminalreporter.section("idealis benchmarks")
+    for result in BENCHMARK_RESULTS:
+        terminalreporter.write_line(result.report_line())
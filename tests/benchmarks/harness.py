@@ -0,0 +1,123 @@
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+BENCHMARK_RESULTS: list["BenchmarkResult"] = []
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    total_seconds: float
+    peak_memory_bytes: int
+
+    item_counts: dict[str, int] = field(default_factory=dict)
+    """ Items produced by a single iteration, ie {"blocks": 1, "traces": 4500, "events": 9000} """
+
+    latencies: list[float] = field(default_factory=list)
+
+    def throughput(self) -> dict[str, float]:
+        """Items per second for each item kind"""
+        if self.total_seconds == 0:
+            return {}
+        return {kind: count * self.iterations / self.total_seconds for kind, count in self.item_counts.items()}
+
+    def report_line(self) -> str:
+        rates = "  ".join(f"{rate:>12,.1f} {kind}/s" for kind, rate in self.throughput().items())
+        line = f"{self.name:<48} {rates}  peak_mem={self.peak_memory_bytes / 2**20:,.1f} MiB"
+        if self.latencies:
+            quantiles = statistics.quantiles(self.latencies, n=20) if len(self.latencies) > 1 else self.latencies * 19
+            line += (
+                f"  latency_p50={statistics.median(self.latencies) * 1000:,.1f}ms"
+                f"  latency_p95={quantiles[18] * 1000:,.1f}ms"
+            )
+        return line
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_parse_benchmark(
+    name: str,
+    parse_func: Callable[[], Any],
+    count_items: Callable[[Any], dict[str, int]],
+    iterations: int = 10,
+) -> BenchmarkResult:
+    """
+    Time parse_func over several iterations, and measure peak memory of a single call in a separate traced run,
+    since tracemalloc slows down allocation heavy parsers.
+
+    :param name: Benchmark name used in the report
+    :param parse_func: Zero-argument callable that parses a recorded response
+    :param count_items: Maps the parser output to item counts, ie {"traces": len(traces)}
+    :param iterations: Number of timed iterations
+    """
+    parsed = parse_func()  # Warmup
+    item_counts = count_items(parsed)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse_func()
+    total_seconds = time.perf_counter() - start
+
+    result = BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        total_seconds=total_seconds,
+        peak_memory_bytes=_peak_memory(parse_func),
+        item_counts=item_counts,
+    )
+    BENCHMARK_RESULTS.append(result)
+    return result
+
+
+async def run_fetch_benchmark(
+    name: str,
+    fetch_func: Callable[[], Awaitable[Any]],
+    count_items: Callable[[Any], dict[str, int]],
+    iterations: int = 10,
+) -> BenchmarkResult:
+    """
+    Measure end to end fetch + parse latency of an async fetcher.  Iterations are run sequentially so each latency
+    sample covers a single fetcher call.
+
+    :param name: Benchmark name used in the report
+    :param fetch_func: Zero-argument coroutine function calling the fetcher against a ReplayRPCServer
+    :param count_items: Maps the fetcher output to item counts
+    :param iterations: Number of timed fetcher calls
+    """
+    item_counts = count_items(await fetch_func())  # Warmup & open connections
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fetch_func()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        await fetch_func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        total_seconds=sum(latencies),
+        peak_memory_bytes=peak_memory,
+        item_counts=item_counts,
+        latencies=latencies,
+    )
+    BENCHMARK_RESULTS.append(result)
+    return result
@@ -0,0 +1,112 @@
+import pytest
+
+from nethermind.idealis.parse.ethereum.consensus import parse_blob_sidecar_response
+from nethermind.idealis.parse.ethereum.execution import parse_get_block_response
+from nethermind.idealis.parse.ethereum.trace import (
+    unpack_debug_trace_block_response,
+    unpack_trace_block_response,
+)
+from nethermind.idealis.rpc.base.async_rpc import (
+    create_aiohttp_session,
+    handle_beacon_api_lighthouse_errors,
+)
+from nethermind.idealis.rpc.ethereum import (
+    debug_trace_block,
+    get_beacon_block,
+    get_blocks,
+    trace_block,
+)
+from tests.benchmarks.harness import run_fetch_benchmark, run_parse_benchmark
+from tests.replay import ReplayRPCServer
+from tests.utils import load_rpc_response
+
+FETCH_BLOCKS = list(range(18_500_000, 18_500_010))
+
+
+@pytest.mark.benchmark
+def test_bench_parse_get_block():
+    block_json = load_rpc_response("ethereum", "getBlockByNumber_txs_14422234.json")["result"]
+
+    run_parse_benchmark(
+        "ethereum.parse_get_block_response",
+        lambda: parse_get_block_response(block_json),
+        lambda parsed: {"blocks": 1, "transactions": len(parsed[1])},
+    )
+
+
+@pytest.mark.benchmark
+def test_bench_parse_trace_block():
+    trace_json = load_rpc_response("ethereum", "trace_block_18_500_000.json")["result"]
+
+    run_parse_benchmark(
+        "ethereum.unpack_trace_block_response",
+        lambda: unpack_trace_block_response(trace_json),
+        lambda parsed: {"blocks": 1, "traces": sum(len(traces) for traces in parsed)},
+    )
+
+
+@pytest.mark.benchmark
+def test_bench_parse_debug_trace_block():
+    trace_json = load_rpc_response("ethereum", "debug_traceBlock_19_000_000.json")["result"]
+
+    run_parse_benchmark(
+        "ethereum.unpack_debug_trace_block_response",
+        lambda: unpack_debug_trace_block_response(trace_json, 19_000_000),
+        lambda parsed: {"blocks": 1, "traces": len(parsed[0]) + len(parsed[1]), "events": len(parsed[2])},
+    )
+
+
+@pytest.mark.benchmark
+def test_bench_parse_blob_sidecars():
+    sidecar_json = load_rpc_response("ethereum", "beacon_get_blob_sidecars.json")["data"]
+
+    run_parse_benchmark(
+        "ethereum.parse_blob_sidecar_response",
+        lambda: parse_blob_sidecar_response(sidecar_json),
+        lambda parsed: {"slots": 1, "blobs": len(parsed[1])},
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_bench_fetch_ethereum_execution():
+    async with ReplayRPCServer(latency=0.02, jitter=0.005) as server:
+        session = create_aiohttp_session()
+        try:
+            await run_fetch_benchmark(
+                "ethereum.get_blocks (10 blocks)",
+                lambda: get_blocks(FETCH_BLOCKS, server.url, session),
+                lambda fetched: {"blocks": len(fetched[0]), "transactions": len(fetched[1])},
+            )
+            await run_fetch_benchmark(
+                "ethereum.trace_block",
+                lambda: trace_block(18_500_000, server.url, session),
+                lambda fetched: {"blocks": 1, "traces": sum(len(traces) for traces in fetched)},
+            )
+            await run_fetch_benchmark(
+                "ethereum.debug_trace_block",
+                lambda: debug_trace_block(19_000_000, server.url, session),
+                lambda fetched: {"blocks": 1, "traces": len(fetched[0]) + len(fetched[1]), "events": len(fetched[2])},
+            )
+        finally:
+            await session.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_bench_fetch_beacon_blobs():
+    async with ReplayRPCServer(latency=0.02, jitter=0.005) as server:
+        session = create_aiohttp_session()
+        try:
+            await run_fetch_benchmark(
+                "ethereum.get_beacon_block",
+                lambda: get_beacon_block(7785423, server.url, session, handle_beacon_api_lighthouse_errors),
+                lambda fetched: {"slots": 1, "blobs": len(fetched[1])},
+            )
+            await run_fetch_benchmark(
+                "ethereum.get_beacon_block (ssz)",
+                lambda: get_beacon_block(7785423, server.url, session, handle_beacon_api_lighthouse_errors, ssz=True),
+                lambda fetched: {"slots": 1, "blobs": len(fetched[1])},
+            )
+        finally:
+            await session.close()
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from nethermind.idealis.exceptions import RPCError, RPCRateLimitError
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
+from nethermind.idealis.rpc.ethereum import get_blocks, trace_block
+from tests.replay import ReplayRPCServer
+
+
+@pytest.mark.asyncio
+async def test_replay_server_returns_fixtures():
+    async with ReplayRPCServer() as server:
+        session = create_aiohttp_session()
+        try:
+            blocks, transactions = await get_blocks([1, 2], server.url, session)
+            call_traces, _, _, _ = await trace_block(18_500_000, server.url, session)
+        finally:
+            await session.close()
+
+    assert [b.block_number for b in blocks] == [14422234, 14422234]
+    assert len(transactions) > 0
+    assert len(call_traces) > 0
+
+    assert server.stats.method_counts == {"eth_getBlockByNumber": 2, "trace_block": 1}
+
+
+@pytest.mark.asyncio
+async def test_replay_server_latency():
+    async with ReplayRPCServer(latency=0.1, jitter=0.01) as server:
+        session = create_aiohttp_session()
+        try:
+            start = time.perf_counter()
+            await get_blocks([1], server.url, session)
+            elapsed = time.perf_counter() - start
+        finally:
+            await session.close()
+
+    assert elapsed >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_replay_server_rate_limits():
+    async with ReplayRPCServer(rate_limit=2) as server:
+        session = create_aiohttp_session()
+        try:
+            with pytest.raises(RPCRateLimitError):
+                await get_blocks(list(range(10)), server.url, session)
+        finally:
+            await session.close()
+
+    assert server.stats.rate_limited > 0
+
+
+@pytest.mark.asyncio
+async def test_replay_server_unknown_method():
+    async with ReplayRPCServer(fixtures={}) as server:
+        session = create_aiohttp_session()
+        try:
+            with pytest.raises(RPCError):
+                await trace_block(1, server.url, session)
+        finally:
+            await session.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_server_string_request_id():
+    async with ReplayRPCServer() as server:
+        session = create_aiohttp_session()
+        try:
+            payload = {"jsonrpc": "2.0", "id": "block-1", "method": "eth_getBlockByNumber", "params": ["0x1", True]}
+            async with session.post(server.url, json=payload) as response:
+                response_json = await response.json()
+        finally:
+            await session.close()
+
+    assert response_json["id"] == "block-1"
+    assert response_json["result"]["number"] == hex(14422234)
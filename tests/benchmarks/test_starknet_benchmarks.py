@@ -0,0 +1,83 @@
+import pytest
+
+from nethermind.idealis.parse.starknet.block import parse_block_with_tx_receipts
+from nethermind.idealis.parse.starknet.trace import (
+    ParsedBlockTrace,
+    unpack_trace_block_response,
+)
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
+from nethermind.idealis.rpc.starknet import (
+    get_blocks,
+    get_blocks_with_txns,
+    trace_blocks,
+)
+from tests.benchmarks.harness import run_fetch_benchmark, run_parse_benchmark
+from tests.replay import ReplayRPCServer
+from tests.utils import load_rpc_response
+
+FETCH_BLOCKS = list(range(480_000, 480_010))
+
+
+def _trace_counts(block_trace: ParsedBlockTrace, block_count: int = 1) -> dict[str, int]:
+    return {
+        "blocks": block_count,
+        "traces": (
+            len(block_trace.validate_traces)
+            + len(block_trace.execute_traces)
+            + len(block_trace.fee_transfer_traces)
+            + len(block_trace.constructor_traces)
+        ),
+        "events": (
+            len(block_trace.validate_events)
+            + len(block_trace.execute_events)
+            + len(block_trace.fee_transfer_events)
+            + len(block_trace.constructor_events)
+        ),
+    }
+
+
+@pytest.mark.benchmark
+def test_bench_parse_trace_block():
+    trace_json = load_rpc_response("starknet", "trace_block_480_000.json")
+
+    run_parse_benchmark(
+        "starknet.unpack_trace_block_response",
+        lambda: unpack_trace_block_response(trace_json, 480_000),
+        _trace_counts,
+    )
+
+
+@pytest.mark.benchmark
+def test_bench_parse_block_with_receipts():
+    block_json = load_rpc_response("starknet", "get_block_with_txs_623_436.json")["result"]
+
+    run_parse_benchmark(
+        "starknet.parse_block_with_tx_receipts",
+        lambda: parse_block_with_tx_receipts(block_json),
+        lambda parsed: {"blocks": 1, "transactions": len(parsed[1]), "events": len(parsed[2])},
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_bench_fetch_starknet():
+    async with ReplayRPCServer(latency=0.02, jitter=0.005) as server:
+        session = create_aiohttp_session()
+        try:
+            await run_fetch_benchmark(
+                "starknet.get_blocks (10 blocks)",
+                lambda: get_blocks(FETCH_BLOCKS, server.url, session),
+                lambda fetched: {"blocks": len(fetched)},
+            )
+            await run_fetch_benchmark(
+                "starknet.get_blocks_with_txns (10 blocks)",
+                lambda: get_blocks_with_txns(FETCH_BLOCKS, server.url, session),
+                lambda fetched: {"blocks": len(fetched[0]), "transactions": len(fetched[1]), "events": len(fetched[2])},
+            )
+            await run_fetch_benchmark(
+                "starknet.trace_blocks (10 blocks)",
+                lambda: trace_blocks(FETCH_BLOCKS, server.url, session),
+                lambda fetched: _trace_counts(fetched, len(FETCH_BLOCKS)),
+            )
+        finally:
+            await session.close()
@@ -17,20 +17,23 @@ if sys.platform == "win32":
 
 def pytest_addoption(parser):
     parser.addoption("--runslow", action="store_true", default=False, help="run slow tests")
+    parser.addoption("--runbenchmarks", action="store_true", default=False, help="run benchmarks")
 
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "slow: mark test as slow to run")
+    config.addinivalue_line("markers", "benchmark: mark test as a benchmark")
 
 
 def pytest_collection_modifyitems(config, items):
-    if config.getoption("--runslow"):
-        # --runslow given in cli: do not skip slow tests
-        return
     skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    skip_benchmark = pytest.mark.skip(reason="need --runbenchmarks option to run")
     for item in items:
-        if "slow" in item.keywords:
+        # --runslow given in cli: do not skip slow tests
+        if "slow" in item.keywords and not config.getoption("--runslow"):
             item.add_marker(skip_slow)
+        if "benchmark" in item.keywords and not config.getoption("--runbenchmarks"):
+            item.add_marker(skip_benchmark)
 
 
 @pytest.fixture(scope="function")
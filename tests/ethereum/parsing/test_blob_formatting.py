@@ -1,7 +1,12 @@
+import pytest
+
 from nethermind.idealis.parse.ethereum.consensus import (
     parse_blob_sidecar_response,
+    parse_blob_sidecar_ssz,
     parse_signed_beacon_block,
 )
+from nethermind.idealis.utils.blob_store import BlobStore
+from tests.replay import encode_blob_sidecars_ssz
 from tests.utils import load_rpc_response
 
 
@@ -39,3 +44,51 @@ def test_blob_formatting():
 
     for blob_sidecar in blob_sidecars:
         assert blob_sidecar.slot == 7785423
+
+
+def test_blob_sidecar_ssz_parsing():
+    blob_sidecar_response = load_rpc_response("ethereum", "beacon_get_blob_sidecars.json")
+    ssz_payload = encode_blob_sidecars_ssz(blob_sidecar_response["data"])
+
+    json_block, json_sidecars = parse_blob_sidecar_response(blob_sidecar_response["data"])
+    ssz_block, ssz_sidecars = parse_blob_sidecar_ssz(ssz_payload)
+
+    assert ssz_block == json_block
+    assert len(ssz_sidecars) == len(json_sidecars) == 6
+
+    for ssz_sidecar, json_sidecar in zip(ssz_sidecars, json_sidecars):
+        assert isinstance(ssz_sidecar.blob_data, memoryview)
+        assert ssz_sidecar.blob_data == json_sidecar.blob_data
+        assert ssz_sidecar.blob_index == json_sidecar.blob_index
+        assert ssz_sidecar.kzg_commitment == json_sidecar.kzg_commitment
+        assert ssz_sidecar.kzg_commitment_inclusion_proof == json_sidecar.kzg_commitment_inclusion_proof
+
+    with pytest.raises(ValueError):
+        parse_blob_sidecar_ssz(ssz_payload[:-1])
+
+
+def test_blob_store(tmp_path):
+    _, blob_sidecars = parse_blob_sidecar_response(
+        load_rpc_response("ethereum", "beacon_get_blob_sidecars.json")["data"]
+    )
+
+    blob_store = BlobStore(str(tmp_path / "blobs.bin"), growth=4)
+    for sidecar in blob_sidecars:
+        stored = blob_store.put(
+            sidecar.slot, sidecar.blob_index, sidecar.blob_data, sidecar.kzg_commitment, sidecar.kzg_proof
+        )
+        assert stored == sidecar.blob_data
+
+    assert len(blob_store) == 6
+    assert blob_store.slot_blob_indexes(7785423) == [0, 1, 2, 3, 4, 5]
+    assert blob_store.get_blob(7785423, 6) is None
+
+    blob_store.flush()
+    blob_store.put(7785424, 0, blob_sidecars[0].blob_data)  # Discarded on reopen, since it was not flushed
+    del stored
+
+    reopened = BlobStore(str(tmp_path / "blobs.bin"))
+    assert len(reopened) == 6
+    assert reopened.get_blob(7785423, 2) == blob_sidecars[2].blob_data
+    assert reopened.get_kzg(7785423, 2) == (blob_sidecars[2].kzg_commitment, blob_sidecars[2].kzg_proof)
+    assert (7785424, 0) not in reopened
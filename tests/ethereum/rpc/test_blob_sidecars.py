@@ -0,0 +1,60 @@
+import pytest
+
+from nethermind.idealis.rpc.base.async_rpc import (
+    create_aiohttp_session,
+    handle_beacon_api_lighthouse_errors,
+)
+from nethermind.idealis.rpc.ethereum import get_beacon_block, stream_blob_sidecars
+from nethermind.idealis.utils.blob_store import BlobStore
+from tests.replay import ReplayRPCServer
+
+
+@pytest.mark.asyncio
+async def test_get_beacon_block_ssz():
+    async with ReplayRPCServer() as server:
+        session = create_aiohttp_session()
+        try:
+            json_block, json_sidecars = await get_beacon_block(
+                7785423, server.url, session, handle_beacon_api_lighthouse_errors
+            )
+            ssz_block, ssz_sidecars = await get_beacon_block(
+                7785423, server.url, session, handle_beacon_api_lighthouse_errors, ssz=True
+            )
+        finally:
+            await session.close()
+
+    assert ssz_block == json_block
+    assert isinstance(ssz_sidecars[0].blob_data, memoryview)
+    assert [s.blob_data for s in ssz_sidecars] == [s.blob_data for s in json_sidecars]
+
+
+@pytest.mark.asyncio
+async def test_stream_blob_sidecars(tmp_path):
+    blob_store = BlobStore(str(tmp_path / "blobs.bin"))
+
+    async with ReplayRPCServer(latency=0.01) as server:
+        session = create_aiohttp_session()
+        try:
+            streamed = [
+                (beacon_block.slot, [s.blob_index for s in blob_sidecars], blob_sidecars[0].blob_data)
+                async for beacon_block, blob_sidecars in stream_blob_sidecars(
+                    range(10),
+                    server.url,
+                    session,
+                    handle_beacon_api_lighthouse_errors,
+                    blob_store=blob_store,
+                    max_concurrency=4,
+                )
+            ]
+        finally:
+            await session.close()
+
+    # The replay server returns the same slot for every request
+    assert len(streamed) == 10
+    assert server.stats.requests == 10
+    assert [blob_indexes for _, blob_indexes, _ in streamed] == [[0, 1, 2, 3, 4, 5]] * 10
+    assert len(blob_store) == 6
+    assert streamed[0][2] == blob_store.get_blob(7785423, 0)
+
+    del streamed
+    blob_store.close()
@@ -0,0 +1,62 @@
+import pytest
+
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
+from nethermind.idealis.rpc.ethereum import get_block_bundles
+from tests.replay import ReplayRPCServer
+
+LOG_ADDRESS = "0x" + "ab" * 20
+
+
+def _block_receipts(params):
+    # Fixture block has 145 transactions.  Receipts are returned in reverse order to check the join
+    block_number = params[0]
+    return [
+        {
+            "transactionIndex": hex(tx_index),
+            "gasUsed": hex(21_000 + tx_index),
+            "effectiveGasPrice": hex(10**9 + tx_index),
+            "logs": [
+                {
+                    "blockNumber": block_number,
+                    "transactionIndex": hex(tx_index),
+                    "logIndex": hex(tx_index),
+                    "address": LOG_ADDRESS,
+                    "data": "0x",
+                    "topics": ["0x" + "01" * 32],
+                    "removed": False,
+                }
+            ]
+            if tx_index % 2 == 0
+            else [],
+        }
+        for tx_index in reversed(range(145))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_block_bundles():
+    async with ReplayRPCServer(method_handlers={"eth_getBlockReceipts": _block_receipts}) as server:
+        session = create_aiohttp_session()
+        try:
+            bundles = await get_block_bundles([14422234, 14422235], server.url, session, max_concurrency=2)
+            untraced = await get_block_bundles([14422234], server.url, session, trace_method=None)
+        finally:
+            await session.close()
+
+    assert server.stats.method_counts == {
+        "eth_getBlockByNumber": 3,
+        "eth_getBlockReceipts": 3,
+        "trace_block": 2,
+    }
+
+    bundle = bundles[0]
+    assert bundle.block.block_number == 14422234
+    assert len(bundle.transactions) == 145
+    assert all(tx.gas_used == 21_000 + tx.transaction_index for tx in bundle.transactions)
+    assert all(tx.gas_price == 10**9 + tx.transaction_index for tx in bundle.transactions)
+
+    assert len(bundle.events) == 73
+    assert len(bundle.call_traces) > 0
+
+    assert untraced[0].call_traces == []
+    assert len(untraced[0].events) == 73
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
+from nethermind.idealis.wrapper.etherscan import (
+    EtherscanAccountCache,
+    async_get_transactions_for_account,
+)
+from tests.replay import ReplayRPCServer
+from tests.utils import load_rpc_response
+
+ACCOUNT = bytes.fromhex("9aa99c23f67c81701c772b106b4f83f6e858dd2e")
+API_KEY = "A" * 34
+FETCH_OPTIONS = {"page_size": 10, "requests_per_second": 200}
+
+
+def _account_history() -> list[dict]:
+    """Account history with a transaction every 3 blocks, and a block with more transactions than a page"""
+    template = load_rpc_response("ethereum", "etherscan_account_activity.json")["result"][1]
+    tx_blocks = [block for block in range(0, 200, 3) for _ in range(2)] + [73] * 25
+    return [
+        template
+        | {"blockNumber": str(block), "transactionIndex": str(index), "hash": "0x" + index.to_bytes(32, "big").hex()}
+        for index, block in enumerate(sorted(tx_blocks))
+    ]
+
+
+def _txlist_handler(history: list[dict], requested_ranges: list[tuple[int, int]]):
+    def _txlist(params: dict[str, str]) -> list[dict]:
+        start_block, end_block = int(params["startblock"]), int(params["endblock"])
+        page, offset = int(params["page"]), int(params["offset"])
+        requested_ranges.append((start_block, end_block))
+
+        matched = [tx for tx in history if start_block <= int(tx["blockNumber"]) <= end_block]
+        return matched[(page - 1) * offset : page * offset]
+
+    return _txlist
+
+
+@pytest.mark.asyncio
+async def test_async_get_transactions_for_account():
+    history, requested_ranges = _account_history(), []
+
+    async with ReplayRPCServer(
+        latency=0.005, method_handlers={"account_txlist": _txlist_handler(history, requested_ranges)}
+    ) as server:
+        session = create_aiohttp_session()
+        try:
+            transactions = await async_get_transactions_for_account(
+                API_KEY, server.url + "/api", 0, 200, ACCOUNT, session, shard_blocks=50, **FETCH_OPTIONS
+            )
+        finally:
+            await session.close()
+
+    # Page boundaries & the block larger than a page are fetched exactly once
+    assert [tx.transaction_hash.hex() for tx in transactions] == [tx["hash"][2:] for tx in history]
+    assert len([tx for tx in transactions if tx.block_number == 73]) == 25
+
+    # Each request stays inside a single 50 block shard
+    assert {start // 50 for start, _ in requested_ranges} == {0, 1, 2, 3}
+    assert all(start // 50 == end // 50 for start, end in requested_ranges)
+
+
+@pytest.mark.asyncio
+async def test_async_get_transactions_for_account_cache(tmp_path):
+    history, requested_ranges = _account_history(), []
+
+    async with ReplayRPCServer(
+        method_handlers={"account_txlist": _txlist_handler(history, requested_ranges)}
+    ) as server:
+        session = create_aiohttp_session()
+        try:
+            cache = EtherscanAccountCache(str(tmp_path))
+            first_transactions = await async_get_transactions_for_account(
+                API_KEY, server.url + "/api", 0, 100, ACCOUNT, session, cache=cache, **FETCH_OPTIONS
+            )
+            requested_ranges.clear()
+
+            # New cache instance loads the completed ranges from disk
+            cache = EtherscanAccountCache(str(tmp_path))
+            assert cache.completed_ranges(ACCOUNT) == [(0, 100)]
+
+            transactions = await async_get_transactions_for_account(
+                API_KEY, server.url + "/api", 0, 200, ACCOUNT, session, cache=cache, **FETCH_OPTIONS
+            )
+        finally:
+            await session.close()
+
+    assert all(start >= 100 for start, _ in requested_ranges)
+    assert cache.completed_ranges(ACCOUNT) == [(0, 200)]
+    assert cache.missing_ranges(ACCOUNT, 50, 300) == [(200, 300)]
+
+    assert transactions[: len(first_transactions)] == first_transactions
+    assert [tx.transaction_hash.hex() for tx in transactions] == [tx["hash"][2:] for tx in history]
+
+
+@pytest.mark.asyncio
+async def test_async_get_transactions_for_account_failed_shard(tmp_path):
+    history, requested_ranges = _account_history(), []
+    txlist = _txlist_handler(history, requested_ranges)
+    fetch_options = FETCH_OPTIONS | {"shard_blocks": 50, "requests_per_second": 50}
+
+    def _failing_txlist(params: dict[str, str]) -> list[dict]:
+        if 150 < int(params["startblock"]) < 200:
+            raise ValueError("Shard failed")  # Second page of the 150 - 199 shard
+        return txlist(params)
+
+    async with ReplayRPCServer(latency=0.005, method_handlers={"account_txlist": _failing_txlist}) as server:
+        session = create_aiohttp_session()
+        try:
+            cache = EtherscanAccountCache(str(tmp_path))
+            with pytest.raises(ConnectionError):
+                await async_get_transactions_for_account(
+                    API_KEY, server.url + "/api", 0, 250, ACCOUNT, session, cache=cache, **fetch_options
+                )
+            request_count = len(requested_ranges)
+            await asyncio.sleep(0.1)
+        finally:
+            await session.close()
+
+    # Unfinished shards are cancelled, and every completed shard is flushed to disk
+    assert len(requested_ranges) == request_count
+    assert (200, 250) in cache.completed_ranges(ACCOUNT)
+    assert EtherscanAccountCache(str(tmp_path)).completed_ranges(ACCOUNT) == cache.completed_ranges(ACCOUNT)
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import random
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from aiohttp import web
+
+from tests.utils import load_rpc_response
+
+# JSON RPC Method -> (resource directory, fixture file)
+DEFAULT_RPC_FIXTURES: dict[str, tuple[str, str]] = {
+    # Starknet
+    "starknet_traceBlockTransactions": ("starknet", "trace_block_480_000.json"),
+    "starknet_getBlockWithReceipts": ("starknet", "get_block_with_txs_623_436.json"),
+    "starknet_getBlockWithTxHashes": ("starknet", "get_block_with_txs_623_436.json"),
+    # Ethereum
+    "eth_getBlockByNumber": ("ethereum", "getBlockByNumber_txs_14422234.json"),
+    "trace_block": ("ethereum", "trace_block_18_500_000.json"),
+    "debug_traceBlockByNumber": ("ethereum", "debug_traceBlock_19_000_000.json"),
+}
+
+BEACON_BLOB_SIDECAR_FIXTURE = ("ethereum", "beacon_get_blob_sidecars.json")
+
+
+def _fixture_result(directory: str, file_name: str) -> Any:
+    """Fixtures are stored either as full JSON RPC responses, or as the bare result"""
+    fixture = load_rpc_response(directory, file_name)
+    if isinstance(fixture, dict) and "result" in fixture and "jsonrpc" in fixture:
+        return fixture["result"]
+    return fixture
+
+
+def encode_blob_sidecars_ssz(blob_sidecars: list[dict[str, Any]]) -> bytes:
+    """SSZ encode a JSON blob sidecar response, as returned for ``Accept: application/octet-stream`` requests"""
+
+    def _hex(value: str) -> bytes:
+        return bytes.fromhex(value[2:])
+
+    encoded = bytearray()
+    for sidecar in blob_sidecars:
+        header = sidecar["signed_block_header"]
+        encoded += struct.pack("<Q", int(sidecar["index"]))
+        encoded += _hex(sidecar["blob"]) + _hex(sidecar["kzg_commitment"]) + _hex(sidecar["kzg_proof"])
+        encoded += struct.pack("<QQ", int(header["message"]["slot"]), int(header["message"]["proposer_index"]))
+        encoded += b"".join(_hex(header["message"][root]) for root in ["parent_root", "state_root", "body_root"])
+        encoded += _hex(header["signature"])
+        encoded += b"".join(_hex(proof) for proof in sidecar["kzg_commitment_inclusion_proof"])
+
+    return bytes(encoded)
+
+
+@dataclass
+class ReplayStats:
+    requests: int = 0
+    rate_limited: int = 0
+    bytes_sent: int = 0
+    method_counts: dict[str, int] = field(default_factory=dict)
+
+
+class ReplayRPCServer:
+    """
+    Local JSON RPC server that replays recorded RPC responses from tests/resources/rpc_responses.  Every request for
+    a method returns the same recorded result, regardless of the requested block, so parsers see real payloads
+    without network access.
+
+    Responses are serialized once at startup, so the server adds almost no CPU overhead to benchmarks running in the
+    same event loop.
+
+    .. code-block:: python
+
+        async with ReplayRPCServer(latency=0.05, jitter=0.01, rate_limit=200) as server:
+            await trace_blocks([1, 2, 3], server.url, session)
+
+    :param latency: Seconds to wait before returning each response
+    :param jitter: Uniform random jitter (+/- seconds) applied to the latency
+    :param rate_limit:
+        Max requests per second.  Requests exceeding the limit return a HTTP 429, which is raised as an
+        RPCRateLimitError by the RPC response parsers.  If None, requests are not rate limited
+    :param fixtures: Overrides for the method -> fixture mapping
+    :param seed: Random seed for latency jitter
+    :param method_handlers:
+        Dynamic responses for methods, called with the request params.  Handlers return the result, or raise a
+        ValueError to return a JSON RPC error.  Handlers take precedence over fixtures
+
+    JSON RPC batch requests are supported, and count as a single request towards the rate limit.  Beacon blob
+    sidecar requests with ``Accept: application/octet-stream`` return the SSZ encoded fixture.
+
+    Etherscan style ``GET /api`` requests are dispatched to the ``<module>_<action>`` method handler, which is called
+    with the query params.  Rate limited Etherscan requests return the Etherscan rate limit error instead of a 429.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float | None = None,
+        fixtures: dict[str, tuple[str, str]] | None = None,
+        seed: int = 0,
+        method_handlers: dict[str, Callable[[Any], Any]] | None = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.stats = ReplayStats()
+        self.method_handlers = method_handlers or {}
+
+        self._random = random.Random(seed)
+        self._responses: dict[str, bytes] = {
+            method: json.dumps(_fixture_result(*fixture)).encode()
+            for method, fixture in (DEFAULT_RPC_FIXTURES if fixtures is None else fixtures).items()
+        }
+        beacon_fixture = load_rpc_response(*BEACON_BLOB_SIDECAR_FIXTURE)
+        self._beacon_response = json.dumps(beacon_fixture).encode()
+        self._beacon_ssz_response = encode_blob_sidecars_ssz(beacon_fixture["data"])
+
+        self._tokens = rate_limit or 0.0
+        self._last_refill = time.monotonic()
+
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def __aenter__(self) -> "ReplayRPCServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/", self._handle_rpc)
+        app.router.add_get("/eth/v1/beacon/blob_sidecars/{slot}", self._handle_blob_sidecars)
+        app.router.add_get("/api", self._handle_etherscan)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _take_rate_limit_token(self) -> bool:
+        if self.rate_limit is None:
+            return True
+
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit)
+        self._last_refill = now
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
+
+    async def _delay(self):
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _rate_limited_response(self) -> web.Response:
+        self.stats.rate_limited += 1
+        return web.Response(status=429, text="Too Many Requests")
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        self.stats.requests += 1
+        if not self._take_rate_limit_token():
+            return self._rate_limited_response()
+
+        payload = await request.json()
+
+        await self._delay()
+
+        if isinstance(payload, list):
+            body = b"[" + b", ".join(self._rpc_response_body(request_payload) for request_payload in payload) + b"]"
+        else:
+            body = self._rpc_response_body(payload)
+
+        self.stats.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+    def _rpc_response_body(self, payload: dict[str, Any]) -> bytes:
+        method, request_id = payload["method"], payload.get("id", 1)
+        self.stats.method_counts[method] = self.stats.method_counts.get(method, 0) + 1
+
+        if method in self.method_handlers:
+            try:
+                result = self.method_handlers[method](payload.get("params"))
+            except ValueError as e:
+                return json.dumps(
+                    {"jsonrpc": "2.0", "id": request_id, "error": {"code": 40, "message": str(e)}}
+                ).encode()
+            return json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result}).encode()
+
+        if method not in self._responses:
+            return json.dumps(
+                {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32601, "message": "Method not found"}}
+            ).encode()
+
+        response_prefix = b'{"jsonrpc": "2.0", "id": ' + json.dumps(request_id).encode() + b', "result": '
+        return response_prefix + self._responses[method] + b"}"
+
+    async def _handle_blob_sidecars(self, request: web.Request) -> web.Response:
+        self.stats.requests += 1
+        if not self._take_rate_limit_token():
+            return self._rate_limited_response()
+
+        await self._delay()
+
+        if request.headers.get("Accept") == "application/octet-stream":
+            self.stats.bytes_sent += len(self._beacon_ssz_response)
+            return web.Response(body=self._beacon_ssz_response, content_type="application/octet-stream")
+
+        self.stats.bytes_sent += len(self._beacon_response)
+        return web.Response(body=self._beacon_response, content_type="application/json")
+
+    async def _handle_etherscan(self, request: web.Request) -> web.Response:
+        self.stats.requests += 1
+        if not self._take_rate_limit_token():
+            self.stats.rate_limited += 1
+            return web.json_response(
+                {"status": "0", "message": "NOTOK", "result": "Max calls per sec rate limit reached (5/sec)"}
+            )
+
+        await self._delay()
+
+        method = f"{request.query['module']}_{request.query['action']}"
+        self.stats.method_counts[method] = self.stats.method_counts.get(method, 0) + 1
+
+        result = self.method_handlers[method](dict(request.query))
+        if not result:
+            return web.json_response({"status": "0", "message": "No transactions found", "result": []})
+        return web.json_response({"status": "1", "message": "OK", "result": result})
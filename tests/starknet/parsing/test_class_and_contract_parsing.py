@@ -1,12 +1,27 @@
+from types import SimpleNamespace
+
 import pytest
 
+from nethermind.idealis.parse.starknet.abi import (
+    ClassFeatureIndex,
+    IndexedDecodingDispatcher,
+    is_class_account,
+    is_class_erc20_token,
+    is_dispatcher_class_proxy,
+)
 from nethermind.idealis.parse.starknet.transaction import parse_transaction_with_receipt
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
 from nethermind.idealis.rpc.starknet.classes import (
     get_class_declarations,
     get_contract_deployments,
 )
+from nethermind.idealis.types.starknet.contracts import ClassFeatures
+from nethermind.idealis.types.starknet.enums import StarknetTxType
 from nethermind.idealis.utils import to_bytes
 from nethermind.idealis.utils.starknet import PessimisticDecoder
+from nethermind.starknet_abi.core import StarknetAbi
+from tests.replay import ReplayRPCServer
+from tests.utils import load_rpc_response
 
 
 @pytest.mark.asyncio
@@ -261,3 +276,77 @@ def test_proxy_detection():
     # To detect proxies, add checks for constructor arguments and Upgraded events???
 
     pass
+
+
+@pytest.mark.asyncio
+async def test_class_declaration_pipeline():
+    class_abi = load_rpc_response("starknet", "get_class_0x5ff.json")["result"]
+    class_a, class_b, class_c, class_d = [idx.to_bytes(32, "big") for idx in (10, 11, 12, 13)]
+
+    def _get_class_handler(params):
+        class_hash, block_number = int(params["class_hash"], 16), params["block_id"]["block_number"]
+        if class_hash == 10 or (class_hash == 11 and block_number >= 10) or (class_hash == 12 and block_number >= 12):
+            return class_abi if class_hash != 12 else {"abi": []}
+        raise ValueError("Class hash not found")
+
+    def _tx(class_hash, block_number, transaction_index, tx_type):
+        return SimpleNamespace(
+            transaction_hash=bytes([block_number, transaction_index]),
+            class_hash=class_hash,
+            block_number=block_number,
+            transaction_index=transaction_index,
+            timestamp=1_000 + block_number,
+            type=tx_type,
+        )
+
+    deploy_txns = [_tx(class_a, 10, 0, StarknetTxType.deploy), _tx(class_b, 10, 1, StarknetTxType.deploy)]
+    declare_txns = [
+        _tx(class_b, 11, 0, StarknetTxType.declare),
+        _tx(class_c, 12, 0, StarknetTxType.declare),
+        _tx(class_d, 12, 1, StarknetTxType.declare),
+    ]
+    known_classes = {class_d}
+
+    async with ReplayRPCServer(method_handlers={"starknet_getClass": _get_class_handler}) as server:
+        session = create_aiohttp_session()
+        try:
+            class_declarations = await get_class_declarations(
+                declare_txns, deploy_txns, server.url, session, known_classes=known_classes, batch_size=2
+            )
+        finally:
+            await session.close()
+
+    # Class A existed before its deploy, and class B is declared by its deploy instead of the later declare
+    assert [(dec.class_hash, dec.declare_transaction_hash) for dec in class_declarations] == [
+        (class_b, bytes([10, 1])),
+        (class_c, bytes([12, 0])),
+    ]
+    assert class_declarations[0].is_account is not None
+    assert class_declarations[1].is_account is None and class_declarations[1].proxy_kind is None
+
+    assert known_classes == {class_a, class_b, class_c, class_d}
+    assert server.stats.method_counts["starknet_getClass"] == 5
+    assert server.stats.requests == 3
+
+
+def test_class_feature_index(tmp_path):
+    class_hash = to_bytes("0x05ffbcfeb50d200a0677c48a129a11245a3fc519d1d98d76882d1c9a1b19c6ed")
+    class_abi = StarknetAbi.from_json(
+        load_rpc_response("starknet", "get_class_0x5ff.json")["result"]["abi"], class_hash=class_hash
+    )
+
+    dispatcher = IndexedDecodingDispatcher()
+    dispatcher.add_abi(class_abi)
+
+    class_features = dispatcher.class_features.get(class_hash)
+    assert class_features == ClassFeatures(
+        proxy_kind=None, is_account=False, is_erc20=True, is_erc721=False, is_upgradeable=True
+    )
+    assert class_features.is_erc20 == is_class_erc20_token(class_abi)
+    assert class_features.is_account == is_class_account(class_abi)
+    assert is_dispatcher_class_proxy(dispatcher, class_hash) is None
+
+    dispatcher.class_features.save(str(tmp_path / "class_features.json"))
+    loaded_index = ClassFeatureIndex.load(str(tmp_path / "class_features.json"))
+    assert loaded_index.get(class_hash) == class_features
+    assert len(loaded_index) == 1
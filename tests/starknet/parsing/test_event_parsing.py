@@ -1,8 +1,22 @@
+from types import SimpleNamespace
+
 import pytest
 
-from nethermind.idealis.parse.starknet.event import filter_transfers
+from nethermind.idealis.parse.starknet.event import (
+    TRANSFER_SIGNATURE,
+    filter_transfers,
+    filter_transfers_batch,
+    get_transfer_extractor,
+    partition_events_by_selector,
+)
+from nethermind.idealis.parse.starknet.protocol.starknet_id import (
+    V2_ADDR_TO_DOMAIN_UPDATE,
+)
+from nethermind.idealis.parse.starknet.router import EventRouter, get_protocol_router
 from nethermind.idealis.types.starknet import Event
 from nethermind.idealis.utils import to_bytes
+from nethermind.idealis.utils.address_encoder import AddressEncoder
+from nethermind.idealis.utils.starknet import decode_events_batch, group_events_by_class
 
 ADDR_0 = b"\x00" * 32
 ADDR_1 = to_bytes("0x0000abcdefabcdefabcdefabcdefabcdefabcdefabcdefabcdefabcdefabcdef")
@@ -137,3 +151,184 @@ def test_parse_erc_721_events(params, expected_from, expected_to, expected_id):
     assert transfer[0].from_address == expected_from
     assert transfer[0].to_address == expected_to
     assert transfer[0].token_id == expected_id
+
+
+def test_transfer_extractor_lookup():
+    extractor = get_transfer_extractor(("to", "from_", "value"))
+    assert extractor.standard == "erc20"
+    assert (extractor.from_key, extractor.to_key, extractor.value_key) == ("from_", "to", "value")
+
+    # Parameter order does not change the extractor
+    assert get_transfer_extractor(("value", "from_", "to")) == extractor
+
+    assert get_transfer_extractor(("_to", "_from", "_tokenId")).standard == "erc721"
+    assert get_transfer_extractor(("to", "from", "amountOrId")) is None
+
+
+def test_filter_transfers_batch():
+    approval_selector = to_bytes("0x0134692b230b9e1ffa39098904722134159652b09c5bc41d88d6698779d228ff")
+    events = [
+        Event(decoded_params=None, **{**EVENT_DEFAULTS, "event_index": 0, "keys": [approval_selector]}),
+        Event(decoded_params=None, **{**EVENT_DEFAULTS, "event_index": 1, "keys": [TRANSFER_SIGNATURE]}),
+        Event(decoded_params=None, **{**EVENT_DEFAULTS, "event_index": 2, "keys": []}),
+        Event(decoded_params=None, **{**EVENT_DEFAULTS, "event_index": 3, "keys": [TRANSFER_SIGNATURE]}),
+    ]
+
+    partitioned = partition_events_by_selector(events)
+    assert [e.event_index for e in partitioned[TRANSFER_SIGNATURE]] == [1, 3]
+    assert [e.event_index for e in partitioned[approval_selector]] == [0]
+
+    decoded_batches = []
+
+    def _decode_events(transfer_events):
+        decoded_batches.append([e.event_index for e in transfer_events])
+        for e in transfer_events:
+            e.decoded_params = {"from": ADDR_1_HEX, "to": ADDR_2_HEX, "value": e.event_index}
+
+    erc_20, erc_721 = filter_transfers_batch(events, decode_events=_decode_events)
+
+    assert decoded_batches == [[1, 3]]  # Only transfer events are decoded
+    assert [(t.event_index, t.value) for t in erc_20] == [(1, 1), (3, 3)]
+    assert erc_721 == []
+
+    encoder = AddressEncoder()
+    encoded_erc_20, encoded_erc_721 = filter_transfers_batch(events, address_encoder=encoder)
+    assert encoded_erc_20.values == [1, 3]
+    assert encoder.decode_many(encoded_erc_20.from_ids) == [to_bytes(ADDR_1_HEX, pad=32)] * 2
+    assert len(encoded_erc_721) == 0
+
+
+class FakeEventType:
+    """Event ABI decoding events as {"value": data[0]}"""
+
+    name = "Transfer"
+
+    def decode(self, data, keys):
+        return {"value": data[0]}
+
+
+class FakeEventTypes(dict):
+    """Event type table counting event ABI resolutions"""
+
+    def __init__(self):
+        super().__init__({b"transfer": FakeEventType()})
+        self.resolutions = 0
+
+    def __getitem__(self, decoder_reference):
+        self.resolutions += 1
+        return super().__getitem__(decoder_reference)
+
+
+class FakeEventDecoder:
+    """
+    Decodes Transfer events of class 0x01 as {"value": data[0]}, and counts class lookups & event ABI resolutions
+    """
+
+    def __init__(self):
+        self.class_lookups = 0
+        self.event_types = FakeEventTypes()
+
+    def get_class(self, class_hash):
+        self.class_lookups += 1
+        if class_hash != b"\x01":
+            return None
+        return SimpleNamespace(event_ids={TRANSFER_SIGNATURE[-8:]: SimpleNamespace(decoder_reference=b"transfer")})
+
+
+def test_decode_events_batch():
+    events = [
+        Event(
+            **{
+                **EVENT_DEFAULTS,
+                "event_index": idx,
+                "contract_address": contract,
+                "keys": [TRANSFER_SIGNATURE],
+                "data": [bytes([idx])],
+            }
+        )
+        for idx, contract in enumerate([ADDR_1, ADDR_2, ADDR_1, ADDR_3])
+    ]
+    events.append(Event(**{**EVENT_DEFAULTS, "event_index": 4, "keys": []}))
+    events.append(Event(**{**EVENT_DEFAULTS, "event_index": 5, "contract_address": ADDR_1, "keys": [ADDR_0]}))
+    events.extend(
+        Event(
+            **{
+                **EVENT_DEFAULTS,
+                "event_index": idx,
+                "contract_address": ADDR_1,
+                "keys": [TRANSFER_SIGNATURE],
+                "data": [bytes([idx])],
+            }
+        )
+        for idx in range(6, 16)
+    )
+
+    resolved = []
+
+    def _class_resolver(contract_address, block_number):
+        resolved.append(contract_address)
+        return {ADDR_1: b"\x01", ADDR_2: b"\x02"}.get(contract_address)
+
+    groups = group_events_by_class(events, _class_resolver)
+    assert [[e.event_index for e in group] for group in groups.values()] == [[0, 2, *range(6, 16)], [1], [5]]
+    assert resolved == [ADDR_1, ADDR_2, ADDR_3]  # Each contract is only resolved once
+
+    decoder = FakeEventDecoder()
+    assert decode_events_batch(events, decoder) == 12
+    # Class & event ABI are resolved once per (class, selector) group, regardless of the group size
+    assert decoder.class_lookups == 3
+    assert decoder.event_types.resolutions == 1
+
+    assert [(e.event_name, e.decoded_params) for e in events[:4]] == [
+        ("Transfer", {"value": 0}),
+        (None, None),
+        ("Transfer", {"value": 2}),
+        (None, None),
+    ]
+    assert all(e.decoded_params == {"value": e.event_index} for e in events[6:])
+
+
+def test_event_router():
+    events = [
+        Event(**{**EVENT_DEFAULTS, "event_index": 0, "contract_address": ADDR_1, "keys": [TRANSFER_SIGNATURE]}),
+        Event(**{**EVENT_DEFAULTS, "event_index": 1, "contract_address": ADDR_2, "keys": [ADDR_0]}),
+        Event(**{**EVENT_DEFAULTS, "event_index": 2, "contract_address": ADDR_1, "keys": []}),
+        Event(**{**EVENT_DEFAULTS, "event_index": 3, "contract_address": ADDR_2, "keys": [TRANSFER_SIGNATURE]}),
+    ]
+
+    router = EventRouter()
+    router.register("transfers", lambda e: [ev.event_index for ev in e], selectors=[TRANSFER_SIGNATURE])
+    router.register("addr_1", lambda e: [ev.event_index for ev in e], contracts=[ADDR_1])
+    router.register("unmatched", lambda e: pytest.fail("Handler without events should not be called"), [ADDR_3])
+    router.register("all", len)
+
+    with pytest.raises(ValueError):
+        router.register("all", len)
+
+    assert router.route(events) == {"transfers": [0, 3], "addr_1": [0, 2], "all": 4}
+
+
+def test_protocol_router():
+    naming_contract = to_bytes("0x06ac597f8116f886fa1c97a23fa4e08299975ecaf6b598873ca6792b9bbfb678")
+    events = [
+        Event(
+            **{
+                **EVENT_DEFAULTS,
+                "event_index": 0,
+                "contract_address": naming_contract,
+                "keys": [V2_ADDR_TO_DOMAIN_UPDATE, ADDR_1],
+                "data": [to_bytes("0x1"), to_bytes("0x944f11e22979")],
+            }
+        ),
+        Event(**{**EVENT_DEFAULTS, "event_index": 1, "contract_address": ADDR_2, "keys": [TRANSFER_SIGNATURE]}),
+    ]
+
+    def _decode_events(transfer_events):
+        for e in transfer_events:
+            e.decoded_params = {"from": ADDR_1_HEX, "to": ADDR_3_HEX, "value": 10}
+
+    results = get_protocol_router(decode_events=_decode_events).route(events)
+
+    assert [u.data["address"] for u in results["starknet_id"]] == [ADDR_1]
+    erc_20, _ = results["transfers"]
+    assert [(t.token_address, t.value) for t in erc_20] == [(ADDR_2, 10)]
@@ -0,0 +1,66 @@
+from nethermind.idealis.parse.starknet.state import (
+    decode_state_diff,
+    parse_state_diff_columns,
+)
+from nethermind.idealis.parse.starknet.trace import parse_state_diff
+from nethermind.idealis.utils import to_bytes
+
+CONTRACT_A = "0x49d36570d4e46f48e99674bd3fcc84644ddd6b96f7c741b1562b82f9e004dc7"
+CONTRACT_B = "0x4270219d365d6b017231b52e92b3fb5d7c8378b05e9abc97724537a80e93b0f"
+CLASS_HASH = "0x2760f25d5a4fb2bdde5f561fd0b44a3dee78c28903577d37d669939d97036a0"
+
+STATE_DIFF_JSON = {
+    "storage_diffs": [
+        {
+            "address": CONTRACT_A,
+            "storage_entries": [{"key": "0x5", "value": "0x64"}, {"key": "0x6", "value": "0x0"}],
+        },
+        {"address": CONTRACT_B, "storage_entries": [{"key": "0x1", "value": "0xabc"}]},
+    ],
+    "nonces": [{"contract_address": CONTRACT_B, "nonce": "0x1f"}],
+    "deployed_contracts": [{"address": CONTRACT_B, "class_hash": CLASS_HASH}],
+    "deprecated_declared_classes": [],
+    "declared_classes": [{"class_hash": CLASS_HASH, "compiled_class_hash": "0x1234"}],
+    "replaced_classes": [],
+}
+
+
+def test_parse_state_diff_columns():
+    diff = parse_state_diff_columns(STATE_DIFF_JSON, block_number=600_000, tx_hash=b"\x01" * 32, transaction_index=4)
+
+    contract_a, contract_b = to_bytes(CONTRACT_A, pad=32), to_bytes(CONTRACT_B, pad=32)
+
+    assert diff.storage_entry_count == 3
+    assert diff.storage_range(contract_a) == (0, 2)
+    assert diff.storage_range(contract_b) == (2, 3)
+    assert diff.storage_range(b"\x00" * 32) is None
+
+    assert diff.contract_storage(contract_a) == {
+        to_bytes("0x5", pad=32): to_bytes("0x64", pad=32),
+        to_bytes("0x6", pad=32): b"\x00" * 32,
+    }
+    assert list(diff.iter_storage())[-1] == (contract_b, to_bytes("0x1", pad=32), to_bytes("0xabc", pad=32))
+
+    assert list(diff.iter_nonces()) == [(contract_b, 31)]
+    assert list(diff.iter_deployed_contracts()) == [(contract_b, to_bytes(CLASS_HASH, pad=32))]
+    assert list(diff.iter_declared_classes()) == [(to_bytes(CLASS_HASH, pad=32), to_bytes("0x1234", pad=32))]
+    assert list(diff.iter_replaced_classes()) == []
+
+
+def test_decode_state_diff():
+    state_diff = parse_state_diff(STATE_DIFF_JSON, block_number=600_000, tx_hash=b"\x01" * 32, transaction_index=4)
+    decoded = decode_state_diff(state_diff)
+
+    assert decoded == parse_state_diff_columns(STATE_DIFF_JSON, 600_000, b"\x01" * 32, 4)
+
+
+def test_parse_state_diff_large_nonce():
+    large_nonce = 2**64 + 7
+    diff = parse_state_diff_columns(
+        {"nonces": [{"contract_address": CONTRACT_A, "nonce": hex(large_nonce)}]},
+        block_number=600_000,
+        tx_hash=b"\x01" * 32,
+    )
+
+    assert diff.nonces == large_nonce.to_bytes(32, "big")
+    assert list(diff.iter_nonces()) == [(to_bytes(CONTRACT_A, pad=32), large_nonce)]
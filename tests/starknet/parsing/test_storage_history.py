@@ -0,0 +1,127 @@
+import pytest
+
+from nethermind.idealis.parse.starknet.state import parse_state_diff_columns
+from nethermind.idealis.utils.starknet.storage import _RECORD, StorageHistory
+
+CONTRACT = "0x49d36570d4e46f48e99674bd3fcc84644ddd6b96f7c741b1562b82f9e004dc7"
+CONTRACT_BYTES = bytes.fromhex(CONTRACT[2:].rjust(64, "0"))
+
+
+def _felt(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+
+def _storage_diff(block_number: int, transaction_index: int, entries: dict[int, int]):
+    return parse_state_diff_columns(
+        {
+            "storage_diffs": [
+                {
+                    "address": CONTRACT,
+                    "storage_entries": [{"key": hex(key), "value": hex(value)} for key, value in entries.items()],
+                }
+            ]
+        },
+        block_number=block_number,
+        tx_hash=b"\x00" * 32,
+        transaction_index=transaction_index,
+    )
+
+
+def _populate(history: StorageHistory):
+    history.append_state_diffs(
+        [
+            _storage_diff(100, 0, {1: 10, 2: 20}),
+            _storage_diff(100, 3, {1: 11}),
+            _storage_diff(105, 1, {1: 12, 3: 30}),
+            _storage_diff(110, -1, {2: 21}),
+        ]
+    )
+
+
+def test_storage_point_in_time_lookups():
+    history = StorageHistory()
+    _populate(history)
+
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(1), 99) is None
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(1), 100, transaction_index=1) == _felt(10)
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(1), 100) == _felt(11)
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(1), 104) == _felt(11)
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(1), 200) == _felt(12)
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(2), 109) == _felt(20)
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(2), 110) == _felt(21)
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(9), 110) is None
+
+
+def test_storage_range_scans():
+    history = StorageHistory()
+    _populate(history)
+
+    assert list(history.iter_slot_history(CONTRACT_BYTES, _felt(1), from_block=100, to_block=104)) == [
+        (100, 0, _felt(10)),
+        (100, 3, _felt(11)),
+    ]
+    assert [block for block, _, _ in history.iter_slot_history(CONTRACT_BYTES, _felt(1), from_block=101)] == [105]
+
+    assert list(history.scan_contract_storage(CONTRACT_BYTES, 100)) == [(_felt(1), _felt(11)), (_felt(2), _felt(20))]
+    assert list(history.scan_contract_storage(CONTRACT_BYTES, 110, key_start=_felt(2))) == [
+        (_felt(2), _felt(21)),
+        (_felt(3), _felt(30)),
+    ]
+
+
+def test_storage_history_rejects_out_of_order_updates():
+    history = StorageHistory()
+    _populate(history)
+
+    with pytest.raises(ValueError):
+        history.append_state_diff(_storage_diff(105, 2, {1: 13}))
+
+
+def test_storage_history_resumes_from_checkpoint(tmp_path):
+    log_path = str(tmp_path / "storage.log")
+
+    history = StorageHistory(log_path, checkpoint_interval=5)
+    _populate(history)  # Checkpoints block 100 when block 105 is appended, and block 105 when 110 is appended
+    history._log_file.flush()  # pylint: disable=protected-access  # Simulate a crash without closing
+
+    reopened = StorageHistory(log_path)
+    assert reopened.checkpoint_block == 105
+    assert reopened.resume_block == 106
+    assert reopened.record_count == 5
+    assert reopened.get_storage_at(CONTRACT_BYTES, _felt(2), 110) == _felt(20)
+    assert list(reopened.scan_contract_storage(CONTRACT_BYTES, 105)) == [
+        (_felt(1), _felt(12)),
+        (_felt(2), _felt(20)),
+        (_felt(3), _felt(30)),
+    ]
+
+    reopened.append_state_diff(_storage_diff(110, -1, {2: 21}))
+    reopened.close()
+
+    assert StorageHistory(log_path).get_storage_at(CONTRACT_BYTES, _felt(2), 110) == _felt(21)
+
+
+def test_storage_history_reads_from_log_map(tmp_path):
+    log_path = str(tmp_path / "storage.log")
+
+    history = StorageHistory(log_path, checkpoint_interval=1)
+    _populate(history)
+
+    # Records before the last checkpoint are read from the log map, later records from the in memory tail
+    assert history.record_count == 6
+    assert len(history._tail) == _RECORD.size  # pylint: disable=protected-access
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(1), 100) == _felt(11)
+    assert history.get_storage_at(CONTRACT_BYTES, _felt(2), 110) == _felt(21)
+    history.close()
+
+    reopened = StorageHistory(log_path)
+    assert reopened.last_block == reopened.checkpoint_block == 110
+    assert not reopened._tail  # pylint: disable=protected-access
+    assert list(reopened.iter_slot_history(CONTRACT_BYTES, _felt(1))) == [
+        (100, 0, _felt(10)),
+        (100, 3, _felt(11)),
+        (105, 1, _felt(12)),
+    ]
+
+    with pytest.raises(ValueError):
+        reopened.append_state_diff(_storage_diff(105, 2, {1: 13}))
@@ -1,10 +1,18 @@
+from types import SimpleNamespace
+
+import pytest
+
 from nethermind.idealis.parse.shared.trace import (
     get_toplevel_child_traces,
     group_traces,
 )
 from nethermind.idealis.parse.starknet.trace import (
+    TRACE_SECTIONS,
+    ParsedBlockTrace,
+    get_block_user_operations,
     get_execute_trace,
     get_user_operations,
+    iter_replace_delegate_calls,
     replace_delegate_calls,
     unpack_trace_block_response,
     unpack_trace_response,
@@ -12,6 +20,9 @@ from nethermind.idealis.parse.starknet.trace import (
 from nethermind.idealis.types.starknet.core import Trace
 from nethermind.idealis.types.starknet.enums import EntryPointType, TraceCallType
 from nethermind.idealis.utils import to_bytes
+from nethermind.idealis.utils.starknet.decode import decode_traces_batch
+from nethermind.starknet_abi.abi_types import StarknetCoreType
+from nethermind.starknet_abi.decoding_types import AbiParameter
 from tests.utils import load_rpc_response
 
 # fmt: off
@@ -85,6 +96,122 @@ def test_replace_trace_delegate_calls():
     assert call_traces[-1].class_hash == to_bytes("02760f25d5a4fb2bdde5f561fd0b44a3dee78c28903577d37d669939d97036a0")
 
 
+def test_parse_block_trace_sections():
+    json_resp = load_rpc_response("starknet", "trace_block_480_000.json")
+    full_traces = unpack_trace_block_response(json_resp, 480_000)
+
+    event_traces = unpack_trace_block_response(json_resp, 480_000, sections={"execute_events", "state_diff"})
+
+    assert event_traces.execute_events == full_traces.execute_events
+    assert event_traces.state_diff == full_traces.state_diff
+    assert event_traces.execute_traces == []
+    assert event_traces.validate_traces == []
+    assert event_traces.fee_transfer_events == []
+
+    for section in TRACE_SECTIONS - {"state_diff"}:
+        section_traces = unpack_trace_block_response(json_resp, 480_000, sections={section})
+        assert getattr(section_traces, section) == getattr(full_traces, section)
+
+    with pytest.raises(ValueError):
+        unpack_trace_block_response(json_resp, 480_000, sections={"execute_calls"})
+
+
+def test_merge_block_traces():
+    block_25 = unpack_trace_block_response(load_rpc_response("starknet", "trace_block_25.json"), 25)
+    block_480_000 = unpack_trace_block_response(load_rpc_response("starknet", "trace_block_480_000.json"), 480_000)
+
+    execute_25, execute_480_000 = len(block_25.execute_traces), len(block_480_000.execute_traces)
+
+    merged = ParsedBlockTrace.from_block_traces([block_25, block_480_000])
+
+    assert merged.execute_traces == block_25.execute_traces + block_480_000.execute_traces
+    assert merged.execute_events == block_25.execute_events + block_480_000.execute_events
+
+    # Inputs are not mutated or aliased
+    assert merged.execute_traces is not block_25.execute_traces
+    assert len(block_25.execute_traces) == execute_25
+    assert len(block_480_000.execute_traces) == execute_480_000
+
+    assert ParsedBlockTrace.from_block_traces([]) == ParsedBlockTrace.init()
+
+
+def _synthetic_trace(trace_address: list[int], delegate: bool = False) -> Trace:
+    return Trace(
+        block_number=0,
+        transaction_index=0,
+        trace_address=trace_address,
+        contract_address=b"",
+        selector=b"",
+        calldata=[],
+        result=[],
+        caller_address=b"",
+        class_hash=bytes(trace_address),
+        entry_point_type=EntryPointType.external,
+        call_type=TraceCallType.delegate if delegate else TraceCallType.call,
+        execution_resources={},
+        error=None,
+    )
+
+
+class FakeFunctionDecoder:
+    """Decodes transfer(amount: u128) -> bool for class 0x01, and counts class lookups"""
+
+    function_types = {b"transfer": ([AbiParameter(name="amount", type=StarknetCoreType.U128)], [StarknetCoreType.Bool])}
+
+    def __init__(self):
+        self.class_lookups = 0
+
+    def get_class(self, class_hash):
+        self.class_lookups += 1
+        if class_hash != b"\x01":
+            return None
+        return SimpleNamespace(
+            function_ids={b"\x02" * 8: SimpleNamespace(name="transfer", decoder_reference=b"transfer")}
+        )
+
+
+def test_decode_traces_batch():
+    traces = [_synthetic_trace([idx]) for idx in range(4)]
+    for trace, class_hash, selector in zip(
+        traces, [b"\x01", b"\x01", b"\x01", b"\x03"], [b"\x02" * 32, b"\x02" * 32, b"\x04" * 32, b"\x02" * 32]
+    ):
+        trace.class_hash, trace.selector = class_hash, selector
+        trace.calldata, trace.result = [(trace.trace_address[0] + 100).to_bytes(32, "big")], [to_bytes("0x01", pad=32)]
+
+    decoder = FakeFunctionDecoder()
+    assert decode_traces_batch(traces, decoder) == 2
+    assert decoder.class_lookups == 3  # One lookup per (class, selector) group
+
+    assert [(t.function_name, t.decoded_inputs, t.decoded_outputs) for t in traces] == [
+        ("transfer", {"amount": 100}, [True]),
+        ("transfer", {"amount": 101}, [True]),
+        (None, None, None),  # Unknown selector
+        (None, None, None),  # Unknown class
+    ]
+
+
+def test_replace_nested_delegate_calls():
+    tx_traces = [
+        _synthetic_trace([0]),
+        _synthetic_trace([0, 0], delegate=True),  # Replaces [0]
+        _synthetic_trace([0, 0, 0]),
+        _synthetic_trace([0, 0, 0, 0], delegate=True),  # Replaces [0, 0, 0]
+        _synthetic_trace([0, 0, 0, 0, 0]),
+        _synthetic_trace([0, 0, 1]),
+        _synthetic_trace([0, 0, 1, 0]),
+    ]
+
+    call_traces = list(iter_replace_delegate_calls([tx_traces]))
+
+    assert [(t.trace_address, t.class_hash) for t in call_traces] == [
+        ([0], bytes([0, 0])),
+        ([0, 0], bytes([0, 0, 0, 0])),
+        ([0, 0, 0], bytes([0, 0, 0, 0, 0])),
+        ([0, 1], bytes([0, 0, 1])),
+        ([0, 1, 0], bytes([0, 0, 1, 0])),
+    ]
+
+
 def test_group_traces():
     json_resp = load_rpc_response("starknet", "trace_block_480_000.json")
     traces = unpack_trace_block_response(json_resp, 480_000)
@@ -236,3 +363,25 @@ def test_trace_ordering():
     assert user_operations[1].operation_name == "swap"
     assert user_operations[2].operation_name == "clear_minimum"
     assert user_operations[3].operation_name == "clear"
+
+
+def test_block_user_operations():
+    json_resp = load_rpc_response("starknet", "trace_block_480_000.json")
+    block_trace = unpack_trace_block_response(json_resp, 480_000)
+
+    decoded_batches = []
+
+    def _decode_traces(traces):
+        decoded_batches.append(len(traces))
+        for trace in traces:
+            trace.function_name, trace.decoded_inputs = trace.selector.hex(), {"calldata_len": len(trace.calldata)}
+
+    user_ops = get_block_user_operations(block_trace, decode_traces=_decode_traces)
+
+    assert len(decoded_batches) == 1  # All traces are decoded in a single batch
+    tx_indexes = sorted({trace.transaction_index for trace in block_trace.execute_traces})
+    assert list(user_ops.keys()) == [(480_000, tx_index) for tx_index in tx_indexes]
+
+    for tx_index in tx_indexes:
+        tx_traces = [trace for trace in block_trace.execute_traces if trace.transaction_index == tx_index]
+        assert user_ops[(480_000, tx_index)] == get_user_operations(tx_traces)
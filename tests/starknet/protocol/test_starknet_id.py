@@ -1,12 +1,16 @@
 import pytest
 
 from nethermind.idealis.parse.starknet.protocol.starknet_id import (
+    StarknetIDIndex,
     generate_starknet_id_state,
     parse_starknet_id_updates,
 )
 from nethermind.idealis.rpc.starknet import get_blocks_with_txns
 from nethermind.idealis.types.starknet import Event
-from nethermind.idealis.types.starknet.protocol.starknet_id import StarknetIDUpdateKind
+from nethermind.idealis.types.starknet.protocol.starknet_id import (
+    StarknetIDUpdate,
+    StarknetIDUpdateKind,
+)
 from nethermind.idealis.utils import to_bytes
 from nethermind.idealis.utils.starknet import (
     decode_starknet_id_domain,
@@ -192,3 +196,73 @@ async def test_parse_v1_starknet_id_state(starknet_rpc_url, async_http_session):
 
 def test_parse_v0_braavos_subdomain():
     pass
+
+
+def test_starknet_id_index(tmp_path):
+    owner, buyer = to_bytes("0x0123", pad=32), to_bytes("0x0456", pad=32)
+
+    def _update(block_number, kind, identity, data):
+        return StarknetIDUpdate(
+            block_number=block_number,
+            transaction_index=0,
+            block_timestamp=None,
+            transaction_hash=None,
+            identity=identity,
+            kind=kind,
+            data=data,
+        )
+
+    index_path = str(tmp_path / "starknet_id.json")
+    index = StarknetIDIndex(index_path, checkpoint_interval=1)
+    index.apply_updates(
+        [
+            _update(
+                100,
+                StarknetIDUpdateKind.identity_update,
+                (5).to_bytes(32, "big"),
+                {"domains": [("nethermind.stark", 1800000000)], "new_owner": owner, "old_owner": None},
+            ),
+            _update(
+                100,
+                StarknetIDUpdateKind.address_to_domain_update,
+                owner,
+                {"domain": "nethermind.stark", "address": owner},
+            ),
+            _update(
+                110,
+                StarknetIDUpdateKind.identity_data_update,
+                (5).to_bytes(32, "big"),
+                {"verifier_data": {"name": ([to_bytes("0x01")], buyer)}, "user_data": None},
+            ),
+            _update(
+                120,
+                StarknetIDUpdateKind.identity_update,
+                (5).to_bytes(32, "big"),
+                {"domains": None, "new_owner": buyer, "old_owner": owner},
+            ),
+            _update(120, StarknetIDUpdateKind.address_to_domain_update, owner, {"domain": None, "address": owner}),
+        ]
+    )
+
+    assert index.get_domain_identity("nethermind.stark").owner == buyer
+    assert index.get_owner_identities(owner) == []
+    assert [i.identity_nft_id for i in index.get_owner_identities(buyer)] == [5]
+
+    assert index.resolve_address(owner, block_number=99) is None
+    assert index.resolve_address(owner, block_number=115) == "nethermind.stark"
+    assert index.resolve_address(owner) is None
+
+    with pytest.raises(ValueError):
+        index.apply_update(
+            _update(110, StarknetIDUpdateKind.address_to_domain_update, buyer, {"domain": None, "address": buyer})
+        )
+
+    # Block 120 is only checkpointed once the next block is applied
+    assert index.resume_block == 111
+    index.checkpoint()
+
+    reloaded = StarknetIDIndex(index_path)
+    assert reloaded.resume_block == 121
+    assert reloaded.resolve_address(owner, block_number=115) == "nethermind.stark"
+    assert reloaded.get_domain_identity("nethermind.stark").verifier_data == {"name": ([to_bytes("0x01")], buyer)}
+    assert [i.identity_nft_id for i in reloaded.get_owner_identities(buyer)] == [5]
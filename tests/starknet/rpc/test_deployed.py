@@ -1,8 +1,15 @@
 import pytest
 
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
 from nethermind.idealis.rpc.starknet.core import get_current_block
-from nethermind.idealis.rpc.starknet.deployed import get_erc20_info
+from nethermind.idealis.rpc.starknet.deployed import (
+    ERC20MetadataCache,
+    get_erc20_info,
+    refresh_erc20_info,
+)
+from nethermind.starknet_abi.utils import starknet_keccak
 from tests.addresses import STARKNET_ETH
+from tests.replay import ReplayRPCServer
 
 
 @pytest.mark.asyncio
@@ -15,3 +22,72 @@ async def test_get_starknet_eth_erc20_info(async_http_session, starknet_rpc_url)
     assert erc20_info.decimals == 18
     assert erc20_info.total_supply >= 0
     assert erc20_info.update_block in (current_block, current_block - 1)
+
+
+def _token_call_handler(params):
+    """ERC20 at 0x1 returns a ByteArray name, 0x2 a short string name, and 0x3 is not a token"""
+    contract = int(params["request"]["contract_address"], 16)
+    selector = bytes.fromhex(params["request"]["entry_point_selector"][2:]).lstrip(b"\x00")
+    function_name = next(
+        name
+        for name in (b"name", b"symbol", b"decimals", b"totalSupply", b"total_supply")
+        if starknet_keccak(name).lstrip(b"\x00") == selector
+    )
+    if contract == 3 or function_name == b"totalSupply":
+        raise ValueError("Entry point not found")
+
+    match function_name:
+        case b"name":
+            if contract == 1:
+                long_name = "Wrapped Staked Ether Token"
+                return ["0x0", "0x" + long_name.encode().hex(), hex(len(long_name))]
+            return ["0x" + b"Ether".hex()]
+        case b"symbol":
+            return ["0x" + b"TKN\xff".hex()]
+        case b"decimals":
+            return ["0x12"]
+    return [hex(1000 * contract), "0x1"]  # u256 total_supply
+
+
+@pytest.mark.asyncio
+async def test_refresh_erc20_info_cache(tmp_path):
+    now = [1000.0]
+    cache = ERC20MetadataCache(str(tmp_path / "erc20.json"), total_supply_ttl=60, clock=lambda: now[0])
+    tokens = [(idx).to_bytes(32, "big") for idx in (1, 2, 3)]
+
+    head_block = [500]
+    handlers = {"starknet_call": _token_call_handler, "starknet_blockNumber": lambda _: head_block[0]}
+    async with ReplayRPCServer(method_handlers=handlers) as server:
+        session = create_aiohttp_session()
+        try:
+            token_data = await refresh_erc20_info(tokens, server.url, session, cache)
+            assert server.stats.method_counts == {"starknet_blockNumber": 1, "starknet_call": 15}
+
+            assert token_data[tokens[0]].name == "Wrapped Staked Ether Token"
+            assert token_data[tokens[1]].name == "Ether"
+            assert token_data[tokens[1]].symbol == "TKN�"
+            assert token_data[tokens[1]].decimals == 18
+            assert token_data[tokens[1]].total_supply == 2000 + (1 << 128)
+            assert token_data[tokens[2]] is None
+
+            # Cached metadata & total supply are fresh
+            await refresh_erc20_info(tokens, server.url, session, cache)
+            assert server.stats.method_counts["starknet_call"] == 15
+
+            # Only total supply is refreshed after the TTL, without modifying previously returned token data
+            now[0], head_block[0] = now[0] + 60, 600
+            refreshed = await refresh_erc20_info(tokens, server.url, session, cache)
+            assert server.stats.method_counts["starknet_call"] == 19
+            assert token_data[tokens[0]].update_block == 500
+            assert refreshed[tokens[0]].update_block == 600
+        finally:
+            await session.close()
+
+    # Returned token data is a copy of the cached data
+    cache.get(tokens[0]).name = "Modified"  # type: ignore[union-attr]
+    assert cache.get(tokens[0]).name == "Wrapped Staked Ether Token"  # type: ignore[union-attr]
+
+    cache.save()
+    reloaded = ERC20MetadataCache(str(tmp_path / "erc20.json"), clock=lambda: now[0])
+    assert reloaded.get(tokens[0]) == cache.get(tokens[0])
+    assert tokens[2] in reloaded and reloaded.get(tokens[2]) is None
@@ -0,0 +1,36 @@
+import pytest
+
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
+from nethermind.idealis.rpc.starknet import StarknetCallRequest, starknet_multicall
+from tests.replay import ReplayRPCServer
+
+BALANCE_OF = bytes.fromhex("02e4263afad30923c891518314c3c95dbe830a16874e8abc5777a9a20b54c76e")
+
+
+def _balance_of_handler(params):
+    """Returns the holder address as the balance, and fails for holder 0"""
+    holder = int(params["request"]["calldata"][0][2:] or "0", 16)
+    if holder == 0:
+        raise ValueError("Contract error")
+    return [hex(holder), "0x0"]
+
+
+@pytest.mark.asyncio
+async def test_multicall_dedupes_and_isolates_errors():
+    calls = [StarknetCallRequest(b"\x01" * 32, BALANCE_OF, [holder.to_bytes(32, "big")]) for holder in (1, 0, 2, 1)]
+    calls.append(StarknetCallRequest(b"\x01" * 32, BALANCE_OF, [(1).to_bytes(32, "big")], block_id=100))
+
+    async with ReplayRPCServer(method_handlers={"starknet_call": _balance_of_handler}) as server:
+        session = create_aiohttp_session()
+        try:
+            results = await starknet_multicall(calls, session, server.url, batch_size=2)
+        finally:
+            await session.close()
+
+    assert [res.result for res in results] == [["0x1", "0x0"], None, ["0x2", "0x0"], ["0x1", "0x0"], ["0x1", "0x0"]]
+    assert results[1].error == {"code": 40, "message": "Contract error"}
+    assert not results[1].success and results[0].success
+
+    # Duplicate call is only requested once, and the block 100 call is requested separately
+    assert server.stats.method_counts["starknet_call"] == 4
+    assert server.stats.requests == 2
@@ -0,0 +1,53 @@
+from nethermind.idealis.parse.ethereum.trace import unpack_debug_trace_block_response
+from nethermind.idealis.parse.zk_sync.era_core import parse_era_block_response
+from nethermind.idealis.types.ethereum.enums import TraceCallType, TraceError
+from nethermind.idealis.utils import to_bytes
+from tests.utils import load_rpc_response
+
+# The zk_sync fixtures are hand assembled in the Era RPC response format.  Hashes & addresses are synthetic
+ERA_BLOCK = 33_137_600
+
+
+def test_parse_era_block_with_receipts():
+    block_json = load_rpc_response("zk_sync", "era_synthetic_getBlockByNumber_txs.json")["result"]
+    receipts_json = load_rpc_response("zk_sync", "era_synthetic_getBlockReceipts.json")["result"]
+
+    block, transactions, events = parse_era_block_response(block_json, receipts_json)
+
+    assert block.block_number == ERA_BLOCK
+    assert block.timestamp == 0x66A1B2C3
+    assert block.base_fee_per_gas == 0x2B275D0
+    assert block.hash == to_bytes("0x6c9f3b7e0d2a4c5b8e1f9a0b3c6d7e8f90a1b2c3d4e5f60718293a4b5c6d7e8f")
+
+    assert len(transactions) == 2
+    transfer, reverted = transactions
+
+    assert transfer.transaction_index == 0
+    assert transfer.to_address == to_bytes("0x1d17cbcf0d6d143135ae902365d2e5e2a16538d4", pad=20)
+    assert transfer.gas_used == 0x3E1F2
+    assert transfer.gas_available == 0x2A8E6C
+    assert transfer.error is None
+
+    assert reverted.value == 0x38D7EA4C68000
+    assert reverted.error == "reverted"
+
+    assert len(events) == 1
+    assert events[0].transaction_index == 0
+    assert events[0].contract_address == transfer.to_address
+    assert int.from_bytes(events[0].data, "big") == 1_000_000
+
+
+def test_parse_era_traces():
+    traces_json = load_rpc_response("zk_sync", "era_synthetic_debug_traceBlock.json")["result"]
+
+    call_traces, create_traces, _ = unpack_debug_trace_block_response(traces_json, ERA_BLOCK)
+
+    assert [(t.transaction_index, t.trace_address) for t in call_traces] == [(0, [0]), (0, [1]), (0, []), (1, [])]
+    assert all(t.call_type == TraceCallType.call for t in call_traces)
+
+    assert call_traces[-1].error == TraceError.reverted
+    assert call_traces[-1].error_text == "Deadline passed"
+
+    assert len(create_traces) == 1
+    assert create_traces[0].trace_address == [0]
+    assert create_traces[0].created_contract_address == to_bytes("0x5e3a0f2b7c8d9e1f0a2b3c4d5e6f7a8b9c0d1e2f")
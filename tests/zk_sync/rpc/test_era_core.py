@@ -0,0 +1,39 @@
+import pytest
+
+from nethermind.idealis.rpc.base.async_rpc import create_aiohttp_session
+from nethermind.idealis.rpc.zk_sync import get_era_blocks, trace_era_blocks
+from tests.replay import ReplayRPCServer
+
+# Hand assembled fixtures in the Era RPC response format, with synthetic hashes & addresses
+ERA_FIXTURES = {
+    "eth_getBlockByNumber": ("zk_sync", "era_synthetic_getBlockByNumber_txs.json"),
+    "eth_getBlockReceipts": ("zk_sync", "era_synthetic_getBlockReceipts.json"),
+    "debug_traceBlockByNumber": ("zk_sync", "era_synthetic_debug_traceBlock.json"),
+}
+
+
+@pytest.mark.asyncio
+async def test_get_era_blocks_and_traces():
+    async with ReplayRPCServer(fixtures=ERA_FIXTURES) as server:
+        session = create_aiohttp_session()
+        try:
+            blocks, transactions, events = await get_era_blocks(
+                [33_137_600, 33_137_601, 33_137_602], server.url, session, max_concurrency=2
+            )
+            call_traces, create_traces = await trace_era_blocks([33_137_600], server.url, session)
+        finally:
+            await session.close()
+
+    assert server.stats.method_counts == {
+        "eth_getBlockByNumber": 3,
+        "eth_getBlockReceipts": 3,
+        "debug_traceBlockByNumber": 1,
+    }
+
+    assert len(blocks) == 3
+    assert len(transactions) == 6
+    assert len(events) == 3
+    assert [tx.gas_used for tx in transactions[:2]] == [0x3E1F2, 0x4C1CF]
+
+    assert len(call_traces) == 4
+    assert len(create_traces) == 1